@@ -0,0 +1,55 @@
+"""
+Measures the import time of ``yaafc.events``.
+
+Every measurement runs in a fresh interpreter, as ``reflex run`` does on a cold start and on every hot reload, and
+starts once Reflex and its HTML elements are imported, which dominate the start-up of any page. Compared are:
+
+- ``package``: ``import yaafc.events`` alone
+- ``one export``: ``from yaafc.events import MouseEvent``, what a page using one event class pays
+- ``watcher``: ``from yaafc.events import enhanced_event_watcher``, whose specs load with their first handler
+- ``all exports``: every name of ``yaafc.events.__all__``, the cost of the former eager ``__init__``
+
+Usage:
+    python scripts/bench_events_import.py [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+CASES = {
+    "package": "import yaafc.events",
+    "one export": "from yaafc.events import MouseEvent",
+    "watcher": "from yaafc.events import enhanced_event_watcher",
+    "all exports": "import yaafc.events as events; [getattr(events, name) for name in events.__all__]",
+}
+
+TIMED = """
+import time
+import reflex
+reflex.el.Div
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(statement: str, runs: int) -> list[float]:
+    """Seconds the statement takes in each of ``runs`` fresh interpreters."""
+    # runs this interpreter on the statements of CASES, no outside input reaches the command
+    command = [sys.executable, "-c", TIMED.format(statement=statement)]
+    return [float(subprocess.check_output(command, text=True)) for _ in range(runs)]  # noqa: S603
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="interpreters started per case")
+    runs = parser.parse_args().runs
+    for case, statement in CASES.items():
+        timings = measure(statement, runs)
+        print(f"{case:<12} median {statistics.median(timings) * 1000:7.1f} ms  min {min(timings) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import asyncio
+import types
+
+import pytest
+import reflex as rx
+
+from yaafc.events import KeyDownEvent, PointerMoveEvent, batch, batch_spec, batched
+from yaafc.events.enhanced_event_watcher import enhanced_event_watcher
+from yaafc.events.keyboard_events import key_down_event_spec
+from yaafc.events.spec_factory import read_item_fields
+from yaafc.events.touch_events import touch_event_spec
+
+
+class BatchState(rx.State):
+    keys: list[str] = rx.field([])
+
+    @rx.event
+    @batched
+    def navigate(self, events: list[KeyDownEvent]):
+        self.keys = [event.key for event in events]
+
+    @rx.event
+    @batched
+    async def track(self, events: list[PointerMoveEvent]):
+        return [event.clientX for event in events]
+
+
+def rendered(component, trigger: str) -> str:
+    return str(rx.Var.create(component.event_triggers[trigger]))
+
+
+# Test: expected use
+def test_batches_are_gathered_in_the_browser():
+    chain = rendered(enhanced_event_watcher(on_key_down=batch(BatchState.navigate, 40, max_events=25)), "on_key_down")
+    assert '{"mode": "batch", "wait": 40, "sum": [], "max": 25}' in chain
+    assert '["key"] : _ev["key"]' in chain
+    # the handler only reads the key of the events of a batch
+    assert "shiftKey" not in chain
+
+
+def test_batch_handlers_receive_event_dataclasses():
+    state = types.SimpleNamespace(keys=[])
+    BatchState.navigate.fn(state, [{"key": "ArrowDown"}, KeyDownEvent(key="ArrowUp")])
+    assert state.keys == ["ArrowDown", "ArrowUp"]
+
+
+def test_async_batch_handlers():
+    component = enhanced_event_watcher(on_pointer_move=batch(BatchState.track))
+    assert '"mode": "batch"' in rendered(component, "on_pointer_move")
+    assert asyncio.run(BatchState.track.fn(None, [{"clientX": 3}, {"clientX": 5}])) == [3, 5]
+
+
+# Test: edge case (a batch spec extracts the events as the trigger's spec does)
+def test_batch_spec_is_typed_as_a_list():
+    (events,) = batch_spec(key_down_event_spec)(rx.Var("_e"))
+    (event,) = key_down_event_spec(rx.Var("_e"))
+    assert events._var_type == list[KeyDownEvent]
+    assert str(events) == str(event)
+    assert batch_spec(key_down_event_spec) is batch_spec(key_down_event_spec)
+
+
+# Test: failure case
+def test_batches_need_an_event_dataclass():
+    def untyped_spec(ev):
+        return (ev,)
+
+    with pytest.raises(ValueError, match="untyped_spec"):
+        batch_spec(untyped_spec)
+    assert batch_spec(touch_event_spec)
+
+
+def test_batch_handlers_passing_events_on_get_every_field():
+    def forward(self, events: list[KeyDownEvent]):
+        self.keys = list(events)
+
+    assert read_item_fields(forward, "events") is None
+    assert read_item_fields(BatchState.navigate.fn, "events") == {"key"}
+
+
+def test_batches_of_unknown_triggers_are_rejected():
+    with pytest.raises(ValueError, match="on_key_press"):
+        enhanced_event_watcher(on_key_press=batch(BatchState.navigate))
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from yaafc.filesystem.columns import COLUMN_PROVIDERS, required_fields
+from yaafc.filesystem.listing import DirectoryListing
+from yaafc.filesystem.scanner import DEFAULT_FIELDS, GROUP, MIME, OWNER, STAT, scan_directory, user_name
+
+
+@pytest.fixture
+def sample_dir(tmp_path):
+    (tmp_path / "docs").mkdir()
+    for index in range(20):
+        (tmp_path / f"page_{index}.html").write_bytes(b"<html/>")
+    return tmp_path
+
+
+# Test: expected use
+def test_required_fields_follow_visible_columns():
+    assert required_fields(["Name"]) == frozenset()
+    assert required_fields(["Name", "Size", "Changed"]) == DEFAULT_FIELDS
+    assert required_fields(["Owner", "Group", "Type"]) == {STAT, OWNER, GROUP, MIME}
+    assert {"Name", "Size", "Changed", "Rights", "Owner", "Group"} <= set(COLUMN_PROVIDERS)
+
+
+def test_hidden_columns_are_collected_on_demand(sample_dir):
+    user_name.cache_clear()
+    listing = DirectoryListing.scan(sample_dir, required_fields(["Name", "Rights", "Owner", "Type"]))
+    rows = listing.format_rows(["Name", "Rights", "Owner", "Type"], length=2)
+    assert rows[0] == ["/docs", rows[0][1], user_name(os.getuid()), "inode/directory"]
+    assert rows[0][1].startswith("d")
+    assert rows[1][3] == "text/html"
+    # one passwd lookup for the whole directory, all entries share the owner
+    assert user_name.cache_info().misses == 1
+
+
+# Test: edge case (a name-only scan skips stat entirely)
+def test_name_only_scan_has_no_stat_data(sample_dir):
+    scan = scan_directory(sample_dir, required_fields(["Name"]))
+    assert len(scan) == 21
+    assert set(scan.size) == {None}
+    assert set(scan.owner) == {None}
+    assert scan.is_dir[0]
+
+
+# Test: failure case (unknown columns are ignored)
+def test_unknown_column_is_ignored(sample_dir):
+    assert required_fields(["Name", "Nope"]) == frozenset()
+    listing = DirectoryListing.scan(sample_dir, frozenset())
+    assert listing.format_rows(["Nope", "Name"], length=1) == [["/docs"]]
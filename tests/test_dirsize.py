@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+import pytest
+
+from yaafc.filesystem.dirsize import DirectorySizeCalculator
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "a" / "one").write_bytes(b"x" * 100)
+    (tmp_path / "a" / "b" / "two").write_bytes(b"x" * 20)
+    (tmp_path / "a" / "b" / "c" / "three").write_bytes(b"x" * 3)
+    (tmp_path / "a" / "link").symlink_to(tmp_path / "a" / "one")
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+def collect(calculator, paths, interval=0.05):
+    async def run():
+        totals = {}
+        async for update in calculator.sizes(paths, interval):
+            totals.update(update)
+        return totals
+
+    return asyncio.run(run())
+
+
+# Test: expected use
+def test_sizes_of_nested_trees(tree):
+    calculator = DirectorySizeCalculator(max_workers=2)
+    totals = collect(calculator, [str(tree / "a"), str(tree / "empty")])
+    # the symlink counts with its own size, it is not followed
+    link_size = (tree / "a" / "link").lstat().st_size
+    assert totals == {str(tree / "a"): (123 + link_size, True), str(tree / "empty"): (0, True)}
+    calculator.shutdown()
+
+
+def test_finished_totals_are_cached(tree):
+    calculator = DirectorySizeCalculator()
+    first = collect(calculator, [str(tree / "a")])
+    # a change deep in the tree does not touch the mtime of the walked directory
+    (tree / "a" / "b" / "c" / "three").write_bytes(b"x" * 1000)
+    assert collect(calculator, [str(tree / "a")]) == first
+    calculator.invalidate()
+    assert collect(calculator, [str(tree / "a")]) != first
+    calculator.shutdown()
+
+
+# Test: edge case (partial totals are reported and walks can be cancelled)
+def test_walk_reports_progress_and_stops_when_cancelled(tree):
+    calculator = DirectorySizeCalculator(report_interval=0.0)
+    reports = []
+    assert calculator.walk(str(tree / "a"), threading.Event(), lambda *report: reports.append(report)) > 0
+    assert [done for _, _, done in reports] == [False] * (len(reports) - 1) + [True]
+    calculator.invalidate()
+    cancelled = threading.Event()
+    cancelled.set()
+    assert calculator.walk(str(tree / "a"), cancelled, lambda *report: None) is None
+
+
+def test_closing_the_stream_cancels_walkers(tree):
+    calculator = DirectorySizeCalculator()
+    walks = []
+    original_walk = calculator.walk
+
+    def slow_walk(path, cancelled, report):
+        walks.append(cancelled)
+        cancelled.wait(5)
+        return original_walk(path, cancelled, report)
+
+    calculator.walk = slow_walk
+
+    async def run():
+        updates = calculator.sizes([str(tree / "a")], interval=0.05)
+        assert await updates.__anext__() == {}
+        await updates.aclose()
+
+    asyncio.run(run())
+    assert walks[0].is_set()
+    calculator.shutdown()
+
+
+# Test: failure case (unreadable directories count as empty)
+def test_missing_directory_has_zero_size(tree):
+    calculator = DirectorySizeCalculator()
+    assert collect(calculator, [str(tree / "missing")]) == {str(tree / "missing"): (0, True)}
+    calculator.shutdown()
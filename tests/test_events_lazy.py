@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+import yaafc.events
+
+
+def loaded_submodules(statement: str) -> set[str]:
+    code = f"import sys\n{statement}\nprint(' '.join(m for m in sys.modules if m.startswith('yaafc.events.')))"
+    # a fresh interpreter running this test's own code
+    return set(subprocess.check_output([sys.executable, "-c", code], text=True).split())  # noqa: S603
+
+
+# Test: expected use
+def test_submodules_are_imported_on_first_access():
+    assert loaded_submodules("import yaafc.events") == set()
+    assert loaded_submodules("from yaafc.events import MouseEvent") == {
+        "yaafc.events.mouse_events",
+        "yaafc.events.spec_factory",
+    }
+
+
+def test_exports_resolve_to_their_submodule():
+    from yaafc.events.keyboard_events import KeyDownEvent
+    from yaafc.events.mouse_events import PointerEvent
+
+    assert yaafc.events.KeyDownEvent is KeyDownEvent
+    # defined by both mouse_events and pointer_events, exported from the former as before
+    assert yaafc.events.PointerEvent is PointerEvent
+    assert "KeyDownEvent" in vars(yaafc.events)
+
+
+def test_watcher_loads_only_the_specs_it_binds():
+    assert loaded_submodules("from yaafc.events import enhanced_event_watcher") == {
+        "yaafc.events.batching",
+        "yaafc.events.enhanced_event_watcher",
+        "yaafc.events.rate_limit",
+        "yaafc.events.spec_factory",
+    }
+    statement = "import reflex as rx\nfrom yaafc.events import enhanced_event_watcher\n"
+    statement += "enhanced_event_watcher(on_key_down=rx.console_log('key'))"
+    assert "yaafc.events.keyboard_events" in loaded_submodules(statement)
+
+
+# Test: edge case (every declared export exists)
+def test_all_exports_resolve():
+    assert yaafc.events.__all__ == sorted(yaafc.events._EXPORTS)
+    assert all(getattr(yaafc.events, name) is not None for name in yaafc.events.__all__)
+    assert set(yaafc.events.__all__) <= set(dir(yaafc.events))
+
+
+# Test: failure case
+def test_unknown_names_raise_attribute_error():
+    with pytest.raises(AttributeError, match="NoSuchEvent"):
+        yaafc.events.NoSuchEvent  # noqa: B018
+    with pytest.raises(ImportError):
+        from yaafc.events import NoSuchEvent  # noqa: F401
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+import pytest
+
+import yaafc.components.file_jobs as file_jobs_module
+import yaafc.filesystem.jobs as jobs
+from yaafc.components.file_jobs import FileJobsState, file_jobs
+from yaafc.filesystem.jobs import JobEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    job_engine = JobEngine(journal_dir=str(tmp_path / "journal"), max_workers=2)
+    monkeypatch.setattr(file_jobs_module, "job_engine", job_engine)
+    yield job_engine
+    job_engine.shutdown()
+
+
+@pytest.fixture
+def state():
+    return FileJobsState(_reflex_internal_init=True)
+
+
+def block_copies(monkeypatch):
+    started = threading.Event()
+
+    def blocking_copy(source, destination, progress, cancelled, offset):
+        started.set()
+        cancelled.wait(30)
+        raise jobs.TransferCancelled(source)
+
+    monkeypatch.setattr(jobs, "copy_file", blocking_copy)
+    return started
+
+
+# Test: expected use
+def test_start_job_shows_row_and_watches_it(engine, state, tmp_path):
+    (tmp_path / "source.txt").write_bytes(b"x" * 2048)
+    (tmp_path / "target").mkdir()
+    watch = asyncio.run(state.start_job("copy", [str(tmp_path / "source.txt")], str(tmp_path / "target")))
+    (row,) = state.jobs
+    assert watch.handler.fn.__name__ == "watch_job"
+    assert watch.args[0][1]._var_value == row["job_id"]
+
+    progress = engine.wait(row["job_id"], timeout=30)
+    state._show(progress)
+    (row,) = state.jobs
+    assert row["state"] == "done"
+    assert row["percent"] == 100
+    assert row["finished"] == 1
+    assert (tmp_path / "target" / "source.txt").read_bytes() == b"x" * 2048
+
+
+def test_resume_jobs_adopts_only_restarted_and_own_jobs(engine, state, tmp_path, monkeypatch):
+    block_copies(monkeypatch)
+    (tmp_path / "target").mkdir()
+    (tmp_path / "source.txt").write_bytes(b"x")
+    # a job another client started is still running, this client has none
+    engine.submit("copy", [str(tmp_path / "source.txt")], str(tmp_path / "target"))
+    assert asyncio.run(state.resume_jobs()) == []
+    assert state.jobs == []
+
+
+def test_paused_row_resumes(engine, state, tmp_path, monkeypatch):
+    copy_file = jobs.copy_file
+    started = block_copies(monkeypatch)
+    (tmp_path / "target").mkdir()
+    (tmp_path / "source.txt").write_bytes(b"x" * 2048)
+    asyncio.run(state.start_job("copy", [str(tmp_path / "source.txt")], str(tmp_path / "target")))
+    job_id = state.jobs[0]["job_id"]
+    assert started.wait(30)
+    state.pause_job(job_id)
+    state._show(engine.wait(job_id, timeout=30))
+    assert state.jobs[0]["state"] == "paused"
+    monkeypatch.setattr(jobs, "copy_file", copy_file)
+
+    watch = asyncio.run(state.resume_job(job_id))
+    assert watch.handler.fn.__name__ == "watch_job"
+    assert engine.wait(job_id, timeout=30).state == "done"
+    assert state.job_error == ""
+    assert (tmp_path / "target" / "source.txt").read_bytes() == b"x" * 2048
+
+
+# Test: failure case (rejected jobs are reported, not shown)
+def test_start_job_reports_invalid_job(engine, state, tmp_path):
+    assert asyncio.run(state.start_job("copy", [str(tmp_path)], str(tmp_path / "missing"))) is None
+    assert state.jobs == []
+    assert "is not a directory" in state.job_error
+
+
+def test_stale_job_ids_are_reported(engine, state):
+    state.pause_job("gone")
+    assert state.job_error == "job gone is no longer known"
+    state.job_error = ""
+    state.cancel_job("gone")
+    assert state.job_error == "job gone is no longer known"
+    state.job_error = ""
+    assert asyncio.run(state.resume_job("gone")) is None
+    assert state.job_error == "job gone is no longer known"
+
+
+def test_finished_job_does_not_resume(engine, state, tmp_path):
+    (tmp_path / "target").mkdir()
+    (tmp_path / "source.txt").write_bytes(b"x")
+    job = engine.submit("copy", [str(tmp_path / "source.txt")], str(tmp_path / "target"))
+    engine.wait(job.job_id, timeout=30)
+    assert asyncio.run(state.resume_job(job.job_id)) is None
+    assert "only paused jobs resume" in state.job_error
+
+
+def test_file_jobs_renders_progress():
+    component = file_jobs()
+    assert "resume_jobs" in str(component.event_triggers["on_mount"])
+    assert "percent" in str(component)
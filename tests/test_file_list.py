@@ -0,0 +1,147 @@
+import asyncio
+import types
+
+import pytest
+from reflex.utils import prerequisites
+
+from yaafc.components.file_list import (
+    MATCH_COLUMN,
+    FileListState,
+    _client_connected,
+    _merge_matches,
+    file_list,
+    show_directory_table,
+)
+from yaafc.filesystem.grep import ContentMatch
+from yaafc.filesystem.listing import DirectoryListing
+from yaafc.filesystem.scanner import stat_entries
+
+
+@pytest.fixture
+def state(tmp_path):
+    for index in range(500):
+        (tmp_path / f"file_{index:04d}.txt").write_bytes(b"")
+    file_list_state = FileListState(_reflex_internal_init=True)
+    file_list_state.current_directory = str(tmp_path)
+    return file_list_state
+
+
+# Test: expected use
+def test_file_list_renders_only_window(state):
+    window = FileListState.window_size + FileListState.overscan
+    assert state.total_rows == 500
+    assert len(state.data) == window
+    assert state.data[0][0] == "file_0000.txt"
+    assert not state.has_previous_rows
+    assert state.has_next_rows
+
+
+def test_file_list_scrolls_by_offset(state):
+    state.show_next_rows()
+    assert state.window_offset == FileListState.window_size
+    assert len(state.data) == FileListState.window_size + 2 * FileListState.overscan
+    assert state.data[0][0] == f"file_{FileListState.window_size - FileListState.overscan:04d}.txt"
+    assert state.has_previous_rows
+    state.show_previous_rows()
+    assert state.window_offset == 0
+
+
+def test_file_list_window_follows_scroll_position(state):
+    # dragging the scrollbar far below the rendered window
+    state.scroll_to(300 * FileListState.row_height_em)
+    assert state.window_offset == 300
+    assert state.data[0][0] == f"file_{300 - FileListState.overscan:04d}.txt"
+    state.set_current_directory(state.current_directory)
+    assert state.window_offset == 0
+
+
+def test_content_search_shows_matching_lines(state):
+    names = ["file_0003.txt", "file_0007.txt"]
+    scan, _ = stat_entries(state.current_directory, names)
+    state._search_listing = DirectoryListing.from_scan(scan)
+    matches = [ContentMatch("file_0003.txt", 12, "TODO: later"), ContentMatch("file_0007.txt", 1, "# TODO")]
+    state._search_matches = _merge_matches({}, matches)
+    state._search_matches = _merge_matches(state._search_matches, [ContentMatch("file_0003.txt", 40, "TODO again")])
+    assert state.shown_titles == ["Name", "Size", "Changed", MATCH_COLUMN]
+    assert state.column_count == 4
+    assert [row[-1] for row in state.data] == ["12: TODO: later (+1 more)", "1: # TODO"]
+
+
+# Test: edge case (window is clamped at the end of the listing)
+def test_file_list_window_clamped_at_end(state):
+    for _ in range(10):
+        state.show_next_rows()
+    assert state.data[-1][0] == "file_0499.txt"
+    assert not state.has_next_rows
+    assert state.bottom_spacer_height == "0.0em"
+
+
+def test_file_list_toggles_columns(state):
+    assert "owner" not in state._current_listing().fields
+    state.toggle_column("Owner")
+    assert state.column_titles == ["Name", "Size", "Changed", "Owner"]
+    assert len(state.data[0]) == 4
+    assert "owner" in state._current_listing().fields
+    state.toggle_column("Size")
+    assert state.column_titles == ["Name", "Changed", "Owner"]
+
+
+def test_file_list_sorts_and_filters(state):
+    state.sort_by("Name")
+    assert state.sort_descending
+    assert state.data[0][0] == "file_0499.txt"
+    state.set_filter_text("file_000?.txt")
+    assert state.total_rows == 10
+    assert state.data[0][0] == "file_0009.txt"
+    state.set_filter_text("re:(")
+    assert state.filter_error
+    assert state.total_rows == 10
+
+
+def test_file_list_scroll_clamped_at_end(state):
+    state.scroll_to(10_000 * FileListState.row_height_em)
+    assert state.window_offset == 500 - FileListState.window_size
+    assert state.data[-1][0] == "file_0499.txt"
+
+
+def test_computed_rows_leave_the_window_alone(state):
+    state.window_offset = 120
+    state.current_directory = state.current_directory + "/missing"
+    assert state.data == []
+    assert state.window_offset == 120
+
+
+# Test: failure case (unreadable directory renders nothing)
+def test_file_list_missing_directory(tmp_path):
+    file_list_state = FileListState(_reflex_internal_init=True)
+    file_list_state.current_directory = str(tmp_path / "missing")
+    assert file_list_state.data == []
+    assert file_list_state.total_rows == 0
+
+
+# Test: failure case (an invalid search pattern is shown, not dropped)
+def test_invalid_search_pattern_is_reported(state, monkeypatch):
+    # runs the background event on the state itself
+    monkeypatch.setattr(FileListState, "__aenter__", lambda self: asyncio.sleep(0, self), raising=False)
+    monkeypatch.setattr(FileListState, "__aexit__", lambda self, *exc: asyncio.sleep(0), raising=False)
+    monkeypatch.setattr(FileListState, "search_debounce", 0)
+    state.search_text = "grep:re:("
+    asyncio.run(FileListState.search_files.fn(state))
+    assert state.search_error == "invalid pattern: missing ), unterminated subpattern at position 0"
+    assert not state.searching
+    assert "search_error" in str(file_list())
+
+
+def test_directory_table_renders_spacers():
+    rendered = str(show_directory_table())
+    assert "top_spacer_height" in rendered
+    assert "bottom_spacer_height" in rendered
+    assert "scrollTop" in str(file_list())
+
+
+def test_watchers_stop_for_disconnected_clients(monkeypatch):
+    namespace = types.SimpleNamespace(token_to_sid={"open-tab": "sid"})
+    app_info = types.SimpleNamespace(app=types.SimpleNamespace(event_namespace=namespace))
+    monkeypatch.setattr(prerequisites, "get_and_validate_app", lambda: app_info)
+    assert _client_connected("open-tab")
+    assert not _client_connected("closed-tab")
@@ -0,0 +1,83 @@
+import asyncio
+import re
+
+import pytest
+
+from yaafc.filesystem.grep import SNIPPET_LENGTH, ContentSearcher, search_file
+
+
+@pytest.fixture(scope="module")
+def searcher():
+    content_searcher = ContentSearcher(max_workers=2, max_file_size=10_000, files_per_batch=2)
+    yield content_searcher
+    content_searcher.shutdown()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "src" / "deep").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("import os\n\ndef main():\n    # TODO: todo twice\n    pass\n")
+    (tmp_path / "src" / "deep" / "notes.txt").write_text("nothing here\nTodo list\n")
+    (tmp_path / "image.bin").write_bytes(b"\x89PNG\0\0TODO")
+    (tmp_path / "huge.txt").write_text("TODO\n" * 5_000)
+    (tmp_path / "empty.txt").write_text("")
+    return tmp_path
+
+
+def collect(searcher, pattern, directory, **options):
+    async def run():
+        return [match async for batch in searcher.search(pattern, str(directory), **options) for match in batch]
+
+    return sorted((match.path, match.line_number, match.snippet) for match in asyncio.run(run()))
+
+
+# Test: expected use
+def test_literal_search_streams_matching_lines(searcher, tree):
+    # binary and oversized files are skipped, a line matching twice is reported once
+    assert collect(searcher, "todo", tree) == [
+        ("src/deep/notes.txt", 2, "Todo list"),
+        ("src/main.py", 4, "# TODO: todo twice"),
+    ]
+    assert collect(searcher, "TODO", tree, case_sensitive=True) == [("src/main.py", 4, "# TODO: todo twice")]
+
+
+def test_regex_search(searcher, tree):
+    assert collect(searcher, r"^def \w+\(", tree, regex=True) == [("src/main.py", 3, "def main():")]
+    # without regex the pattern is literal text
+    assert collect(searcher, "main(", tree) == [("src/main.py", 3, "def main():")]
+
+
+def test_closing_the_stream_stops_the_search(searcher, tmp_path):
+    for index in range(40):
+        (tmp_path / f"file{index}.txt").write_text("match\n")
+
+    async def run():
+        batches = searcher.search("match", str(tmp_path))
+        first = await batches.__anext__()
+        await batches.aclose()
+        return first
+
+    assert 0 < len(asyncio.run(run())) < 40
+    # the pool stays usable for the next search
+    assert len(collect(searcher, "match", tmp_path)) == 40
+
+
+# Test: edge case (limits per file and long lines)
+def test_search_file_limits(tmp_path):
+    path = tmp_path / "long.txt"
+    path.write_text("x" * 1000 + "needle" + "y" * 1000 + "\n" + "needle\n" * 10)
+    matches = search_file(str(path), b"needle", re.IGNORECASE, 1_000_000, 3)
+    assert [line_number for _, line_number, _ in matches] == [1, 2, 3]
+    assert len(matches[0][2]) == SNIPPET_LENGTH
+    assert "needle" in matches[0][2]
+    assert search_file(str(path), b"needle", 0, 100, 3) == []
+
+
+# Test: failure case
+def test_invalid_regex_is_rejected(searcher, tree):
+    with pytest.raises(re.error):
+        collect(searcher, "(", tree, regex=True)
+
+
+def test_missing_directory_has_no_matches(searcher, tmp_path):
+    assert collect(searcher, "x", tmp_path / "missing") == []
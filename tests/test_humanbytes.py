@@ -0,0 +1,26 @@
+import polars as pl
+import pytest
+
+from yaafc.utilities.humanbytes import HumanBytes, PrecisionRangeError
+
+SIZES = [0, 1, 1023, 1024, 1048575, 3635, 391150, 4318498233, -4318498233, 2251799813685247, 1023.95 * 1024]
+
+
+# Test: expected use
+@pytest.mark.parametrize("metric", [False, True])
+@pytest.mark.parametrize("precision", [0, 1, 2, 3])
+def test_format_series_matches_format(metric, precision):
+    formatted = HumanBytes.format_series(pl.Series("size", SIZES, dtype=pl.Float64), metric, precision)
+    assert formatted.name == "size"
+    assert formatted.to_list() == [HumanBytes.format(size, metric, precision) for size in SIZES]
+
+
+# Test: edge case (nulls and plain sequences)
+def test_format_series_keeps_nulls():
+    assert HumanBytes.format_series([1, None, 2048]).to_list() == ["1.0 B", None, "2.0 KiB"]
+
+
+# Test: failure case
+def test_format_series_rejects_precision():
+    with pytest.raises(PrecisionRangeError):
+        HumanBytes.format_series([1], precision=4)
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+import yaafc.filesystem.job_plan as job_plan
+import yaafc.filesystem.jobs as jobs
+from yaafc.filesystem.job_plan import COPY, MKDIR, plan_steps
+from yaafc.filesystem.jobs import FileJob, JobEngine, JobError, JobNotPausedError
+from yaafc.filesystem.journal import write_record
+
+
+@pytest.fixture
+def engine(tmp_path):
+    job_engine = JobEngine(journal_dir=str(tmp_path / "journal"), max_workers=3, journal_interval=0.0)
+    yield job_engine
+    job_engine.shutdown()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    source = tmp_path / "source"
+    (source / "sub" / "deep").mkdir(parents=True)
+    for index in range(20):
+        (source / f"file{index}.bin").write_bytes(os.urandom(1000 + index))
+    (source / "sub" / "deep" / "big.bin").write_bytes(os.urandom(3_000_000))
+    (source / "link").symlink_to("file1.bin")
+    (tmp_path / "target").mkdir()
+    return tmp_path
+
+
+def assert_same_tree(left, right):
+    for directory, _, files in os.walk(left):
+        for name in files:
+            path = os.path.join(directory, name)
+            copy = os.path.join(right, os.path.relpath(path, left))
+            if os.path.islink(path):
+                assert os.readlink(copy) == os.readlink(path)
+            else:
+                with open(path, "rb") as original, open(copy, "rb") as copied:
+                    assert original.read() == copied.read()
+
+
+def block_copies(monkeypatch):
+    """Makes file copies wait until their job is stopped, returns the event set once the first copy started."""
+    started = threading.Event()
+
+    def blocking_copy(source, destination, progress, cancelled, offset):
+        started.set()
+        cancelled.wait(30)
+        raise jobs.TransferCancelled(source)
+
+    monkeypatch.setattr(jobs, "copy_file", blocking_copy)
+    return started
+
+
+# Test: expected use
+def test_copy_job_copies_tree(engine, tree):
+    job = engine.submit("copy", [str(tree / "source")], str(tree / "target"))
+    progress = engine.wait(job.job_id, timeout=30)
+    assert progress.state == "done"
+    assert progress.errors == []
+    assert progress.done_bytes == progress.total_bytes > 3_000_000
+    assert progress.fraction == 1.0
+    assert_same_tree(tree / "source", tree / "target" / "source")
+    assert os.listdir(engine.journal_dir) == []
+
+
+@pytest.mark.parametrize("same_device", [True, False])
+def test_move_job_renames_or_copies(engine, tree, monkeypatch, same_device):
+    monkeypatch.setattr(job_plan, "same_device", lambda source, destination: same_device)
+    expected = {path: (tree / "source" / path).read_bytes() for path in ["file3.bin", "sub/deep/big.bin"]}
+    job = engine.submit("move", [str(tree / "source")], str(tree / "target"))
+    assert engine.wait(job.job_id, timeout=30).state == "done"
+    assert len(job.steps) == 1 if same_device else len(job.steps) > 20
+    assert not (tree / "source").exists()
+    for path, content in expected.items():
+        assert (tree / "target" / "source" / path).read_bytes() == content
+
+
+def test_delete_job_removes_tree(engine, tree):
+    job = engine.submit("delete", [str(tree / "source")])
+    assert engine.wait(job.job_id, timeout=30).state == "done"
+    assert not (tree / "source").exists()
+
+
+def test_watch_yields_throttled_snapshots(engine, tree):
+    async def run():
+        job = engine.submit("copy", [str(tree / "source")], str(tree / "target"))
+        return [progress async for progress in engine.watch(job.job_id, interval=0.05)]
+
+    snapshots = asyncio.run(run())
+    assert snapshots[-1].state == "done"
+    # one snapshot per interval, not one per file
+    assert len(snapshots) < snapshots[-1].total_files
+
+
+# Test: edge case (an interrupted job resumes from its journal)
+def test_resume_continues_interrupted_job(engine, tree, monkeypatch):
+    job = FileJob("copy", [str(tree / "source")], str(tree / "target"))
+    job._set_steps(list(plan_steps(job)))
+    engine._create_journal(job)
+    # the directories and the first file were done, the big file was copied halfway
+    done = [index for index, step in enumerate(job.steps) if step.action == MKDIR]
+    first_file = next(index for index, step in enumerate(job.steps) if step.action == COPY)
+    big_index = next(index for index, step in enumerate(job.steps) if step.source.endswith("big.bin"))
+    big = job.steps[big_index]
+    with open(os.path.join(engine.journal_dir, f"{job.job_id}.jsonl"), "a") as journal:
+        write_record(journal, {"done": [*done, first_file]})
+        write_record(journal, {"started": big_index})
+        write_record(journal, {"written": [[big_index, 1_000_000]]})
+        journal.write('{"done": [')
+    for index in done:
+        os.makedirs(job.steps[index].destination, exist_ok=True)
+    with open(big.source, "rb") as source, open(big.destination, "wb") as destination:
+        destination.write(source.read(1_000_000))
+    offsets = {}
+    copy_file = jobs.copy_file
+
+    def recording_copy(source, destination, progress, cancelled, offset):
+        offsets[source] = offset
+        copy_file(source, destination, progress, cancelled, offset)
+
+    monkeypatch.setattr(jobs, "copy_file", recording_copy)
+
+    (resumed,) = engine.resume()
+    assert resumed.job_id == job.job_id
+    assert resumed.resumed
+    progress = engine.wait(resumed.job_id, timeout=30)
+    assert progress.state == "done"
+    assert progress.done_bytes == progress.total_bytes
+    # the already copied file was not touched again, the big one continued where its journal left off
+    assert not os.path.exists(job.steps[first_file].destination)
+    assert offsets[big.source] == 1_000_000
+    with open(big.source, "rb") as source, open(big.destination, "rb") as destination:
+        assert source.read() == destination.read()
+
+
+def test_resume_replaces_destination_it_did_not_start(engine, tree):
+    # an overwriting job interrupted before it reached an existing, shorter destination
+    source = tree / "source" / "file0.bin"
+    (tree / "target" / "file0.bin").write_bytes(b"old" * 100)
+    job = FileJob("copy", [str(source)], str(tree / "target"), overwrite=True)
+    job._set_steps(list(plan_steps(job)))
+    engine._create_journal(job)
+
+    (resumed,) = engine.resume()
+    assert engine.wait(resumed.job_id, timeout=30).state == "done"
+    assert (tree / "target" / "file0.bin").read_bytes() == source.read_bytes()
+
+
+def test_pause_keeps_journal(engine, tree, monkeypatch):
+    started = block_copies(monkeypatch)
+    job = engine.submit("copy", [str(tree / "source")], str(tree / "target"))
+    assert started.wait(30)
+    engine.pause(job.job_id)
+    assert engine.wait(job.job_id, timeout=30).state == "paused"
+    with open(os.path.join(engine.journal_dir, f"{job.job_id}.jsonl")) as journal:
+        assert json.loads(journal.readline())["job"] == job.job_id
+
+
+def test_paused_job_resumes_in_process(engine, tree, monkeypatch):
+    copy_file = jobs.copy_file
+    started = block_copies(monkeypatch)
+    job = engine.submit("copy", [str(tree / "source")], str(tree / "target"))
+    assert started.wait(30)
+    engine.pause(job.job_id)
+    assert engine.wait(job.job_id, timeout=30).state == "paused"
+    monkeypatch.setattr(jobs, "copy_file", copy_file)
+
+    assert engine.resume(job.job_id) == [job]
+    progress = engine.wait(job.job_id, timeout=30)
+    assert progress.state == "done"
+    assert progress.done_bytes == progress.total_bytes
+    assert not os.path.exists(os.path.join(engine.journal_dir, f"{job.job_id}.jsonl"))
+    assert_same_tree(tree / "source", tree / "target" / "source")
+
+
+# Test: edge case (a paused job cancelled without resuming)
+def test_paused_job_cancels(engine, tree, monkeypatch):
+    started = block_copies(monkeypatch)
+    job = engine.submit("copy", [str(tree / "source")], str(tree / "target"))
+    assert started.wait(30)
+    engine.pause(job.job_id)
+    engine.wait(job.job_id, timeout=30)
+    engine.cancel(job.job_id)
+    assert job.progress().state == "cancelled"
+    assert not os.path.exists(os.path.join(engine.journal_dir, f"{job.job_id}.jsonl"))
+    assert engine.resume() == []
+
+
+# Test: failure cases
+def test_conflicts_are_reported(engine, tree):
+    (tree / "target" / "source").mkdir()
+    job = engine.submit("copy", [str(tree / "source"), str(tree / "missing")], str(tree / "target"))
+    progress = engine.wait(job.job_id, timeout=30)
+    assert progress.state == "failed"
+    assert len(progress.errors) == 2
+    assert os.listdir(tree / "target" / "source") == []
+
+
+def test_invalid_jobs_are_rejected(engine, tree):
+    with pytest.raises(JobError):
+        engine.submit("copy", [str(tree / "source")], str(tree / "missing"))
+    with pytest.raises(JobError):
+        engine.submit("shred", [str(tree / "source")])
+
+
+def test_only_paused_jobs_resume(engine, tree, monkeypatch):
+    started = block_copies(monkeypatch)
+    job = engine.submit("copy", [str(tree / "source")], str(tree / "target"))
+    assert started.wait(30)
+    with pytest.raises(JobNotPausedError):
+        engine.resume(job.job_id)
+    engine.cancel(job.job_id)
+    assert engine.wait(job.job_id, timeout=30).state == "cancelled"
+    with pytest.raises(JobNotPausedError):
+        engine.resume(job.job_id)
+    with pytest.raises(KeyError):
+        engine.resume("unknown")
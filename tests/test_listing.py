@@ -0,0 +1,55 @@
+import os
+
+import polars as pl
+import pytest
+
+from yaafc.filesystem.listing import LISTING_SCHEMA, DirectoryListing
+
+
+@pytest.fixture
+def listing(tmp_path):
+    (tmp_path / "zeta").mkdir()
+    (tmp_path / "alpha.txt").write_bytes(b"x" * 2048)
+    (tmp_path / "beta.log").write_bytes(b"x" * 10)
+    return DirectoryListing.scan(tmp_path)
+
+
+# Test: expected use
+def test_listing_is_typed_and_directories_first(listing):
+    assert listing.frame.schema == pl.Schema(LISTING_SCHEMA)
+    assert listing.frame["name"].to_list() == ["zeta", "alpha.txt", "beta.log"]
+    rows = listing.format_rows(["Name", "Size"])
+    assert rows == [["/zeta", "> SUB-DIR <"], ["alpha.txt", "2.0 KiB"], ["beta.log", "10.0 B"]]
+
+
+def test_listing_sort_and_filter_are_vectorized(listing):
+    by_size = listing.filter(~pl.col("is_dir")).sort("size")
+    assert by_size.frame["name"].to_list() == ["beta.log", "alpha.txt"]
+    # the original snapshot is left untouched
+    assert len(listing) == 3
+
+
+def test_listing_shows_tree_sizes(listing):
+    rows = listing.with_tree_sizes({"zeta": (4096, False)}).format_rows(["Name", "Size"], length=1)
+    assert rows == [["/zeta", "4.0 KiB …"]]
+    rows = listing.with_tree_sizes({"zeta": (4096, True)}).format_rows(["Size"], length=1)
+    assert rows == [["4.0 KiB"]]
+    assert listing.frame["tree_size"].null_count() == 3
+
+
+# Test: edge case (only the requested slice is formatted)
+def test_listing_format_rows_window(listing):
+    assert listing.format_rows(["Name"], offset=1, length=1) == [["alpha.txt"]]
+    assert listing.format_rows(["Name"], offset=10) == []
+
+
+def test_listing_missing_stat_data(tmp_path):
+    os.symlink(tmp_path / "missing", tmp_path / "link")
+    listing = DirectoryListing.scan(tmp_path)
+    assert listing.format_rows(["Name", "Size", "Changed"]) == [["link", "--", "--"]]
+
+
+# Test: failure case
+def test_listing_scan_missing_directory(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DirectoryListing.scan(tmp_path / "nope")
@@ -0,0 +1,74 @@
+import os
+import time
+
+import pytest
+
+from yaafc.filesystem.cache import ListingCache
+
+
+@pytest.fixture
+def directories(tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"dir{index}"
+        path.mkdir()
+        (path / "file.txt").write_bytes(b"x")
+        paths.append(str(path))
+    return paths
+
+
+# Test: expected use
+def test_cache_shares_snapshot_between_lookups(directories):
+    cache = ListingCache()
+    first = cache.get(directories[0])
+    assert cache.get(directories[0]) is first
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_cache_rescans_when_directory_changes(directories):
+    cache = ListingCache()
+    first = cache.get(directories[0])
+    with open(os.path.join(directories[0], "new.txt"), "w"):
+        pass
+    # make sure the directory mtime differs even on coarse-grained file systems
+    os.utime(directories[0], ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    second = cache.get(directories[0])
+    assert second is not first
+    assert len(second) == 2
+
+
+# Test: edge cases (LRU eviction and TTL expiry)
+def test_cache_evicts_least_recently_used(directories):
+    cache = ListingCache(max_entries=2)
+    cache.get(directories[0])
+    cache.get(directories[1])
+    cache.get(directories[0])
+    cache.get(directories[2])
+    assert len(cache) == 2
+    cache.get(directories[1])
+    assert cache.misses == 4
+
+
+def test_cache_ttl_expires(directories):
+    cache = ListingCache(ttl=0.0)
+    first = cache.get(directories[0])
+    assert cache.get(directories[0]) is not first
+    assert cache.hits == 0
+
+
+# Test: failure case
+def test_cache_missing_directory(tmp_path):
+    cache = ListingCache()
+    with pytest.raises(FileNotFoundError):
+        cache.get(str(tmp_path / "missing"))
+    assert len(cache) == 0
+
+
+# Test: edge case (a request for more fields rescans with the union of both)
+def test_cache_widens_fields(directories):
+    cache = ListingCache()
+    first = cache.get(directories[0], frozenset({"mime"}))
+    second = cache.get(directories[0], frozenset({"stat"}))
+    assert second is not first
+    assert second.fields == {"mime", "stat"}
+    assert cache.get(directories[0], frozenset({"mime"})) is second
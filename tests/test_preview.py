@@ -0,0 +1,106 @@
+import asyncio
+import os
+
+import pytest
+
+import yaafc.filesystem.preview as preview
+from yaafc.filesystem.preview import PreviewService, TextPreview
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    # small blocks, so the line index spans many of them
+    monkeypatch.setattr(preview, "BLOCK_SIZE", 64)
+    path = tmp_path / "app.log"
+    path.write_bytes(b"".join(f"line {index}\r\n".encode() for index in range(1000)) + b"last \xff")
+    return path
+
+
+@pytest.fixture
+def service(tmp_path):
+    preview_service = PreviewService(cache_dir=str(tmp_path / "thumbnails"), max_cache_bytes=100, max_open=2)
+    yield preview_service
+    preview_service.shutdown()
+
+
+# Test: expected use
+def test_text_preview_pages_by_line(log_file):
+    with TextPreview(str(log_file)) as text:
+        assert text.lines(0, 2) == ["line 0", "line 1"]
+        assert text.lines(998, 5) == ["line 998", "line 999", "last �"]
+        assert text.read(text.line_offset(500), 8) == b"line 500"
+        assert text.line_count() == 1001
+
+
+def test_text_preview_indexes_lazily(log_file):
+    with TextPreview(str(log_file)) as text:
+        text.lines(10, 1)
+        assert len(text._breaks) < 5
+        assert text.lines(1001, 1) == []
+        assert text._breaks[-1] == 1000
+
+
+def test_service_reuses_open_previews(service, tmp_path, log_file):
+    first = service.text(str(log_file))
+    assert service.text(str(log_file)) is first
+    for name in ["a", "b"]:
+        (tmp_path / name).write_text(name)
+        service.text(str(tmp_path / name)).close()
+    # the least recently used preview was dropped from the service, its two holders can still read it
+    assert str(log_file) not in [key[0] for key in service._texts]
+    first.close()
+    assert first.lines(0, 1) == ["line 0"]
+    first.close()
+    with pytest.raises(ValueError):
+        first.lines(0, 1)
+
+
+def test_digests_are_capped(service, tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    service.max_digests = 1
+    service.max_cache_bytes = 10_000_000
+    for color in ["red", "blue"]:
+        image_module.new("RGB", (8, 8), color).save(tmp_path / f"{color}.png")
+        asyncio.run(service.thumbnail(str(tmp_path / f"{color}.png"), 4))
+    assert [key[0] for key in service._digests] == [str(tmp_path / "blue.png")]
+
+
+def test_thumbnails_are_cached_by_content(service, tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    image_module.new("RGB", (800, 600), "red").save(tmp_path / "red.png")
+    (tmp_path / "copy.png").write_bytes((tmp_path / "red.png").read_bytes())
+    service.max_cache_bytes = 10_000_000
+    thumbnail = asyncio.run(service.thumbnail(str(tmp_path / "red.png"), 64))
+    assert asyncio.run(service.thumbnail(str(tmp_path / "copy.png"), 64)) == thumbnail
+    with image_module.open(thumbnail) as image:
+        assert image.size == (64, 48)
+
+
+# Test: edge case (cache trimming and empty files)
+def test_cache_is_trimmed_oldest_first(service):
+    for index, name in enumerate(["old", "middle", "new"]):
+        path = os.path.join(service.cache_dir, "ab", f"{name}.png")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(b"x" * 40)
+        os.utime(path, (index, index))
+    service._trim(40)
+    assert sorted(os.listdir(os.path.join(service.cache_dir, "ab"))) == ["middle.png", "new.png"]
+
+
+def test_empty_file(tmp_path):
+    (tmp_path / "empty").write_bytes(b"")
+    with TextPreview(str(tmp_path / "empty")) as text:
+        assert text.lines(0, 10) == []
+        assert text.line_count() == 0
+        assert text.read(0, 10) == b""
+
+
+# Test: failure case
+def test_thumbnail_of_unreadable_file(service, tmp_path, monkeypatch):
+    (tmp_path / "notes.txt").write_text("not an image")
+    assert preview.render_thumbnail(str(tmp_path / "notes.txt"), service.cache_dir, 64) is None
+    monkeypatch.setattr(preview, "Image", None)
+    assert asyncio.run(service.thumbnail(str(tmp_path / "notes.txt"))) is None
+    with pytest.raises(OSError):
+        service.text(str(tmp_path / "missing"))
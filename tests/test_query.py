@@ -0,0 +1,109 @@
+import datetime
+import os
+
+import pytest
+
+from yaafc.filesystem.listing import DirectoryListing
+from yaafc.filesystem.query import (
+    DateFilter,
+    GlobFilter,
+    InvalidFilterError,
+    ListingFilter,
+    ListingQuery,
+    RegexFilter,
+    SizeFilter,
+    SortKey,
+    UnknownSortKeyError,
+    parse_filter,
+)
+
+
+@pytest.fixture
+def listing(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "Build10").mkdir()
+    (tmp_path / "build9").mkdir()
+    for name, size, day in [
+        ("file10.txt", 300, 3),
+        ("file9.py", 100, 1),
+        ("File1.TXT", 200, 2),
+        ("notes", 0, 4),
+    ]:
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        moment = datetime.datetime(2024, 1, day, 12, tzinfo=datetime.timezone.utc).timestamp()
+        os.utime(path, (moment, moment))
+    return DirectoryListing.scan(tmp_path)
+
+
+def names(listing):
+    return listing.frame["name"].to_list()
+
+
+# Test: expected use
+def test_query_sorts_naturally_with_directories_first(listing):
+    assert names(ListingQuery().apply(listing)) == [
+        "build9",
+        "Build10",
+        "src",
+        "File1.TXT",
+        "file9.py",
+        "file10.txt",
+        "notes",
+    ]
+
+
+def test_query_multi_key_sort(listing):
+    by_extension = ListingQuery(sort=(SortKey("extension"),), directories_first=False).apply(listing)
+    # directories have no extension and sort with "notes"
+    assert names(by_extension) == ["build9", "Build10", "notes", "src", "file9.py", "File1.TXT", "file10.txt"]
+    by_size = ListingQuery(sort=(SortKey("size", descending=True),)).apply(listing.filter(~listing.frame["is_dir"]))
+    assert names(by_size) == ["file10.txt", "File1.TXT", "file9.py", "notes"]
+    sized = listing.with_tree_sizes({"src": (10, True), "build9": (30, True), "Build10": (20, False)})
+    assert names(ListingQuery(sort=(SortKey("size", descending=True),)).apply(sized))[:3] == [
+        "build9",
+        "Build10",
+        "src",
+    ]
+    by_mtime = ListingQuery(sort=(SortKey("mtime"),)).apply(listing)
+    assert names(by_mtime)[3:] == ["file9.py", "File1.TXT", "file10.txt", "notes"]
+
+
+def test_query_filters_keep_directories(listing):
+    query = ListingQuery(filters=(GlobFilter("*.txt"), SizeFilter(minimum=250)))
+    assert names(query.apply(listing)) == ["build9", "Build10", "src", "file10.txt"]
+    query = ListingQuery(filters=(RegexFilter(r"^b.*\d$", case_sensitive=False),), filter_directories=True)
+    assert names(query.apply(listing)) == ["build9", "Build10"]
+    after = datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)
+    query = ListingQuery(filters=(DateFilter(after=after, before=after + datetime.timedelta(days=2)),))
+    assert names(query.apply(listing))[3:] == ["File1.TXT", "file10.txt"]
+
+
+def test_parse_filter_terms(listing):
+    assert parse_filter("*.py size:<1k") == (GlobFilter("*.py"), SizeFilter(None, 1024))
+    assert parse_filter("le1") == (GlobFilter("*le1*"),)
+    assert parse_filter("") == ()
+    query = ListingQuery(filters=parse_filter("date:2024-01-02T00:00:00+00:00 txt"), filter_directories=True)
+    assert names(query.apply(listing)) == ["File1.TXT"]
+
+
+# Test: edge case (glob patterns match the whole name, plain text is matched literally)
+def test_glob_filter_anchors_and_escapes(tmp_path):
+    for name in ["a[1].txt", "ba.txt", "a1.txt"]:
+        (tmp_path / name).write_bytes(b"")
+    listing = DirectoryListing.scan(tmp_path)
+    assert names(ListingQuery(filters=(GlobFilter("a*"),)).apply(listing)) == ["a1.txt", "a[1].txt"]
+    assert names(ListingQuery(filters=parse_filter("[1]")).apply(listing)) == []
+    assert names(ListingQuery(filters=parse_filter("1].")).apply(listing)) == ["a[1].txt"]
+
+
+# Test: failure cases
+def test_query_rejects_invalid_filters(listing):
+    with pytest.raises(InvalidFilterError):
+        ListingQuery(filters=(RegexFilter("("),)).validate()
+    with pytest.raises(InvalidFilterError):
+        parse_filter("size:>lots")
+    with pytest.raises(UnknownSortKeyError, match="colour"):
+        ListingQuery(sort=(SortKey("colour"),)).apply(listing)
+    with pytest.raises(TypeError):
+        ListingFilter()
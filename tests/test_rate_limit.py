@@ -0,0 +1,84 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+import reflex as rx
+
+from yaafc.events import MouseEvent
+from yaafc.events.enhanced_event_watcher import EnhancedEventWatcher, enhanced_event_watcher
+from yaafc.events.rate_limit import RATE_LIMIT_JS, debounce, every_event, per_frame, throttle
+
+
+class RateLimitState(rx.State):
+    @rx.event
+    def handle(self, ev: MouseEvent):
+        pass
+
+
+def rendered_triggers(component) -> dict[str, str]:
+    return {trigger: str(rx.Var.create(chain)) for trigger, chain in component.event_triggers.items()}
+
+
+# Test: expected use
+def test_high_frequency_triggers_are_coalesced_per_frame():
+    triggers = rendered_triggers(enhanced_event_watcher(on_mouse_move=RateLimitState.handle))
+    assert 'rateLimitEvents("on_mouse_move-' in triggers["on_mouse_move"]
+    assert '"mode": "frame"' in triggers["on_mouse_move"]
+    assert '"sum": ["movementX", "movementY"]' in triggers["on_mouse_move"]
+
+
+def test_rate_limits_are_declared_next_to_the_handler():
+    component = enhanced_event_watcher(
+        on_click=throttle(RateLimitState.handle.prevent_default, 100, ("movementX",)),
+        on_mouse_up=debounce(RateLimitState.handle, 250),
+        on_mouse_down=per_frame(RateLimitState.handle),
+    )
+    triggers = rendered_triggers(component)
+    assert '{"mode": "throttle", "wait": 100, "sum": ["movementX"]}' in triggers["on_click"]
+    # prevent_default travels with the events and is applied when the event happens
+    assert "preventDefault" in triggers["on_click"]
+    assert '{"mode": "debounce", "wait": 250, "sum": []}' in triggers["on_mouse_up"]
+    assert '"mode": "frame"' in triggers["on_mouse_down"]
+    assert component._get_all_custom_code() == {RATE_LIMIT_JS}
+    assert any("addEvents" in hook for hook in component._get_all_hooks())
+
+
+# Test: edge case (opting out of the default rate limit)
+def test_every_event_bypasses_the_default():
+    triggers = rendered_triggers(
+        enhanced_event_watcher(on_mouse_move=every_event(RateLimitState.handle), on_click=RateLimitState.handle)
+    )
+    assert "rateLimitEvents" not in triggers["on_mouse_move"]
+    assert "rateLimitEvents" not in triggers["on_click"]
+    assert triggers["on_click"].count("addEvents") == 1
+
+
+# Test: failure case (bindings never share their held back events)
+def test_every_binding_has_its_own_key():
+    first = rendered_triggers(EnhancedEventWatcher.create(on_mouse_move=RateLimitState.handle))["on_mouse_move"]
+    second = rendered_triggers(EnhancedEventWatcher.create(on_mouse_move=RateLimitState.handle))["on_mouse_move"]
+    assert first.split('"')[1] != second.split('"')[1]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the browser code")
+def test_elements_sharing_a_binding_hold_back_their_own_events():
+    # two rows of a foreach rendered from one binding, and a call without an event
+    script = (
+        RATE_LIMIT_JS
+        + """
+    const delivered = [];
+    const addEvents = (events) => delivered.push(events[0].payload.row);
+    const limited = rateLimitEvents("on_click-0", { mode: "debounce", wait: 10, sum: [] }, addEvents);
+    const first = {}, second = {};
+    const click = (element) => ({ preventDefault() {}, currentTarget: element });
+    limited([{ payload: { row: "first" } }], [click(first)], {});
+    limited([{ payload: { row: "second" } }], [click(second)], {});
+    limited([{ payload: { row: "first again" } }], [click(first)], {});
+    limited([{ payload: { row: "no event" } }], [1], {});
+    setTimeout(() => console.log(JSON.stringify(delivered)), 50);
+    """
+    )
+    # the script is ours and node is resolved to its full path
+    result = subprocess.run([str(shutil.which("node")), "-e", script], capture_output=True, text=True, check=True)  # noqa: S603
+    assert json.loads(result.stdout) == ["second", "first again", "no event"]
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from yaafc.filesystem.scanner import scan_directory
+
+
+@pytest.fixture
+def sample_dir(tmp_path):
+    (tmp_path / "b_dir").mkdir()
+    (tmp_path / "a.txt").write_bytes(b"x" * 10)
+    (tmp_path / "c.bin").write_bytes(b"")
+    return tmp_path
+
+
+# Test: expected use
+def test_scan_directory_partitions_and_stats(sample_dir):
+    scan = scan_directory(sample_dir)
+    assert scan.name == ["a.txt", "b_dir", "c.bin"]
+    assert [scan.name[i] for i in scan.directories] == ["b_dir"]
+    assert [scan.name[i] for i in scan.files] == ["a.txt", "c.bin"]
+    assert scan.size[0] == 10
+    assert scan.inode[0] == os.stat(sample_dir / "a.txt").st_ino
+    assert len(scan) == 3
+
+
+# Test: edge case (dangling symlink has no stat data)
+def test_scan_directory_dangling_symlink(tmp_path):
+    os.symlink(tmp_path / "missing", tmp_path / "link")
+    scan = scan_directory(tmp_path)
+    assert scan.name == ["link"]
+    assert scan.is_dir == [False]
+    assert scan.size == [None]
+    assert scan.mtime == [None]
+
+
+# Test: failure case
+def test_scan_directory_missing_path(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        scan_directory(tmp_path / "does-not-exist")
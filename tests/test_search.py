@@ -0,0 +1,127 @@
+import asyncio
+import os
+import sqlite3
+import time
+
+import pytest
+
+import yaafc.filesystem.search as search_module
+from yaafc.filesystem.search import FilenameIndex
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "docs").mkdir()
+    (root / "src" / "main.py").write_text("")
+    (root / "src" / "pkg" / "Helper_Module.py").write_text("")
+    (root / "docs" / "readme.md").write_text("")
+    (root / "docs" / "100%_done.txt").write_text("")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    return FilenameIndex(
+        database=str(tmp_path / "index" / "search.db"),
+        configured_roots=[str(tmp_path / "root")],
+        refresh_interval=3600.0,
+        batch_size=2,
+    )
+
+
+def search(index, pattern, directory):
+    return sorted(path for batch in index.search(pattern, str(directory)) for path in batch)
+
+
+# Test: expected use
+def test_substring_and_glob_queries(index, tree):
+    assert index.add_root(str(tree)) == str(tree)
+    assert search(index, "module", tree) == [os.path.join("src", "pkg", "Helper_Module.py")]
+    python_files = [os.path.join("src", "main.py"), os.path.join("src", "pkg", "Helper_Module.py")]
+    assert search(index, "*.py", tree) == python_files
+    assert search(index, "*.py", tree / "src" / "pkg") == ["Helper_Module.py"]
+    assert search(index, "[rR]eadme.*", tree) == [os.path.join("docs", "readme.md")]
+    # % and _ are literal characters in globs and plain text
+    assert search(index, "%_", tree) == [os.path.join("docs", "100%_done.txt")]
+    assert search(index, "pk", tree) == [os.path.join("src", "pkg")]
+
+
+def test_stream_yields_batches(index, tree):
+    index.add_root(str(tree))
+
+    async def run():
+        return [batch async for batch in index.stream("*", str(tree))]
+
+    batches = asyncio.run(run())
+    assert all(len(batch) <= 2 for batch in batches)
+    assert len([path for batch in batches for path in batch]) == 7
+
+
+# Test: edge case (updates only list changed directories)
+def test_update_is_incremental(index, tree):
+    index.add_root(str(tree))
+    assert index.update(str(tree)) == 0
+    os.rename(tree / "src" / "pkg", tree / "src" / "lib")
+    (tree / "docs" / "readme.md").unlink()
+    # src and docs changed, the renamed directory is listed as a new one
+    assert index.update(str(tree)) == 3
+    assert search(index, "helper", tree) == [os.path.join("src", "lib", "Helper_Module.py")]
+    assert search(index, "readme", tree) == []
+    with sqlite3.connect(index.database) as connection:
+        paths = [path for (path,) in connection.execute("SELECT path FROM directories")]
+    assert str(tree / "src" / "pkg") not in paths
+
+
+def test_roots_are_merged_and_reused(index, tree):
+    index.add_root(str(tree / "src"))
+    assert index.ensure(str(tree / "src" / "pkg")) == str(tree / "src")
+    assert index.add_root(str(tree)) == str(tree)
+    assert index.roots() == [str(tree)]
+    assert len(search(index, "*", tree)) == 7
+    index.remove_root(str(tree))
+    assert index.roots() == []
+    with sqlite3.connect(index.database) as connection:
+        assert connection.execute("SELECT count(*) FROM entries").fetchone() == (0,)
+
+
+def test_ensure_indexes_configured_root_in_background(index, tree):
+    # searching a subdirectory indexes the configured root around it, not the subdirectory
+    assert index.ensure(str(tree / "src")) == str(tree)
+    assert index.roots() == [str(tree)]
+    while index._refreshing:
+        time.sleep(0.01)
+    assert index._refreshed(str(tree))
+    assert search(index, "helper", tree / "src") == [os.path.join("pkg", "Helper_Module.py")]
+
+
+def test_directories_outside_roots_are_walked(index, tree, tmp_path):
+    (tmp_path / "elsewhere").mkdir()
+    (tmp_path / "elsewhere" / "notes.txt").write_text("")
+    assert index.ensure(str(tmp_path / "elsewhere")) is None
+    assert index.roots() == []
+    assert search(index, "notes", tmp_path / "elsewhere") == ["notes.txt"]
+
+
+def test_short_patterns_match_below_directory(index, tree):
+    index.add_root(str(tree))
+    assert search(index, "py", tree / "src") == ["main.py", os.path.join("pkg", "Helper_Module.py")]
+    assert search(index, "*.md", tree) == [os.path.join("docs", "readme.md")]
+
+
+# Test: edge case (pseudo-filesystems are neither indexed nor walked)
+def test_pseudo_filesystems_are_skipped(index, tree, monkeypatch):
+    monkeypatch.setattr(search_module, "pseudo_filesystem_mounts", lambda: frozenset({str(tree / "docs")}))
+    index.add_root(str(tree))
+    assert search(index, "readme", tree) == []
+    index.remove_root(str(tree))
+    assert search(index, "readme", tree) == []
+    assert search(index, "main", tree) == [os.path.join("src", "main.py")]
+
+
+# Test: failure case
+def test_missing_directory_cannot_be_indexed(index, tree):
+    with pytest.raises(NotADirectoryError):
+        index.add_root(str(tree / "missing"))
+    assert index.ensure(str(tree.parent / "missing")) is None
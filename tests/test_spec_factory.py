@@ -0,0 +1,102 @@
+import dataclasses
+
+import pytest
+import reflex as rx
+from reflex.event import EventChain
+
+from yaafc.events import CopyEvent, MouseEvent, PointerMoveEvent, WheelEvent
+from yaafc.events.clipboard_events import copy_event_spec
+from yaafc.events.enhanced_event_watcher import enhanced_event_watcher
+from yaafc.events.mouse_events import mouse_event_spec
+from yaafc.events.spec_factory import event_payload, read_fields, selective_spec, spec_for
+
+
+def record(event):
+    pass
+
+
+class SpecState(rx.State):
+    @rx.event
+    def alt_only(self, event: MouseEvent):
+        if event.altKey:
+            pass
+
+    @rx.event
+    def position(self, event: PointerMoveEvent):
+        return [event.clientX + event.movementX, event.clientY]
+
+    @rx.event
+    def forwarded(self, event: MouseEvent):
+        record(event)
+
+    @rx.event
+    def captured(self, event: WheelEvent):
+        return lambda: event.deltaY
+
+
+def rendered(chain: EventChain) -> str:
+    return str(rx.Var.create(chain))
+
+
+# Test: expected use
+def test_event_spec_extracts_only_the_selected_fields():
+    (payload,) = spec_for(MouseEvent, ["shiftKey", "altKey"])(rx.Var("_e"))
+    assert str(payload) == '({ ["altKey"] : _e["altKey"], ["shiftKey"] : _e["shiftKey"] })'
+    assert payload._var_type is MouseEvent
+
+
+def test_derived_specs_extract_all_fields():
+    (payload,) = event_payload(rx.Var("_e"), WheelEvent)
+    assert all(f'["{field.name}"]' in str(payload) for field in dataclasses.fields(WheelEvent))
+
+
+def test_fields_are_inferred_from_the_handler():
+    assert read_fields(SpecState.alt_only.fn, "event") == {"altKey"}
+    assert read_fields(SpecState.position.fn, "event") == {"clientX", "clientY", "movementX"}
+
+
+def test_watcher_sends_only_the_fields_read():
+    component = enhanced_event_watcher(on_click=SpecState.alt_only, on_pointer_move=SpecState.position)
+    click = rendered(component.event_triggers["on_click"])
+    assert '["altKey"]' in click
+    assert '["button"]' not in click
+    move = rendered(component.event_triggers["on_pointer_move"])
+    assert '["movementX"]' in move
+    assert '["pressure"]' not in move
+    # the rate limit of the trigger still applies
+    assert "rateLimitEvents" in move
+
+
+def test_selected_payload_is_smaller():
+    full = rendered(EventChain.create(SpecState.alt_only, args_spec=mouse_event_spec, key="on_click"))
+    selected = rendered(EventChain.create(SpecState.alt_only, args_spec=spec_for(MouseEvent, ["altKey"])))
+    assert len(selected) * 3 < len(full)
+
+
+# Test: edge case (the event is used as a whole)
+@pytest.mark.parametrize("handler", [SpecState.forwarded, SpecState.captured])
+def test_escaping_events_keep_the_full_spec(handler):
+    assert read_fields(handler.fn, "event") is None
+    assert selective_spec(handler, mouse_event_spec) is mouse_event_spec
+
+
+def test_unused_events_send_no_fields():
+    assert read_fields(record, "event") == frozenset()
+
+
+def test_handlers_without_event_keep_the_spec():
+    assert selective_spec(SpecState.set_is_hydrated, mouse_event_spec) is mouse_event_spec
+
+
+# Test: failure case
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError, match="noSuchField"):
+        spec_for(MouseEvent, ["altKey", "noSuchField"])
+
+
+# Test: expected use (generated specs are memoized)
+def test_specs_are_generated_once_per_event_class():
+    assert spec_for(CopyEvent) is copy_event_spec
+    assert spec_for(MouseEvent, ["shiftKey", "altKey"]) is spec_for(MouseEvent, ("altKey", "shiftKey"))
+    assert copy_event_spec.__name__ == "copy_event_spec"
+    assert copy_event_spec(rx.Var("_e"))[0] is copy_event_spec(rx.Var("_e"))[0]
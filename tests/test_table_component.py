@@ -0,0 +1,227 @@
+import sys
+from datetime import datetime
+
+import polars as pl
+import pytest
+
+from yaafc.tables import UnknownDatasetError, datasets
+from yaafc.tables.sample import SAMPLE_DATASET
+from yaafc.ui.table import TableComponent
+
+
+def create_state(frame):
+    component = TableComponent.create(page_id="/test", slot_id=0, source=frame)
+    # every created table gets its own state class
+    state_class = TableComponent.__subclasses__()[-1]
+    return component, state_class(_reflex_internal_init=True)
+
+
+@pytest.fixture
+def state():
+    _, table_state = create_state(pl.LazyFrame({"row": list(range(1000))}))
+    return table_state
+
+
+# Test: expected use
+def test_only_the_window_is_materialized(state):
+    window = state.window_size + TableComponent.overscan
+    assert state.visible_rows == [(row,) for row in range(window)]
+    assert not state.has_previous
+    assert state.has_more
+    assert state.bottom_spacer_height == f"{(1000 - window) * TableComponent.row_height}px"
+
+
+def scroll_clock(monkeypatch, interval):
+    # every scroll step happens interval seconds after the previous one
+    ticks = iter(range(1, 100_000))
+    # yaafc.ui.table is shadowed by the table factory in yaafc.ui
+    monkeypatch.setattr(sys.modules["yaafc.ui.table"], "monotonic", lambda: next(ticks) * interval)
+
+
+def test_scrolling_keeps_the_payload_flat(state, monkeypatch):
+    scroll_clock(monkeypatch, 2.0)
+    sizes = set()
+    for _ in range(40):
+        state.load_more_rows()
+        if state.window_offset >= TableComponent.overscan:
+            sizes.add(len(state.visible_rows))
+    assert sizes == {state.window_size + 2 * TableComponent.overscan}
+    assert state.visible_rows[0] == (state.window_offset - TableComponent.overscan,)
+    state.load_previous_rows()
+    assert state.window_offset == 40 * state.load_batch_size - state.load_batch_size
+
+
+def test_viewport_sizes_the_window(state):
+    state.set_viewport({"viewport_height": 900, "row_height": 36})
+    assert state.window_size == 25
+    assert state.load_batch_size == 25
+    assert state.top_spacer_height == "0px"
+    assert state.bottom_spacer_height == f"{(1000 - 25 - TableComponent.overscan) * 36}px"
+
+
+def test_fast_scrolling_takes_larger_steps(monkeypatch):
+    _, state = create_state(pl.LazyFrame({"row": list(range(100_000))}))
+    scroll_clock(monkeypatch, 0.05)
+    offsets = [state.window_offset]
+    for _ in range(10):
+        state.load_more_rows()
+        offsets.append(state.window_offset)
+    steps = [after - before for before, after in zip(offsets, offsets[1:])]
+    assert steps[0] == state.window_size
+    assert steps[-1] > steps[0]
+    assert max(steps) <= TableComponent.max_batch_size
+    # the rows ahead of the scroll direction are prefetched, the payload stays bounded
+    start, stop = state.visible_rows[0][0], state.visible_rows[-1][0]
+    assert state.window_offset - start == TableComponent.overscan
+    assert stop - state.window_offset >= state.window_size + TableComponent.overscan + state.lookahead_rows - 1
+    assert len(state.visible_rows) <= state.window_size + 2 * TableComponent.overscan + TableComponent.max_batch_size
+    # a pause starts over at rest
+    scroll_clock(monkeypatch, 5.0)
+    state.load_more_rows()
+    assert state.lookahead_rows == 0
+    assert state.load_batch_size == state.window_size
+
+
+def test_tables_share_a_dataset_with_their_own_views():
+    frame = pl.DataFrame({"row": list(range(1000)), "name": [f"n{row}" for row in range(1000)]})
+    handle = datasets.register(frame)
+    TableComponent.create(page_id="/test", slot_id=0, dataset=handle)
+    state_class = TableComponent.__subclasses__()[-1]
+    # e.g. ten sessions on the same table
+    states = [state_class(_reflex_internal_init=True) for _ in range(10)]
+    assert {id(state._source()) for state in states} == {id(datasets.get(handle))}
+    states[0].load_more_rows()
+    states[1].sort_by("row")
+    states[1].sort_by("row")
+    states[2].toggle_column("row")
+    assert states[0].visible_rows[0] != states[3].visible_rows[0]
+    assert states[1].visible_rows[0] == (999, "n999")
+    assert states[2].columns == ["name"]
+    assert states[2].visible_rows[0] == ("n0",)
+    assert states[3].visible_rows[0] == (0, "n0")
+    # the sorted view is evaluated once for all states sorting the same way
+    states[4].sort_by("row")
+    states[4].sort_by("row")
+    assert states[4].visible_rows[0] == (999, "n999")
+    assert len(datasets.get(handle)._views) == 1
+
+
+def test_each_table_starts_with_its_own_data_and_transport():
+    handle = datasets.register(pl.DataFrame({"row": [1, 2]}))
+    arrow_table = TableComponent.create(page_id="/test", slot_id=0, dataset=handle, transport="arrow")
+    sample_table = TableComponent.create(page_id="/test", slot_id=1)
+    assert arrow_table.State(_reflex_internal_init=True).dataset == handle
+    assert arrow_table.State.arrow_transport
+    assert sample_table.State(_reflex_internal_init=True).dataset == SAMPLE_DATASET
+    assert not sample_table.State.arrow_transport
+    # the defaults of the mixin are left alone
+    assert TableComponent.__fields__["dataset"].default == SAMPLE_DATASET
+    assert not TableComponent.arrow_transport
+
+
+def test_switching_the_dataset_resets_the_view(state):
+    state.set_column_filter("row", "<10")
+    state.sort_by("row")
+    state.set_dataset(datasets.register(pl.DataFrame({"other": ["x", "y"]})))
+    assert state.columns == ["other"]
+    assert state.column_filters == {}
+    assert state.visible_rows == [("x",), ("y",)]
+
+
+def test_group_by_view_with_summary_footer():
+    frame = pl.DataFrame({"owner": ["a", "b", "a", "c"], "extension": ["py", "md", "md", "py"], "size": [1, 2, 3, 4]})
+    _, state = create_state(frame)
+    state.toggle_summary()
+    assert state.column_summaries[2] == "count 4\ndistinct 4\nsum 10\nmin 1\nmax 4"
+    state.group_by("owner")
+    assert state.columns == ["owner", "rows", "size (sum)"]
+    assert state.visible_rows == [("a", 2, 4), ("b", 1, 2), ("c", 1, 4)]
+    assert state.column_summaries[1].startswith("count 3\ndistinct 2\nsum 4")
+    state.sort_by("size (sum)")
+    state.sort_by("size (sum)")
+    assert [row[0] for row in state.visible_rows] == ["a", "c", "b"]
+    # a group row opens the rows of its group
+    state.open_group(0)
+    assert state.group_columns == []
+    assert state.opened_group == "owner = a"
+    assert state.visible_rows == [("a", "py", 1), ("a", "md", 3)]
+    state.group_by("extension")
+    assert state.visible_rows == [("md", 1, 3), ("py", 1, 1)]
+    state.clear_grouping()
+    assert state.total_rows == 2
+
+
+def test_open_group_matches_typed_and_null_keys():
+    moments = [datetime(2024, 1, 1, 5), None, datetime(2024, 1, 1, 5), None, datetime(2024, 1, 2)]
+    frame = pl.DataFrame({"moment": moments, "size": [1, 2, 3, 4, 5]})
+    _, state = create_state(frame)
+    state.group_by("moment")
+    # nulls group last, the client shows the datetime key as text
+    assert [row[:2] for row in state.visible_rows] == [
+        (datetime(2024, 1, 1, 5), 2),
+        (datetime(2024, 1, 2), 1),
+        (None, 2),
+    ]
+    state.open_group(0)
+    assert state.visible_rows == [(datetime(2024, 1, 1, 5), 1), (datetime(2024, 1, 1, 5), 3)]
+    state.close_group()
+    state.group_by("moment")
+    state.open_group(2)
+    assert state.opened_group == "moment = null"
+    assert state.visible_rows == [(None, 2), (None, 4)]
+    assert state.total_rows == 2
+
+
+# Test: edge case (the window is clamped at the end of the table)
+def test_window_clamped_at_end(state):
+    for _ in range(1000):
+        state.load_more_rows()
+    assert state.visible_rows[-1] == (999,)
+    assert not state.has_more
+    assert state.bottom_spacer_height == "0px"
+
+
+def test_sort_and_filter_the_whole_table(state):
+    state.sort_by("row")
+    state.sort_by("row")
+    assert state.sort_descending
+    assert state.visible_rows[0] == (999,)
+    state.set_column_filter("row", "<100")
+    assert state.total_rows == 100
+    assert state.visible_rows[0] == (99,)
+    state.set_column_filter("row", "<x")
+    assert state.filter_error
+    assert state.column_filters == {"row": "<x"}
+    assert state.total_rows == 100
+
+
+def test_rendered_table_has_spacers():
+    component, _ = create_state(pl.DataFrame({"a": [1]}))
+    rendered = str(component)
+    assert "top_spacer_height" in rendered
+    assert "bottom_spacer_height" in rendered
+    assert "rows_loaded_count" not in rendered
+    assert "measure_viewport" in str(component._get_all_hooks())
+
+
+# Test: failure case (an empty table renders no rows)
+def test_empty_table():
+    _, table_state = create_state(pl.DataFrame({"a": []}, schema={"a": pl.Int64}))
+    assert table_state.visible_rows == []
+    assert not table_state.has_more
+    assert not table_state.has_previous
+
+
+def test_unknown_dataset_fails(state):
+    with pytest.raises(UnknownDatasetError):
+        state.set_dataset("missing")
+    with pytest.raises(UnknownDatasetError):
+        TableComponent.create(page_id="/test", slot_id=0, dataset="missing")
+    assert state.total_rows == 1000
+
+
+def test_unmeasured_viewport_is_ignored(state):
+    state.set_viewport(None)
+    state.set_viewport({"viewport_height": 0, "row_height": None})
+    assert state.window_size == 20
+    assert state.measured_row_height == 0
@@ -0,0 +1,58 @@
+import os
+
+import polars as pl
+import pytest
+
+from yaafc.tables import DatasetRegistry, TableSource, UnknownDatasetError, UnsupportedTableFormatError
+
+
+@pytest.fixture
+def registry():
+    return DatasetRegistry()
+
+
+# Test: expected use
+def test_datasets_are_registered_once(registry):
+    source = TableSource(pl.DataFrame({"a": [1, 2]}))
+    handle = registry.register(source)
+    assert registry.get(handle) is source
+    assert registry.register(source) == handle
+    assert registry.register(pl.DataFrame({"a": [3]}), handle="named") == "named"
+    assert registry.handles() == [handle, "named"]
+    registry.release(handle)
+    assert handle not in registry
+
+
+def test_files_are_shared_until_they_change(registry, tmp_path):
+    path = tmp_path / "table.parquet"
+    pl.DataFrame({"a": [1, 2, 3]}).write_parquet(path)
+    handle = registry.open(path)
+    assert registry.open(str(path)) == handle
+    assert registry.get(handle).height == 3
+    pl.DataFrame({"a": [1, 2, 3, 4]}).write_parquet(path)
+    os.utime(path, ns=(0, 1))
+    changed = registry.open(path)
+    assert changed != handle
+    assert registry.get(changed).height == 4
+    # the previous version is not kept registered
+    assert handle not in registry
+    assert registry.handles() == [changed]
+
+
+# Test: edge case (tab separated files)
+def test_tsv_files_are_split_at_tabs(registry, tmp_path):
+    path = tmp_path / "table.tsv"
+    path.write_text("a\tb\n1\tx\n")
+    assert registry.get(registry.open(path)).page(0, 1).rows() == [(1, "x")]
+
+
+# Test: failure case
+def test_unknown_handles_and_formats_fail(registry, tmp_path):
+    with pytest.raises(UnknownDatasetError):
+        registry.get("missing")
+    path = tmp_path / "table.xlsx"
+    path.write_bytes(b"")
+    with pytest.raises(UnsupportedTableFormatError):
+        registry.open(path)
+    with pytest.raises(FileNotFoundError):
+        registry.open(tmp_path / "missing.csv")
@@ -0,0 +1,174 @@
+import concurrent.futures
+import datetime
+import time
+
+import polars as pl
+import pytest
+
+from yaafc.tables import InvalidFilterError, TableSource, compile_filter
+from yaafc.tables.source import _spans
+
+
+@pytest.fixture
+def frame():
+    return pl.DataFrame({"id": [3, 1, 2, None], "name": ["c", "a", "b", "d"], "size": [30, 10, 20, 40]})
+
+
+# Test: expected use
+def test_page_slices_projects_and_sorts(frame):
+    source = TableSource(frame)
+    assert source.columns == ["id", "name", "size"]
+    assert source.height == 4
+    assert source.page(1, 2).rows() == [(1, "a", 10), (2, "b", 20)]
+    assert source.page(0, 2, columns=["name"]).columns == ["name"]
+    # sort columns need not be projected, nulls go last in both directions
+    assert source.page(0, 4, columns=["name"], sort=[("id", False)])["name"].to_list() == ["a", "b", "c", "d"]
+    assert source.page(0, 4, columns=["name"], sort=[("id", True)])["name"].to_list() == ["c", "b", "a", "d"]
+
+
+@pytest.mark.parametrize("kind", ["parquet", "csv"])
+def test_scans_read_files_on_demand(frame, tmp_path, kind):
+    path = tmp_path / f"table.{kind}"
+    getattr(frame, f"write_{kind}")(path)
+    source = getattr(TableSource, f"scan_{kind}")(path)
+    assert source.height == 4
+    assert source.page(2, 5, columns=["size", "name"]).rows() == [(20, "b"), (40, "d")]
+
+
+def test_views_are_filtered_sorted_and_cached(frame):
+    source = TableSource(frame, max_views=2)
+    filters = {"size": ">=20", "name": ""}
+    assert source.count(filters=filters) == 3
+    assert source.page(0, 5, ["name"], sort=[("size", True)], filters=filters)["name"].to_list() == ["d", "c", "b"]
+    view = source._view(((("size", True),), (("size", ">=20"),), (), ()))
+    # the same sort and filters reuse the evaluated view
+    source.page(1, 1, sort=[("size", True)], filters={"size": " >=20 "})
+    assert source._view(((("size", True),), (("size", ">=20"),), (), ())) is view
+    source.count(filters={"name": "a"})
+    source.count(filters={"name": "b"})
+    assert len(source._views) == 2
+
+
+def test_views_keep_row_numbers_not_columns(frame, tmp_path):
+    source = TableSource(frame)
+    view = source._view(((("size", True),), (("size", ">=20"),), (), ()))
+    assert isinstance(view, pl.Series)
+    assert view.to_list() == [3, 0, 2]
+    # pages of a file scan read only the rows they span
+    path = tmp_path / "table.parquet"
+    frame.write_parquet(path)
+    scanned = TableSource.scan_parquet(path)
+    assert scanned.page(1, 2, ["name"], filters={"size": ">=20"}).rows() == [("b",), ("d",)]
+    assert scanned.page(5, 2, ["name"], filters={"size": ">=20"}).height == 0
+
+
+def test_concurrent_requests_evaluate_a_view_once(frame, monkeypatch):
+    source = TableSource(frame)
+    evaluations = []
+    evaluate = source._evaluate
+
+    def slow_evaluate(key):
+        evaluations.append(key)
+        time.sleep(0.1)
+        return evaluate(key)
+
+    monkeypatch.setattr(source, "_evaluate", slow_evaluate)
+    with concurrent.futures.ThreadPoolExecutor(10) as executor:
+        counts = list(executor.map(lambda _: source.count(filters={"size": ">15"}), range(10)))
+    assert counts == [3] * 10
+    assert len(evaluations) == 1
+    assert source._evaluating == {}
+
+
+def test_views_are_grouped_and_summarized(frame):
+    source = TableSource(frame.with_columns(owner=pl.Series(["x", "y", "x", "x"])))
+    assert source.view_columns(["owner"]) == ["owner", "rows", "id (sum)", "size (sum)"]
+    assert source.page(0, 5, group_by=["owner"]).rows() == [("x", 3, 5, 90), ("y", 1, 1, 10)]
+    assert source.page(0, 1, ["owner"], sort=[("size (sum)", False)], group_by=["owner"]).rows() == [("y",)]
+    assert source.count(filters={"size": ">15"}, group_by=["owner"]) == 1
+    summary = source.summary()
+    assert summary["size"] == {"count": 4, "distinct": 4, "sum": 100, "min": 10, "max": 40}
+    # nulls are not counted, strings have no sum
+    assert summary["id"]["count"] == 3
+    assert summary["name"] == {"count": 4, "distinct": 4, "min": "a", "max": "d"}
+    assert source.summary(group_by=["owner"])["rows"]["sum"] == 4
+    # summaries are cached per view, whatever its order
+    assert source.summary(filters={"size": ">15"}) is source.summary(filters={"size": " >15"})
+
+
+def test_rows_match_typed_keys(frame):
+    moment = datetime.datetime(2024, 1, 1, 5)
+    source = TableSource(frame.with_columns(moment=pl.Series([moment, None, moment, None])))
+    assert source.page(0, 5, ["name"], matches={"moment": moment}).rows() == [("c",), ("b",)]
+    assert source.count(matches={"moment": None}) == 2
+    assert source.summary(matches={"moment": None, "id": None})["name"]["min"] == "d"
+    assert source.page(0, 5, group_by=["name"], matches={"moment": None}).rows() == [("a", 1, 1, 10), ("d", 1, 0, 40)]
+
+
+# Test: failure case (unknown group keys)
+def test_unknown_group_key(frame):
+    source = TableSource(frame)
+    with pytest.raises(pl.exceptions.ColumnNotFoundError):
+        source.page(0, 1, group_by=["owner"])
+    with pytest.raises(pl.exceptions.ColumnNotFoundError):
+        source.count(matches={"owner": "x"})
+    with pytest.raises(pl.exceptions.ColumnNotFoundError):
+        source.view_columns(["owner"])
+
+
+@pytest.mark.parametrize(
+    ("column", "text", "expected"),
+    [
+        ("name", "B", ["b"]),
+        ("name", "re:^[ab]$", ["a", "b"]),
+        ("name", "=c", ["c"]),
+        ("size", "20", [20]),
+        ("size", "15..30", [30, 20]),
+        ("size", "..10", [10]),
+        ("size", "!=10", [30, 20, 40]),
+        ("day", ">=2024-02", [datetime.date(2024, 3, 1)]),
+    ],
+)
+def test_compile_filter(frame, column, text, expected):
+    frame = frame.with_columns(day=pl.Series([datetime.date(2024, month, 1) for month in [1, 3, 1, 1]]))
+    expression = compile_filter(column, text, frame.schema[column])
+    assert frame.filter(expression)[column].to_list() == expected
+
+
+# Test: edge case (only the requested page is materialized)
+def test_page_of_a_huge_table_is_cheap():
+    source = TableSource(pl.LazyFrame().select(pl.int_range(0, 50_000_000).alias("row")))
+    started = time.perf_counter()
+    assert source.page(40_000_000, 3)["row"].to_list() == [40_000_000, 40_000_001, 40_000_002]
+    assert time.perf_counter() - started < 1.0
+
+
+def test_page_slices_far_apart_rows_separately(tmp_path):
+    path = tmp_path / "table.parquet"
+    ends = pl.int_range(0, 100_000).is_in([0, 1, 99_998, 99_999])
+    pl.select(pl.int_range(0, 100_000).alias("row")).with_columns(end=ends).write_parquet(path)
+    source = TableSource.scan_parquet(path)
+    page = source.page(0, 4, ["row"], sort=[("end", True), ("row", True)])
+    assert page["row"].to_list() == [99_999, 99_998, 1, 0]
+    assert _spans(pl.Series([0, 1, 99_998, 99_999])) == [(0, 2), (99_998, 2)]
+    # rows scattered all over the table are read in one slice
+    assert _spans(pl.Series(range(0, 1_000_000, 10_000))) == [(0, 990_001)]
+
+
+def test_page_beyond_the_end_is_empty(frame):
+    source = TableSource(frame)
+    assert source.page(10, 5).height == 0
+    assert source.page(-1, 1).rows() == [(3, "c", 30)]
+
+
+# Test: failure case
+def test_source_requires_a_polars_frame():
+    with pytest.raises(TypeError):
+        TableSource(None)
+
+
+@pytest.mark.parametrize("filters", [{"name": "re:("}, {"size": ">big"}, {"size": ".."}, {"missing": "x"}])
+def test_invalid_filters_are_rejected(frame, filters):
+    source = TableSource(frame)
+    with pytest.raises(InvalidFilterError):
+        source.validate(filters)
@@ -0,0 +1,88 @@
+import io
+import json
+from datetime import datetime
+
+import polars as pl
+import pytest
+from starlette.testclient import TestClient
+
+from yaafc.tables import ARROW_MEDIA_TYPE, TableSource, datasets, encode_page, page_path, table_api
+from yaafc.ui.table import TableComponent
+
+
+@pytest.fixture
+def client():
+    return TestClient(table_api)
+
+
+@pytest.fixture
+def source():
+    return TableSource(pl.LazyFrame({"id": list(range(1000)), "name": [f"file{i:04}" for i in range(1000)]}))
+
+
+# Test: expected use
+def test_page_round_trips_as_arrow(client, source):
+    handle = datasets.register(source)
+    response = client.get(page_path(handle, 10, 5, ["id", "name"], [("id", True)], {"name": "file0"}))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+    page = pl.read_ipc_stream(io.BytesIO(response.content))
+    assert page.columns == ["id", "name"]
+    assert page["id"].to_list() == [989, 988, 987, 986, 985]
+
+
+def test_grouped_page(client, source):
+    response = client.get(page_path(datasets.register(source), 0, 3, None, [("rows", True)], {"id": "<10"}, ["name"]))
+    page = pl.read_ipc_stream(io.BytesIO(response.content))
+    assert page.columns == ["name", "rows", "id (sum)"]
+    assert page.height == 3
+
+
+def test_matched_group_keys_keep_their_type(client):
+    moments = [datetime(2024, 1, 1, 5), None, datetime(2024, 1, 1, 5)]
+    handle = datasets.register(pl.DataFrame({"moment": moments, "size": [1, 2, 3]}))
+    response = client.get(page_path(handle, 0, 10, matches={"moment": datetime(2024, 1, 1, 5)}))
+    assert pl.read_ipc_stream(io.BytesIO(response.content))["size"].to_list() == [1, 3]
+    response = client.get(page_path(handle, 0, 10, matches={"moment": None}))
+    assert pl.read_ipc_stream(io.BytesIO(response.content))["size"].to_list() == [2]
+
+
+def test_arrow_page_is_smaller_than_json_rows():
+    frame = pl.DataFrame({f"c{column}": [row * 1.000001 + column for row in range(200)] for column in range(50)})
+    as_json = json.dumps(frame.rows()).encode()
+    assert len(encode_page(frame)) < len(as_json)
+
+
+def test_arrow_table_state_carries_only_the_url(source):
+    TableComponent.create(page_id="/test", slot_id=0, source=source, transport="arrow")
+    state = TableComponent.__subclasses__()[-1](_reflex_internal_init=True)
+    assert state.visible_rows == []
+    assert state.page_url.startswith("/api/tables/")
+    assert "offset=0" in state.page_url
+
+
+# Test: edge case (page beyond the end)
+def test_page_beyond_the_end_is_empty(client, source):
+    response = client.get(page_path(datasets.register(source), 5000, 20))
+    page = pl.read_ipc_stream(io.BytesIO(response.content))
+    assert page.height == 0
+    assert page.columns == ["id", "name"]
+
+
+# Test: failure case
+def test_unknown_handle_is_not_found(client):
+    assert client.get(page_path("unknown", 0, 10)).status_code == 404
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "offset=x&length=10",
+        "offset=0&length=10&view=not-json",
+        'offset=0&length=10&view={"filters":{"id":">abc"}}',
+        'offset=0&length=10&view={"columns":["missing"]}',
+        'offset=0&length=10&view={"matches":"bm90IGFycm93"}',
+    ],
+)
+def test_malformed_request_is_rejected(client, source, query):
+    assert client.get(f"/api/tables/{datasets.register(source)}?{query}").status_code == 400
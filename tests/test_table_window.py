@@ -0,0 +1,33 @@
+from yaafc.ui.table_window import ScrollPace, next_pace, window_bounds
+
+PACING = {"idle_after": 1.0, "lookahead_seconds": 0.5, "max_batch_size": 200}
+
+
+# Test: expected use
+def test_window_bounds_add_overscan_and_lookahead():
+    assert window_bounds(1000, 100, 20, 10, 0) == (90, 130)
+    assert window_bounds(1000, 100, 20, 10, 30) == (90, 160)
+    assert window_bounds(1000, 100, 20, 10, -30) == (60, 130)
+
+
+def test_fast_scrolling_speeds_up():
+    pace = ScrollPace(0.0, 0, 20)
+    for _ in range(5):
+        pace = next_pace(pace, 1, 0.05, 20, **PACING)
+    assert pace.velocity > 0
+    assert 0 < pace.lookahead_rows <= PACING["max_batch_size"]
+    assert pace.load_batch_size == min(20 + pace.lookahead_rows, PACING["max_batch_size"])
+
+
+# Test: edge case (the window is clamped to the table)
+def test_window_bounds_clamped_to_the_table():
+    assert window_bounds(1000, 995, 20, 10, 50) == (970, 1000)
+    assert window_bounds(5, 0, 20, 10, 0) == (0, 5)
+    assert window_bounds(0, 10, 20, 10, 0) == (0, 0)
+
+
+# Test: failure case (a pause or turning around starts over at rest)
+def test_pause_or_reversal_resets_the_pace():
+    fast = ScrollPace(400.0, 200, 200)
+    assert next_pace(fast, 1, 5.0, 20, **PACING) == ScrollPace(0.0, 0, 20)
+    assert next_pace(fast, -1, 0.05, 20, **PACING) == ScrollPace(0.0, 0, 20)
@@ -0,0 +1,140 @@
+import asyncio
+import shutil
+import sys
+
+import pytest
+
+from yaafc.filesystem.listing import DirectoryListing
+from yaafc.filesystem.scanner import DEFAULT_FIELDS, OWNER
+from yaafc.filesystem.watcher import DirectoryWatcher, DirectoryWatchers
+
+
+def next_delta(watcher, change, timeout=5.0):
+    async def run():
+        iterator = watcher.deltas()
+        pending = asyncio.ensure_future(iterator.__anext__())
+        await asyncio.sleep(0.05)
+        change()
+        try:
+            return await asyncio.wait_for(pending, timeout)
+        finally:
+            await iterator.aclose()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def watched_dir(tmp_path):
+    (tmp_path / "keep.txt").write_bytes(b"a")
+    (tmp_path / "change.txt").write_bytes(b"a")
+    (tmp_path / "remove.txt").write_bytes(b"a")
+    return tmp_path
+
+
+def churn(path):
+    def change():
+        (path / "new.txt").write_bytes(b"new")
+        (path / "change.txt").write_bytes(b"changed")
+        (path / "remove.txt").unlink()
+
+    return change
+
+
+# Test: expected use (polling fallback)
+def test_polling_watcher_reports_delta(watched_dir):
+    watcher = DirectoryWatcher(DirectoryListing.scan(watched_dir), poll_interval=0.1, use_inotify=False)
+    assert not watcher.uses_inotify
+    delta = next_delta(watcher, churn(watched_dir))
+    assert delta.added["name"].to_list() == ["new.txt"]
+    assert delta.changed["name"].to_list() == ["change.txt"]
+    assert delta.removed == ["remove.txt"]
+    assert watcher.listing.frame["name"].to_list() == ["change.txt", "keep.txt", "new.txt"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_inotify_watcher_reports_delta(watched_dir):
+    watcher = DirectoryWatcher(DirectoryListing.scan(watched_dir), coalesce_interval=0.1)
+    assert watcher.uses_inotify
+    try:
+        delta = next_delta(watcher, churn(watched_dir))
+    finally:
+        watcher.close()
+    assert delta.summary() == {"added": 1, "changed": 1, "removed": 1}
+    assert delta.removed == ["remove.txt"]
+
+
+def test_panels_share_one_watcher(watched_dir):
+    watchers = DirectoryWatchers(poll_interval=0.05, use_inotify=False)
+
+    async def run():
+        listing = DirectoryListing.scan(watched_dir)
+        async with watchers.subscribe(listing) as first, watchers.subscribe(listing) as second:
+            assert len(watchers) == 1
+            churn(watched_dir)()
+            updates = [await anext(aiter(subscription.updates())) for subscription in (first, second)]
+        assert len(watchers) == 0
+        return updates
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert first.frame["name"].to_list() == ["change.txt", "keep.txt", "new.txt"]
+
+
+# Test: edge case (only touched entries are re-stat'ed)
+def test_delta_for_ignores_unchanged_entries(watched_dir):
+    watcher = DirectoryWatcher(DirectoryListing.scan(watched_dir), use_inotify=False)
+    assert not watcher.delta_for({"keep.txt"})
+    assert not watcher.delta_for({"never-existed.txt"})
+
+
+# Test: failure case (vanished directory yields no delta)
+def test_rescan_missing_directory(watched_dir):
+    watcher = DirectoryWatcher(DirectoryListing.scan(watched_dir), use_inotify=False)
+    for entry in watched_dir.iterdir():
+        entry.unlink()
+    watched_dir.rmdir()
+    assert not watcher.rescan()
+
+
+def test_unreadable_field_upgrade_leaves_watcher_alone(watched_dir):
+    watchers = DirectoryWatchers(poll_interval=0.05, use_inotify=False)
+
+    async def run():
+        listing = DirectoryListing.scan(watched_dir)
+        wider = DirectoryListing.scan(watched_dir, DEFAULT_FIELDS | {OWNER})
+        async with watchers.subscribe(listing):
+            shutil.rmtree(watched_dir)
+            async with watchers.subscribe(wider) as subscription:
+                assert len(watchers) == 1
+                assert subscription.listing is wider
+                return [update async for update in subscription.updates()]
+
+    assert asyncio.run(run()) == []
+
+
+@pytest.mark.parametrize(
+    "use_inotify",
+    [
+        False,
+        pytest.param(
+            True, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+        ),
+    ],
+)
+def test_watcher_stops_when_directory_is_deleted(watched_dir, use_inotify):
+    watcher = DirectoryWatcher(
+        DirectoryListing.scan(watched_dir), coalesce_interval=0.05, poll_interval=0.05, use_inotify=use_inotify
+    )
+
+    async def run():
+        async def consume():
+            return [delta async for delta in watcher.deltas(heartbeat=0.05)]
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.1)
+        shutil.rmtree(watched_dir)
+        return await asyncio.wait_for(consumer, 5.0)
+
+    asyncio.run(run())
+    assert watcher.gone
+    assert not watcher.uses_inotify
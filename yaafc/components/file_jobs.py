@@ -0,0 +1,157 @@
+import asyncio
+import contextlib
+from typing import ClassVar
+
+import reflex as rx
+from reflex.event import EventSpec
+from reflex.vars.object import ObjectVar
+
+from yaafc.components.file_list import _client_connected
+from yaafc.filesystem.jobs import FINISHED_STATES, JobError, JobKind, JobProgress, job_engine
+from yaafc.utilities.humanbytes import HumanBytes
+
+
+class FileJobsState(rx.State):
+    # one row per job started or resumed in this session, in start order
+    jobs: list[dict[str, str | int]] = []
+    job_error: str = ""
+
+    # seconds between two progress updates of a running job, however many files it finishes meanwhile
+    progress_interval: ClassVar[float] = 0.5
+
+    @rx.event
+    async def start_job(self, kind: JobKind, sources: list[str], destination: str = "") -> EventSpec | None:
+        try:
+            job = await asyncio.to_thread(job_engine.submit, kind, sources, destination)
+        except JobError as error:
+            self.job_error = str(error)
+            return None
+        self.job_error = ""
+        self._show(job.progress())
+        return FileJobsState.watch_job(job.job_id)
+
+    @rx.event
+    async def resume_jobs(self) -> list[EventSpec]:
+        # the engine is shared by all clients: adopt only the interrupted jobs restarted now and this session's own
+        resumed = await asyncio.to_thread(job_engine.resume)
+        own = [job_engine.jobs.get(str(row["job_id"])) for row in self.jobs]
+        unfinished = {job.job_id: job for job in [*resumed, *own] if job is not None and not job.finished.is_set()}
+        for job in unfinished.values():
+            self._show(job.progress())
+        return [FileJobsState.watch_job(job_id) for job_id in unfinished]
+
+    @rx.event
+    async def resume_job(self, job_id: str) -> EventSpec | None:
+        try:
+            job = (await asyncio.to_thread(job_engine.resume, job_id))[0]
+        except KeyError:
+            self.job_error = _unknown_job(job_id)
+            return None
+        except JobError as error:
+            self.job_error = str(error)
+            return None
+        self.job_error = ""
+        self._show(job.progress())
+        return FileJobsState.watch_job(job.job_id)
+
+    @rx.event
+    def pause_job(self, job_id: str) -> None:
+        try:
+            job_engine.pause(job_id)
+        except KeyError:
+            self.job_error = _unknown_job(job_id)
+
+    @rx.event
+    def cancel_job(self, job_id: str) -> None:
+        try:
+            job_engine.cancel(job_id)
+        except KeyError:
+            self.job_error = _unknown_job(job_id)
+
+    @rx.event
+    def dismiss_job(self, job_id: str) -> None:
+        self.jobs = [row for row in self.jobs if row["job_id"] != job_id]
+
+    @rx.event(background=True)
+    async def watch_job(self, job_id: str) -> None:
+        async with self:
+            token = self.router.session.client_token
+        # one state update per snapshot, the engine takes them at the pace of progress_interval
+        async with contextlib.aclosing(job_engine.watch(job_id, self.progress_interval)) as snapshots:
+            async for progress in snapshots:
+                # Reflex does not cancel background tasks when their client disconnects
+                if not _client_connected(token):
+                    return
+                async with self:
+                    self._show(progress)
+
+    def _show(self, progress: JobProgress) -> None:
+        row = _job_row(progress)
+        if any(other["job_id"] == progress.job_id for other in self.jobs):
+            self.jobs = [row if other["job_id"] == progress.job_id else other for other in self.jobs]
+        else:
+            self.jobs = [*self.jobs, row]
+
+
+def _unknown_job(job_id: str) -> str:
+    # e.g. a row left over from before the server restarted
+    return f"job {job_id} is no longer known"
+
+
+def _job_row(progress: JobProgress) -> dict[str, str | int]:
+    return {
+        "job_id": progress.job_id,
+        "title": f"{progress.kind} {progress.done_files}/{progress.total_files}",
+        "state": progress.state,
+        "finished": int(progress.state in FINISHED_STATES),
+        "percent": round(progress.fraction * 100),
+        "bytes": f"{HumanBytes.format(progress.done_bytes)} of {HumanBytes.format(progress.total_bytes)}",
+        "current": progress.current,
+        "errors": "\n".join(progress.errors),
+    }
+
+
+def show_job(row: ObjectVar[dict[str, str | int]]) -> rx.Component:
+    job_id = row["job_id"].to(str)
+    return rx.vstack(
+        rx.hstack(
+            rx.text(row["title"], weight="bold"),
+            rx.text(row["state"]),
+            rx.text(row["bytes"]),
+            rx.spacer(),
+            rx.cond(
+                row["finished"].to(int) == 1,
+                rx.icon_button(rx.icon(tag="x", size=16), on_click=FileJobsState.dismiss_job(job_id), size="1"),
+                rx.hstack(
+                    rx.cond(
+                        row["state"].to(str) == "paused",
+                        rx.icon_button(
+                            rx.icon(tag="play", size=16), on_click=FileJobsState.resume_job(job_id), size="1"
+                        ),
+                        None,
+                    ),
+                    rx.icon_button(rx.icon(tag="pause", size=16), on_click=FileJobsState.pause_job(job_id), size="1"),
+                    rx.icon_button(rx.icon(tag="square", size=16), on_click=FileJobsState.cancel_job(job_id), size="1"),
+                    spacing="1",
+                ),
+            ),
+            width="100%",
+            align="center",
+        ),
+        rx.progress(value=row["percent"].to(int), width="100%"),
+        rx.text(row["current"], size="1", color=rx.color("gray", 11), trim="both"),
+        rx.cond(row["errors"].to(str) != "", rx.text(row["errors"], size="1", color=rx.color("red", 11)), None),
+        width="100%",
+        spacing="1",
+    )
+
+
+def file_jobs() -> rx.Component:
+    return rx.vstack(
+        rx.cond(FileJobsState.job_error != "", rx.text(FileJobsState.job_error, color=rx.color("red", 11)), None),
+        rx.foreach(FileJobsState.jobs, show_job),
+        on_mount=FileJobsState.resume_jobs,
+        width="100%",
+        padding="0.5em",
+        spacing="2",
+    )
@@ -1,14 +1,59 @@
-from datetime import datetime, timezone
-from pathlib import Path
+import asyncio
+import contextlib
+import dataclasses
+import os
+import re
+from collections.abc import AsyncIterator
 from typing import ClassVar, Union
 
+import polars as pl
 import reflex as rx
-
-from yaafc.utilities.humanbytes import HumanBytes
+from reflex.event import EventChain
+from reflex.utils import prerequisites
+from reflex_intersection_observer import intersection_observer
+
+from yaafc.events.rate_limit import RATE_LIMIT_JS, RateLimit
+from yaafc.filesystem.cache import listing_cache
+from yaafc.filesystem.columns import COLUMN_PROVIDERS, required_fields
+from yaafc.filesystem.dirsize import TreeSize, directory_sizes
+from yaafc.filesystem.grep import ContentMatch, content_searcher
+from yaafc.filesystem.listing import DirectoryListing, ListingDelta
+from yaafc.filesystem.query import InvalidFilterError, ListingQuery, SortKey, parse_filter
+from yaafc.filesystem.scanner import ScanResult, stat_entries
+from yaafc.filesystem.search import filename_index
+from yaafc.filesystem.watcher import directory_watchers
+
+# search text prefix switching from name search to content search, e.g. "grep:TODO" or "grep:re:^def "
+CONTENT_SEARCH_PREFIX = "grep:"
+# title of the column showing the matching lines of a content search
+MATCH_COLUMN = "Match"
 
 
 class FileListState(rx.State):
     current_directory: str = "/"
+    window_offset: int = 0
+    # titles of the shown columns, in display order
+    column_titles: list[str] = ["Name", "Size", "Changed"]
+    sort_column: str = "Name"
+    sort_descending: bool = False
+    show_filter: bool = False
+    filter_text: str = ""
+    filter_error: str = ""
+    calculate_sizes: bool = False
+    show_search: bool = False
+    search_text: str = ""
+    search_error: str = ""
+    searching: bool = False
+
+    # rows rendered around the visible window and estimated row height used to size the scroll spacers
+    window_size: ClassVar[int] = 100
+    overscan: ClassVar[int] = 50
+    row_height_em: ClassVar[float] = 2.0
+    # seconds after which an idle watcher checks whether the panel moved to another directory
+    watch_heartbeat: ClassVar[float] = 1.0
+    # seconds of typing pause before a search starts and maximum number of search results shown
+    search_debounce: ClassVar[float] = 0.3
+    search_limit: ClassVar[int] = 10_000
 
     visible_columns: ClassVar[list[dict[str : str | int]]] = [
         {
@@ -44,52 +89,325 @@ class FileListState(rx.State):
             "type": "str",
             "width": 300,
         },
+        {
+            "title": "Type",
+            "type": "str",
+            "width": 300,
+        },
+        {
+            "title": "Attributes",
+            "type": "str",
+            "width": 300,
+        },
     ]
 
+    _listing: DirectoryListing | None = None
+    _watch_generation: int = 0
+    # sorted and filtered listing, recomputed only if the listing or the query changed
+    _query: ListingQuery = ListingQuery()
+    _view: DirectoryListing | None = None
+    _view_source: DirectoryListing | None = None
+    _view_query: ListingQuery | None = None
+    _view_tree_sizes_version: int = -1
+    # recursive directory sizes of _tree_sizes_path keyed by entry name, streamed in by calculate_directory_sizes
+    _tree_sizes: dict[str, TreeSize] = {}
+    _tree_sizes_path: str = ""
+    _tree_sizes_version: int = 0
+    _sizes_generation: int = 0
+    # entries below current_directory matching search_text, shown instead of the directory while searching
+    _search_listing: DirectoryListing | None = None
+    # matching lines of a content search by path relative to current_directory, in file order
+    _search_matches: dict[str, list[ContentMatch]] = {}
+    _search_generation: int = 0
+
     @rx.var
     def data(self) -> list[list[str | int]]:
-        new_data = []
-        entries = sorted(Path(self.current_directory).glob("*"))
-        directories = [entry for entry in entries if entry.is_dir()]
-        files = [entry for entry in entries if not entry.is_dir()]
-        for item in directories:
-            new_entry = self._add_directory_entry(item)
-            new_data.append(new_entry)
-        for item in files:
-            new_entry = self._add_directory_entry(item)
-            new_data.append(new_entry)
-        return new_data
+        listing = self._current_view()
+        if listing is None:
+            return []
+        start, stop = self._window_bounds(len(listing))
+        rows = listing.format_rows(self.column_titles, start, stop - start)
+        if not self._search_matches:
+            return rows
+        names = listing.frame["name"].slice(start, stop - start)
+        return [[*row, _format_matches(self._search_matches.get(name, []))] for row, name in zip(rows, names)]
 
-    # def _clear_directory_entries(self ) -> None:
-    #     self.data = []
+    @rx.var
+    def shown_titles(self) -> list[str]:
+        return [*self.column_titles, MATCH_COLUMN] if self._search_matches else self.column_titles
 
-    def _add_directory_entry(self, entry: Path) -> list[str | int]:
-        new_entry = []
-        for column in self.visible_columns:
-            if column["title"] == "Name":
-                if entry.is_dir():
-                    new_entry.append("/" + entry.name)
-                else:
-                    new_entry.append(entry.name)
-
-            elif column["title"] == "Size":
-                if entry.exists():
-                    if entry.is_dir():
-                        new_entry.append("> SUB-DIR <")
-                    else:
-                        size = HumanBytes.format(entry.stat().st_size)
-                        new_entry.append(str(size))
-                else:
-                    new_entry.append("--")
+    @rx.var
+    def total_rows(self) -> int:
+        listing = self._current_view()
+        return 0 if listing is None else len(listing)
+
+    @rx.var
+    def column_count(self) -> int:
+        return len(self.shown_titles)
+
+    @rx.var
+    def has_previous_rows(self) -> bool:
+        return self._window_bounds(self.total_rows)[0] > 0
 
-            elif column["title"] == "Changed":
-                if entry.exists():
-                    modified = datetime.fromtimestamp(entry.stat().st_mtime, tz=timezone.utc)
-                    new_entry.append(str(modified))
+    @rx.var
+    def has_next_rows(self) -> bool:
+        return self._window_bounds(self.total_rows)[1] < self.total_rows
+
+    @rx.var
+    def top_spacer_height(self) -> str:
+        start, _ = self._window_bounds(self.total_rows)
+        return f"{start * self.row_height_em}em"
+
+    @rx.var
+    def bottom_spacer_height(self) -> str:
+        _, stop = self._window_bounds(self.total_rows)
+        return f"{(self.total_rows - stop) * self.row_height_em}em"
+
+    @rx.event
+    def set_current_directory(self, directory: str) -> None:
+        self.current_directory = directory
+        self.window_offset = 0
+
+    @rx.event
+    def scroll_to(self, position_em: float) -> None:
+        # the scroll position gives the first visible row, however far the scrollbar was dragged
+        self.window_offset = max(int(position_em / self.row_height_em), 0)
+        self._clamp_window_offset()
+
+    @rx.event
+    def show_next_rows(self) -> None:
+        if self.has_next_rows:
+            self.window_offset = min(self.window_offset + self.window_size, max(self.total_rows - self.window_size, 0))
+
+    @rx.event
+    def show_previous_rows(self) -> None:
+        self.window_offset = max(self.window_offset - self.window_size, 0)
+
+    @rx.event
+    def toggle_column(self, title: str) -> None:
+        if title in self.column_titles:
+            if len(self.column_titles) > 1:
+                self.column_titles = [shown for shown in self.column_titles if shown != title]
+            return
+        shown = {*self.column_titles, title}
+        self.column_titles = [
+            column["title"] for column in self.visible_columns + self.hidden_columns if column["title"] in shown
+        ]
+
+    @rx.event
+    def sort_by(self, title: str) -> None:
+        provider = COLUMN_PROVIDERS.get(title)
+        if provider is None or provider.sort_key is None:
+            return
+        # clicking the sorted column again reverses the order
+        self.sort_descending = title == self.sort_column and not self.sort_descending
+        self.sort_column = title
+        self._query = dataclasses.replace(self._query, sort=(SortKey(provider.sort_key, self.sort_descending),))
+        self.window_offset = 0
+
+    @rx.event
+    def toggle_filter(self) -> None:
+        self.show_filter = not self.show_filter
+        if not self.show_filter:
+            self.set_filter_text("")
+
+    @rx.event
+    def set_filter_text(self, text: str) -> None:
+        self.filter_text = text
+        try:
+            query = dataclasses.replace(self._query, filters=parse_filter(text))
+            query.validate()
+        except InvalidFilterError as error:
+            # keep showing the last valid result while the filter is being typed
+            self.filter_error = str(error)
+            return
+        self.filter_error = ""
+        self._query = query
+        self.window_offset = 0
+
+    @rx.event
+    def toggle_directory_sizes(self):
+        self.calculate_sizes = not self.calculate_sizes
+        if self.calculate_sizes:
+            return FileListState.calculate_directory_sizes
+        self._tree_sizes = {}
+        self._tree_sizes_path = ""
+        self._tree_sizes_version += 1
+
+    @rx.event(background=True)
+    async def calculate_directory_sizes(self):
+        async with self:
+            self._sizes_generation += 1
+            generation = self._sizes_generation
+            token = self.router.session.client_token
+        while _client_connected(token):
+            async with self:
+                if generation != self._sizes_generation or not self.calculate_sizes:
+                    return
+                listing = self._current_listing()
+                directory = self.current_directory
+                measured = self._tree_sizes_path == directory
+                if listing is not None and not measured:
+                    self._tree_sizes = {}
+                    self._tree_sizes_path = directory
+                    self._tree_sizes_version += 1
+            if listing is None or measured:
+                # wait for the panel to move to another directory
+                await asyncio.sleep(self.watch_heartbeat)
+                continue
+            paths = [os.path.join(listing.path, name) for name in listing.frame.filter(pl.col("is_dir"))["name"]]
+            async with contextlib.aclosing(directory_sizes.sizes(paths)) as updates:
+                async for update in updates:
+                    if not _client_connected(token):
+                        return
+                    async with self:
+                        if generation != self._sizes_generation or not self.calculate_sizes:
+                            return
+                        if self.current_directory != directory:
+                            # leaving the aclosing block cancels the walkers still running
+                            break
+                        if update:
+                            sizes = {os.path.basename(path): size for path, size in update.items()}
+                            self._tree_sizes = {**self._tree_sizes, **sizes}
+                            self._tree_sizes_version += 1
+
+    @rx.event
+    def toggle_search(self):
+        self.show_search = not self.show_search
+        if not self.show_search:
+            return self.set_search_text("")
+
+    @rx.event
+    def set_search_text(self, text: str):
+        self.search_text = text
+        return FileListState.search_files
+
+    @rx.event(background=True)
+    async def search_files(self):
+        async with self:
+            self._search_generation += 1
+            generation = self._search_generation
+            pattern = self.search_text.strip()
+            directory = self.current_directory
+            fields = required_fields(self.column_titles)
+            self._search_listing = None
+            self._search_matches = {}
+            self.searching = bool(pattern)
+            self.search_error = ""
+            self.window_offset = 0
+        if not pattern:
+            return
+        # every keystroke starts a new search, only the one after the last keystroke runs
+        await asyncio.sleep(self.search_debounce)
+        async with self:
+            if generation != self._search_generation:
+                return
+            self._search_listing = DirectoryListing.from_scan(ScanResult(path=directory, fields=fields))
+        loop = asyncio.get_running_loop()
+        found = 0
+        error = ""
+        try:
+            async with contextlib.aclosing(_search_paths(pattern, directory)) as batches:
+                async for batch, matches in batches:
+                    scan, _ = await loop.run_in_executor(None, stat_entries, directory, batch, fields)
+                    async with self:
+                        if generation != self._search_generation:
+                            return
+                        if self.current_directory != directory:
+                            self._search_listing = None
+                            self._search_matches = {}
+                            break
+                        self._search_listing = self._search_listing.apply(
+                            ListingDelta(added=DirectoryListing.from_scan(scan).frame)
+                        )
+                        if matches:
+                            self._search_matches = _merge_matches(self._search_matches, matches)
+                    found += len(batch)
+                    if found >= self.search_limit:
+                        break
+        except (OSError, re.error) as failed:
+            error = _search_failure(failed)
+        async with self:
+            if generation == self._search_generation:
+                self.searching = False
+                # the entries found before the search failed stay listed
+                self.search_error = error
+
+    @rx.event(background=True)
+    async def watch_directory(self):
+        async with self:
+            self._watch_generation += 1
+            generation = self._watch_generation
+            token = self.router.session.client_token
+        # Reflex does not cancel background tasks when their client disconnects
+        while _client_connected(token):
+            async with self:
+                if generation != self._watch_generation:
+                    return
+                listing = self._current_listing()
+                fields = required_fields(self.column_titles)
+            if listing is None:
+                await asyncio.sleep(self.watch_heartbeat)
+                continue
+            async with directory_watchers.subscribe(listing) as subscription:
+                async for update in subscription.updates(heartbeat=self.watch_heartbeat):
+                    if not _client_connected(token):
+                        return
+                    async with self:
+                        if generation != self._watch_generation:
+                            return
+                        if self._listing is None or self._listing.path != listing.path:
+                            # the panel switched directories, restart with a watcher on the new one
+                            break
+                        if required_fields(self.column_titles) != fields:
+                            # columns were switched on, keep watching the rescanned listing
+                            break
+                        if update is not None:
+                            self._listing = update
+                            listing_cache.put(update)
+                            self._clamp_window_offset()
                 else:
-                    new_entry.append("--")
+                    # the directory is gone, wait for the panel to move elsewhere
+                    await asyncio.sleep(self.watch_heartbeat)
 
-        return new_entry
+    # def _clear_directory_entries(self ) -> None:
+    #     self.data = []
+
+    def _current_listing(self) -> DirectoryListing | None:
+        fields = required_fields(self.column_titles)
+        moved = self._listing is None or self._listing.path != self.current_directory
+        if moved or not fields <= self._listing.fields:
+            try:
+                self._listing = listing_cache.get(self.current_directory, fields)
+            except OSError:
+                return None
+        return self._listing
+
+    def _current_view(self) -> DirectoryListing | None:
+        listing = self._search_listing if self._search_listing is not None else self._current_listing()
+        if listing is None:
+            return None
+        if (
+            self._view is None
+            or self._view_source is not listing
+            or self._view_query != self._query
+            or self._view_tree_sizes_version != self._tree_sizes_version
+        ):
+            sizes = self._tree_sizes if self._tree_sizes_path == listing.path else {}
+            self._view = self._query.apply(listing.with_tree_sizes(sizes))
+            self._view_source = listing
+            self._view_query = self._query
+            self._view_tree_sizes_version = self._tree_sizes_version
+        return self._view
+
+    def _clamp_window_offset(self) -> None:
+        # keeps the window on the listing after it shrank
+        self.window_offset = min(self.window_offset, max(self.total_rows - self.window_size, 0))
+
+    def _window_bounds(self, total: int) -> tuple[int, int]:
+        # visible window plus the overscan buffer on both sides, clamped to the listing
+        offset = min(self.window_offset, max(total - self.window_size, 0))
+        return max(offset - self.overscan, 0), min(offset + self.window_size + self.overscan, total)
 
     # @rx.event
     # def load_entries(self) -> None:
@@ -106,6 +424,52 @@ class FileListState(rx.State):
         self.clicked_data = f"Cell clicked: {pos}"
 
 
+def _client_connected(token: str) -> bool:
+    # Reflex forgets the token of a client when its websocket disconnects
+    namespace = prerequisites.get_and_validate_app().app.event_namespace
+    return namespace is None or token in namespace.token_to_sid
+
+
+async def _search_paths(pattern: str, directory: str) -> AsyncIterator[tuple[list[str], list[ContentMatch]]]:
+    # batches of paths below directory whose name, or with CONTENT_SEARCH_PREFIX whose content, matches, together
+    # with the matching lines of a content search
+    loop = asyncio.get_running_loop()
+    if pattern.startswith(CONTENT_SEARCH_PREFIX):
+        text = pattern.removeprefix(CONTENT_SEARCH_PREFIX)
+        regex = text.startswith("re:")
+        matches = content_searcher.search(text.removeprefix("re:") if regex else text, directory, regex=regex)
+        async with contextlib.aclosing(matches) as batches:
+            async for batch in batches:
+                yield list(dict.fromkeys(match.path for match in batch)), batch
+        return
+    await loop.run_in_executor(None, filename_index.ensure, directory)
+    async with contextlib.aclosing(filename_index.stream(pattern, directory)) as batches:
+        async for batch in batches:
+            yield batch, []
+
+
+def _search_failure(error: OSError | re.error) -> str:
+    if isinstance(error, re.error):
+        return f"invalid pattern: {error}"
+    return str(error.strerror or error)
+
+
+def _merge_matches(known: dict[str, list[ContentMatch]], matches: list[ContentMatch]) -> dict[str, list[ContentMatch]]:
+    merged = dict(known)
+    for match in matches:
+        merged[match.path] = [*merged.get(match.path, []), match]
+    return merged
+
+
+def _format_matches(matches: list[ContentMatch]) -> str:
+    # the first matching line of a file with its number, and how many more there are
+    if not matches:
+        return ""
+    first = min(matches, key=lambda match: match.line_number)
+    more = f" (+{len(matches) - 1} more)" if len(matches) > 1 else ""
+    return f"{first.line_number}: {first.snippet}{more}"
+
+
 def show_directory_table_entry(entry: list[str | int]) -> rx.Component:
     def show_cell(content: str, min_width: Union[str, list[str]], max_width: Union[str, list[str]]) -> rx.Component:
         return (
@@ -117,7 +481,7 @@ def show_directory_table_entry(entry: list[str | int]) -> rx.Component:
                 border_bottom="solid",
                 border_bottom_color=rx.color("accent", 4),
                 border_bottom_width="1px",
-                height="1em",
+                height=f"{FileListState.row_height_em}em",
                 padding="5px",
                 padding_left="10px",
                 min_width=min_width,
@@ -125,20 +489,36 @@ def show_directory_table_entry(entry: list[str | int]) -> rx.Component:
             ),
         )
 
+    # the first column holds the name and gets the most room
     return rx.table.row(
-        show_cell(entry[0], "8em", "64em"),
-        show_cell(entry[1], "4em", "12em"),
-        show_cell(entry[2], "4em", "12em"),
-        show_cell("ooo", "4em", "12em"),
-        # arrow.get(entry[2]).format('YYYY-MM-DD'),
-        # arrow.get(entry[2]).format('HH:mm:ss ZZ'),
+        rx.foreach(
+            entry,
+            lambda content, index: show_cell(
+                content, rx.cond(index == 0, "8em", "4em"), rx.cond(index == 0, "64em", "12em")
+            ),
+        ),
     )
 
 
 def show_directory_table_header() -> rx.Component:
     def show_header_cell(content: str) -> rx.Component:
         return rx.table.column_header_cell(
-            content,
+            rx.hstack(
+                rx.text(content),
+                rx.cond(
+                    FileListState.sort_column == content,
+                    rx.cond(
+                        FileListState.sort_descending,
+                        rx.icon(tag="arrow-down", size=14),
+                        rx.icon(tag="arrow-up", size=14),
+                    ),
+                    None,
+                ),
+                align="center",
+                spacing="1",
+            ),
+            on_click=FileListState.sort_by(content),
+            cursor="pointer",
             border_right="solid",
             border_right_color=rx.color("accent", 4),
             border_right_width="1px",
@@ -151,24 +531,108 @@ def show_directory_table_header() -> rx.Component:
 
     return rx.table.header(
         rx.table.row(
-            show_header_cell("Name"),
-            show_header_cell("Size"),
-            show_header_cell("Changed Date"),
-            show_header_cell("Change Time"),
+            rx.foreach(FileListState.shown_titles, show_header_cell),
+        ),
+    )
+
+
+def show_directory_table_spacer(height: rx.Var[str]) -> rx.Component:
+    return rx.table.row(
+        rx.table.cell(col_span=FileListState.column_count, padding="0", border="none"),
+        height=height,
+    )
+
+
+def show_directory_table_observer(on_intersect: rx.EventHandler, has_rows: rx.Var[bool]) -> rx.Component:
+    return rx.cond(
+        has_rows,
+        rx.table.row(
+            rx.table.cell(
+                intersection_observer(
+                    on_intersect=on_intersect,
+                    style={"height": "1px"},
+                ),
+                col_span=FileListState.column_count,
+                padding="0",
+                border="none",
+            ),
         ),
+        None,
     )
 
 
+def scroll_position_spec(ev: rx.Var) -> tuple[rx.Var[float]]:
+    # scroll offset of the scrolled element in em, the unit the row heights are given in
+    target = f"{ev}.target"
+    return (rx.Var(f"({target}.scrollTop / parseFloat(getComputedStyle({target}).fontSize))").to(float),)
+
+
+class DirectoryTableScroller(rx.el.Div):
+    """The scrolling container of the directory table, reporting its scroll position."""
+
+    on_scroll: rx.EventHandler[scroll_position_spec]
+
+    # at most one scroll position per interval, the last one of a drag included
+    scroll_rate_limit: ClassVar[RateLimit] = RateLimit("throttle", 100)
+
+    @classmethod
+    def create(cls, *children, **props) -> "DirectoryTableScroller":
+        component = super().create(*children, **props)
+        chain = component.event_triggers.get("on_scroll")
+        if isinstance(chain, EventChain):
+            component.event_triggers["on_scroll"] = cls.scroll_rate_limit.bind(chain, "on_scroll")
+        return component
+
+    def add_custom_code(self) -> list[str]:
+        return [RATE_LIMIT_JS]
+
+
 def show_directory_table():
     return rx.table.root(
         show_directory_table_header(),
         rx.table.body(
+            show_directory_table_spacer(FileListState.top_spacer_height),
+            show_directory_table_observer(FileListState.show_previous_rows, FileListState.has_previous_rows),
             rx.foreach(FileListState.data, show_directory_table_entry),
-            # style={"max-height": "100px", "overflow-y": "auto"},
+            show_directory_table_observer(FileListState.show_next_rows, FileListState.has_next_rows),
+            show_directory_table_spacer(FileListState.bottom_spacer_height),
         ),
         width="100%",
         height="100%",
         style={"position": "relative"},
+        on_mount=FileListState.watch_directory,
+    )
+
+
+def show_column_menu() -> rx.Component:
+    def show_column_item(title: str) -> rx.Component:
+        return rx.menu.item(
+            rx.hstack(
+                rx.cond(
+                    FileListState.column_titles.contains(title),
+                    rx.icon(tag="check", size=16),
+                    rx.box(width="16px"),
+                ),
+                rx.text(title),
+            ),
+            on_click=FileListState.toggle_column(title),
+        )
+
+    return rx.menu.root(
+        rx.menu.trigger(
+            rx.button(
+                rx.icon(tag="settings", size=20),
+                border="solid",
+                border_width="1px",
+                border_color=rx.color("accent", 8),
+            ),
+        ),
+        rx.menu.content(
+            *[
+                show_column_item(column["title"])
+                for column in FileListState.visible_columns + FileListState.hidden_columns
+            ],
+        ),
     )
 
 
@@ -189,24 +653,56 @@ def show_file_list_header() -> rx.Component:
             ),
             on_submit=lambda form_data: rx.window_alert(form_data.to_string()),
         ),
+        rx.cond(
+            FileListState.show_search,
+            rx.input(
+                placeholder="Search below this directory: name, *.glob or grep:text",
+                value=FileListState.search_text,
+                on_change=FileListState.set_search_text,
+                title=FileListState.search_error,
+                color_scheme=rx.cond(FileListState.search_error == "", "gray", "red"),
+                width="100%",
+            ),
+            None,
+        ),
         rx.button(
-            rx.icon(tag="search", size=20),
+            rx.cond(FileListState.searching, rx.spinner(size="2"), rx.icon(tag="search", size=20)),
+            on_click=FileListState.toggle_search,
+            variant=rx.cond(FileListState.show_search, "solid", "surface"),
             border="solid",
             border_width="1px",
             border_color=rx.color("accent", 8),
         ),
+        rx.cond(
+            FileListState.show_filter,
+            rx.input(
+                placeholder="Filter: *.py re:^a size:>1M date:>2024-01-01",
+                value=FileListState.filter_text,
+                on_change=FileListState.set_filter_text,
+                title=FileListState.filter_error,
+                color_scheme=rx.cond(FileListState.filter_error == "", "gray", "red"),
+                width="100%",
+            ),
+            None,
+        ),
         rx.button(
             rx.icon(tag="filter", size=20),
+            on_click=FileListState.toggle_filter,
+            variant=rx.cond(FileListState.show_filter, "solid", "surface"),
             border="solid",
             border_width="1px",
             border_color=rx.color("accent", 8),
         ),
         rx.button(
-            rx.icon(tag="settings", size=20),
+            rx.icon(tag="hard-drive", size=20),
+            on_click=FileListState.toggle_directory_sizes,
+            variant=rx.cond(FileListState.calculate_sizes, "solid", "surface"),
+            title="Calculate directory sizes",
             border="solid",
             border_width="1px",
             border_color=rx.color("accent", 8),
         ),
+        show_column_menu(),
         width="100%",
         border="solid",
         border_width="1px",
@@ -224,9 +720,10 @@ def file_list() -> rx.Component:
             rx.box(
                 show_file_list_header(),
             ),
-            rx.box(
+            DirectoryTableScroller.create(
                 show_directory_table(),
-                style={"height": "calc(100% - 2.6em)"},
+                on_scroll=FileListState.scroll_to,
+                style={"height": "calc(100% - 2.6em)", "overflowY": "auto"},
             ),
             direction="column",
             border="solid",
@@ -3,110 +3,346 @@ Event dataclasses and spec functions for all major DOM event types, following MD
 
 This module provides Python representations of the corresponding DOM events and their data objects, clustered by event type.
 
-Exports all event dataclasses and spec functions from submodules.
+Exports all event dataclasses and spec functions from submodules. Submodules are imported on first access of one
+of their exports, so e.g. ``from yaafc.events import MouseEvent`` only loads ``mouse_events``.
 """
 
-from .animation_transition_events import (
-    AnimationEndEvent,
-    AnimationEvent,
-    AnimationIterationEvent,
-    AnimationStartEvent,
-    TransitionEvent,
-    WebGLContextEvent,
-)
-from .blob_error_close_events import (
-    Blob,
-    BlobEvent,
-    CloseEvent,
-    Error,
-    ErrorEvent,
-)
-from .clipboard_events import (
-    ClipboardEvent,
-    CopyEvent,
-    CutEvent,
-    PasteEvent,
-)
-from .custom_events import CustomEvent
-from .enhanced_event_watcher import EnhancedEventWatcher, enhanced_event_watcher
-from .fetch_form_submit_events import (
-    FetchEvent,
-    FormData,
-    FormDataEvent,
-    Request,
-    SubmitEvent,
-)
-from .focus_events import BlurEvent, FocusEvent, FocusInEvent
-from .gamepad_hash_popstate_storage_events import (
-    Gamepad,
-    GamepadEvent,
-    HashChangeEvent,
-    PopStateEvent,
-    Storage,
-    StorageEvent,
-)
-from .generic_events import (
-    Event,
-    ProgressEvent,
-    SecurityPolicyViolationEvent,
-)
-from .keyboard_events import (
-    BeforeInputEvent,
-    CompositionEndEvent,
-    CompositionEvent,
-    CompositionStartEvent,
-    CompositionUpdateEvent,
-    InputEvent,
-    KeyboardEvent,
-    KeyDownEvent,
-    KeyUpEvent,
-)
-from .mouse_events import (
-    DoubleClickEvent,
-    DragEndEvent,
-    DragEnterEvent,
-    DragEvent,
-    DragLeaveEvent,
-    DragOverEvent,
-    DragStartEvent,
-    DropEvent,
-    MouseEvent,
-    PointerEvent,
-    WheelEvent,
-)
-from .pointer_events import (
-    GotPointerCaptureEvent,
-    LostPointerCaptureEvent,
-    PointerCancelEvent,
-    PointerDownEvent,
-    PointerEnterEvent,
-    PointerLeaveEvent,
-    PointerMoveEvent,
-    PointerOutEvent,
-    PointerOverEvent,
-    PointerUpEvent,
-)
-from .touch_events import TouchEvent
-from .ui_events import ScrollEndEvent, ScrollEvent, UIEvent
-from .unload_transition_events import (
-    BeforeUnloadEvent,
-    PageTransitionEvent,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from .animation_transition_events import (
+        AnimationEndEvent,
+        AnimationEvent,
+        AnimationIterationEvent,
+        AnimationStartEvent,
+        TransitionEvent,
+        WebGLContextEvent,
+        animation_end_event_spec,
+        animation_event_spec,
+        animation_iteration_event_spec,
+        animation_start_event_spec,
+        transition_event_spec,
+        webgl_context_event_spec,
+    )
+    from .batching import batch, batch_spec, batched
+    from .blob_error_close_events import (
+        Blob,
+        BlobEvent,
+        CloseEvent,
+        Error,
+        ErrorEvent,
+        blob_event_spec,
+        close_event_spec,
+        error_event_spec,
+    )
+    from .clipboard_events import (
+        ClipboardEvent,
+        CopyEvent,
+        CutEvent,
+        PasteEvent,
+        clipboard_event_spec,
+        copy_event_spec,
+        cut_event_spec,
+        paste_event_spec,
+    )
+    from .custom_events import CustomEvent, custom_event_spec
+    from .enhanced_event_watcher import EnhancedEventWatcher, enhanced_event_watcher
+    from .fetch_form_submit_events import (
+        FetchEvent,
+        FormData,
+        FormDataEvent,
+        Request,
+        SubmitEvent,
+        fetch_event_spec,
+        form_data_event_spec,
+        submit_event_spec,
+    )
+    from .focus_events import (
+        BlurEvent,
+        FocusEvent,
+        FocusInEvent,
+        blur_event_spec,
+        focus_event_spec,
+        focus_in_event_spec,
+    )
+    from .gamepad_hash_popstate_storage_events import (
+        Gamepad,
+        GamepadEvent,
+        HashChangeEvent,
+        PopStateEvent,
+        Storage,
+        StorageEvent,
+        gamepad_event_spec,
+        hash_change_event_spec,
+        pop_state_event_spec,
+        storage_event_spec,
+    )
+    from .generic_events import (
+        Event,
+        ProgressEvent,
+        SecurityPolicyViolationEvent,
+        event_spec,
+        progress_event_spec,
+        security_policy_violation_event_spec,
+    )
+    from .keyboard_events import (
+        BeforeInputEvent,
+        CompositionEndEvent,
+        CompositionEvent,
+        CompositionStartEvent,
+        CompositionUpdateEvent,
+        InputEvent,
+        KeyboardEvent,
+        KeyDownEvent,
+        KeyUpEvent,
+        before_input_event_spec,
+        composition_end_event_spec,
+        composition_event_spec,
+        composition_start_event_spec,
+        composition_update_event_spec,
+        input_event_spec,
+        key_down_event_spec,
+        key_up_event_spec,
+        keyboard_event_spec,
+    )
+    from .mouse_events import (
+        DoubleClickEvent,
+        DragEndEvent,
+        DragEnterEvent,
+        DragEvent,
+        DragLeaveEvent,
+        DragOverEvent,
+        DragStartEvent,
+        DropEvent,
+        MouseEvent,
+        PointerEvent,
+        WheelEvent,
+        double_click_event_spec,
+        drag_end_event_spec,
+        drag_enter_event_spec,
+        drag_event_spec,
+        drag_leave_event_spec,
+        drag_over_event_spec,
+        drag_start_event_spec,
+        drop_event_spec,
+        mouse_event_spec,
+        pointer_event_spec,
+        wheel_event_spec,
+    )
+    from .pointer_events import (
+        GotPointerCaptureEvent,
+        LostPointerCaptureEvent,
+        PointerCancelEvent,
+        PointerDownEvent,
+        PointerEnterEvent,
+        PointerLeaveEvent,
+        PointerMoveEvent,
+        PointerOutEvent,
+        PointerOverEvent,
+        PointerUpEvent,
+        got_pointer_capture_event_spec,
+        lost_pointer_capture_event_spec,
+        pointer_cancel_event_spec,
+        pointer_down_event_spec,
+        pointer_enter_event_spec,
+        pointer_leave_event_spec,
+        pointer_move_event_spec,
+        pointer_out_event_spec,
+        pointer_over_event_spec,
+        pointer_up_event_spec,
+    )
+    from .rate_limit import RateLimit, RateLimited, debounce, every_event, per_frame, throttle
+    from .spec_factory import event_payload, read_fields, selective_spec, spec_for
+    from .touch_events import TouchEvent, touch_event_spec
+    from .ui_events import ScrollEndEvent, ScrollEvent, UIEvent, scroll_end_event_spec, scroll_event_spec, ui_event_spec
+    from .unload_transition_events import (
+        BeforeUnloadEvent,
+        PageTransitionEvent,
+        before_unload_event_spec,
+        page_transition_event_spec,
+    )
+
+# submodule defining each export
+_EXPORTS = {
+    # animation_transition_events
+    "AnimationEndEvent": "animation_transition_events",
+    "AnimationEvent": "animation_transition_events",
+    "AnimationIterationEvent": "animation_transition_events",
+    "AnimationStartEvent": "animation_transition_events",
+    "TransitionEvent": "animation_transition_events",
+    "WebGLContextEvent": "animation_transition_events",
+    "animation_end_event_spec": "animation_transition_events",
+    "animation_event_spec": "animation_transition_events",
+    "animation_iteration_event_spec": "animation_transition_events",
+    "animation_start_event_spec": "animation_transition_events",
+    "transition_event_spec": "animation_transition_events",
+    "webgl_context_event_spec": "animation_transition_events",
+    # batching
+    "batch": "batching",
+    "batch_spec": "batching",
+    "batched": "batching",
+    # blob_error_close_events
+    "Blob": "blob_error_close_events",
+    "BlobEvent": "blob_error_close_events",
+    "CloseEvent": "blob_error_close_events",
+    "Error": "blob_error_close_events",
+    "ErrorEvent": "blob_error_close_events",
+    "blob_event_spec": "blob_error_close_events",
+    "close_event_spec": "blob_error_close_events",
+    "error_event_spec": "blob_error_close_events",
+    # clipboard_events
+    "ClipboardEvent": "clipboard_events",
+    "CopyEvent": "clipboard_events",
+    "CutEvent": "clipboard_events",
+    "PasteEvent": "clipboard_events",
+    "clipboard_event_spec": "clipboard_events",
+    "copy_event_spec": "clipboard_events",
+    "cut_event_spec": "clipboard_events",
+    "paste_event_spec": "clipboard_events",
+    # custom_events
+    "CustomEvent": "custom_events",
+    "custom_event_spec": "custom_events",
+    # enhanced_event_watcher
+    "EnhancedEventWatcher": "enhanced_event_watcher",
+    "enhanced_event_watcher": "enhanced_event_watcher",
+    # fetch_form_submit_events
+    "FetchEvent": "fetch_form_submit_events",
+    "FormData": "fetch_form_submit_events",
+    "FormDataEvent": "fetch_form_submit_events",
+    "Request": "fetch_form_submit_events",
+    "SubmitEvent": "fetch_form_submit_events",
+    "fetch_event_spec": "fetch_form_submit_events",
+    "form_data_event_spec": "fetch_form_submit_events",
+    "submit_event_spec": "fetch_form_submit_events",
+    # focus_events
+    "BlurEvent": "focus_events",
+    "FocusEvent": "focus_events",
+    "FocusInEvent": "focus_events",
+    "blur_event_spec": "focus_events",
+    "focus_event_spec": "focus_events",
+    "focus_in_event_spec": "focus_events",
+    # gamepad_hash_popstate_storage_events
+    "Gamepad": "gamepad_hash_popstate_storage_events",
+    "GamepadEvent": "gamepad_hash_popstate_storage_events",
+    "HashChangeEvent": "gamepad_hash_popstate_storage_events",
+    "PopStateEvent": "gamepad_hash_popstate_storage_events",
+    "Storage": "gamepad_hash_popstate_storage_events",
+    "StorageEvent": "gamepad_hash_popstate_storage_events",
+    "gamepad_event_spec": "gamepad_hash_popstate_storage_events",
+    "hash_change_event_spec": "gamepad_hash_popstate_storage_events",
+    "pop_state_event_spec": "gamepad_hash_popstate_storage_events",
+    "storage_event_spec": "gamepad_hash_popstate_storage_events",
+    # generic_events
+    "Event": "generic_events",
+    "ProgressEvent": "generic_events",
+    "SecurityPolicyViolationEvent": "generic_events",
+    "event_spec": "generic_events",
+    "progress_event_spec": "generic_events",
+    "security_policy_violation_event_spec": "generic_events",
+    # keyboard_events
+    "BeforeInputEvent": "keyboard_events",
+    "CompositionEndEvent": "keyboard_events",
+    "CompositionEvent": "keyboard_events",
+    "CompositionStartEvent": "keyboard_events",
+    "CompositionUpdateEvent": "keyboard_events",
+    "InputEvent": "keyboard_events",
+    "KeyDownEvent": "keyboard_events",
+    "KeyUpEvent": "keyboard_events",
+    "KeyboardEvent": "keyboard_events",
+    "before_input_event_spec": "keyboard_events",
+    "composition_end_event_spec": "keyboard_events",
+    "composition_event_spec": "keyboard_events",
+    "composition_start_event_spec": "keyboard_events",
+    "composition_update_event_spec": "keyboard_events",
+    "input_event_spec": "keyboard_events",
+    "key_down_event_spec": "keyboard_events",
+    "key_up_event_spec": "keyboard_events",
+    "keyboard_event_spec": "keyboard_events",
+    # mouse_events
+    "DoubleClickEvent": "mouse_events",
+    "DragEndEvent": "mouse_events",
+    "DragEnterEvent": "mouse_events",
+    "DragEvent": "mouse_events",
+    "DragLeaveEvent": "mouse_events",
+    "DragOverEvent": "mouse_events",
+    "DragStartEvent": "mouse_events",
+    "DropEvent": "mouse_events",
+    "MouseEvent": "mouse_events",
+    "PointerEvent": "mouse_events",
+    "WheelEvent": "mouse_events",
+    "double_click_event_spec": "mouse_events",
+    "drag_end_event_spec": "mouse_events",
+    "drag_enter_event_spec": "mouse_events",
+    "drag_event_spec": "mouse_events",
+    "drag_leave_event_spec": "mouse_events",
+    "drag_over_event_spec": "mouse_events",
+    "drag_start_event_spec": "mouse_events",
+    "drop_event_spec": "mouse_events",
+    "mouse_event_spec": "mouse_events",
+    "pointer_event_spec": "mouse_events",
+    "wheel_event_spec": "mouse_events",
+    # pointer_events
+    "GotPointerCaptureEvent": "pointer_events",
+    "LostPointerCaptureEvent": "pointer_events",
+    "PointerCancelEvent": "pointer_events",
+    "PointerDownEvent": "pointer_events",
+    "PointerEnterEvent": "pointer_events",
+    "PointerLeaveEvent": "pointer_events",
+    "PointerMoveEvent": "pointer_events",
+    "PointerOutEvent": "pointer_events",
+    "PointerOverEvent": "pointer_events",
+    "PointerUpEvent": "pointer_events",
+    "got_pointer_capture_event_spec": "pointer_events",
+    "lost_pointer_capture_event_spec": "pointer_events",
+    "pointer_cancel_event_spec": "pointer_events",
+    "pointer_down_event_spec": "pointer_events",
+    "pointer_enter_event_spec": "pointer_events",
+    "pointer_leave_event_spec": "pointer_events",
+    "pointer_move_event_spec": "pointer_events",
+    "pointer_out_event_spec": "pointer_events",
+    "pointer_over_event_spec": "pointer_events",
+    "pointer_up_event_spec": "pointer_events",
+    # rate_limit
+    "RateLimit": "rate_limit",
+    "RateLimited": "rate_limit",
+    "debounce": "rate_limit",
+    "every_event": "rate_limit",
+    "per_frame": "rate_limit",
+    "throttle": "rate_limit",
+    # spec_factory
+    "event_payload": "spec_factory",
+    "read_fields": "spec_factory",
+    "selective_spec": "spec_factory",
+    "spec_for": "spec_factory",
+    # touch_events
+    "TouchEvent": "touch_events",
+    "touch_event_spec": "touch_events",
+    # ui_events
+    "ScrollEndEvent": "ui_events",
+    "ScrollEvent": "ui_events",
+    "UIEvent": "ui_events",
+    "scroll_end_event_spec": "ui_events",
+    "scroll_event_spec": "ui_events",
+    "ui_event_spec": "ui_events",
+    # unload_transition_events
+    "BeforeUnloadEvent": "unload_transition_events",
+    "PageTransitionEvent": "unload_transition_events",
+    "before_unload_event_spec": "unload_transition_events",
+    "page_transition_event_spec": "unload_transition_events",
+}
+
+# spelled out for linters and type checkers, the names of _EXPORTS
 __all__ = [
     "AnimationEndEvent",
-    # animation_transition_events
     "AnimationEvent",
     "AnimationIterationEvent",
     "AnimationStartEvent",
     "BeforeInputEvent",
-    # unload_transition_events
     "BeforeUnloadEvent",
-    # blob_error_close_events
     "Blob",
     "BlobEvent",
     "BlurEvent",
-    # clipboard_events
     "ClipboardEvent",
     "CloseEvent",
     "CompositionEndEvent",
@@ -114,7 +350,6 @@ __all__ = [
     "CompositionStartEvent",
     "CompositionUpdateEvent",
     "CopyEvent",
-    # custom_events
     "CustomEvent",
     "CutEvent",
     "DoubleClickEvent",
@@ -128,27 +363,21 @@ __all__ = [
     "EnhancedEventWatcher",
     "Error",
     "ErrorEvent",
-    # generic_events
     "Event",
     "FetchEvent",
-    # focus_events
     "FocusEvent",
     "FocusInEvent",
     "FormData",
     "FormDataEvent",
-    # gamepad_hash_popstate_storage_events
     "Gamepad",
     "GamepadEvent",
-    # pointer_events
     "GotPointerCaptureEvent",
     "HashChangeEvent",
     "InputEvent",
     "KeyDownEvent",
     "KeyUpEvent",
-    # keyboard_events
     "KeyboardEvent",
     "LostPointerCaptureEvent",
-    # mouse_events
     "MouseEvent",
     "PageTransitionEvent",
     "PasteEvent",
@@ -163,7 +392,8 @@ __all__ = [
     "PointerUpEvent",
     "PopStateEvent",
     "ProgressEvent",
-    # fetch_form_submit_events
+    "RateLimit",
+    "RateLimited",
     "Request",
     "ScrollEndEvent",
     "ScrollEvent",
@@ -171,12 +401,105 @@ __all__ = [
     "Storage",
     "StorageEvent",
     "SubmitEvent",
-    # touch_events
     "TouchEvent",
     "TransitionEvent",
-    # ui_events
     "UIEvent",
     "WebGLContextEvent",
     "WheelEvent",
+    "animation_end_event_spec",
+    "animation_event_spec",
+    "animation_iteration_event_spec",
+    "animation_start_event_spec",
+    "batch",
+    "batch_spec",
+    "batched",
+    "before_input_event_spec",
+    "before_unload_event_spec",
+    "blob_event_spec",
+    "blur_event_spec",
+    "clipboard_event_spec",
+    "close_event_spec",
+    "composition_end_event_spec",
+    "composition_event_spec",
+    "composition_start_event_spec",
+    "composition_update_event_spec",
+    "copy_event_spec",
+    "custom_event_spec",
+    "cut_event_spec",
+    "debounce",
+    "double_click_event_spec",
+    "drag_end_event_spec",
+    "drag_enter_event_spec",
+    "drag_event_spec",
+    "drag_leave_event_spec",
+    "drag_over_event_spec",
+    "drag_start_event_spec",
+    "drop_event_spec",
     "enhanced_event_watcher",
+    "error_event_spec",
+    "event_payload",
+    "event_spec",
+    "every_event",
+    "fetch_event_spec",
+    "focus_event_spec",
+    "focus_in_event_spec",
+    "form_data_event_spec",
+    "gamepad_event_spec",
+    "got_pointer_capture_event_spec",
+    "hash_change_event_spec",
+    "input_event_spec",
+    "key_down_event_spec",
+    "key_up_event_spec",
+    "keyboard_event_spec",
+    "lost_pointer_capture_event_spec",
+    "mouse_event_spec",
+    "page_transition_event_spec",
+    "paste_event_spec",
+    "per_frame",
+    "pointer_cancel_event_spec",
+    "pointer_down_event_spec",
+    "pointer_enter_event_spec",
+    "pointer_event_spec",
+    "pointer_leave_event_spec",
+    "pointer_move_event_spec",
+    "pointer_out_event_spec",
+    "pointer_over_event_spec",
+    "pointer_up_event_spec",
+    "pop_state_event_spec",
+    "progress_event_spec",
+    "read_fields",
+    "scroll_end_event_spec",
+    "scroll_event_spec",
+    "security_policy_violation_event_spec",
+    "selective_spec",
+    "spec_for",
+    "storage_event_spec",
+    "submit_event_spec",
+    "throttle",
+    "touch_event_spec",
+    "transition_event_spec",
+    "ui_event_spec",
+    "webgl_context_event_spec",
+    "wheel_event_spec",
 ]
+
+
+class UnknownExportError(AttributeError):
+    def __init__(self, name: str):
+        super().__init__(f"module {__name__!r} has no attribute {name!r}", name=name)
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the submodule defining an export on first access."""
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise UnknownExportError(name) from None
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # later accesses find the export without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
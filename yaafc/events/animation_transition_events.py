@@ -8,6 +8,8 @@ import dataclasses
 
 import reflex as rx
 
+from yaafc.events.spec_factory import spec_for
+
 
 # AnimationEvent: https://developer.mozilla.org/en-US/docs/Web/API/AnimationEvent
 @dataclasses.dataclass
@@ -57,17 +59,7 @@ class AnimationEndEvent(AnimationEvent):
     pass
 
 
-def animation_end_event_spec(ev: rx.Var[AnimationEndEvent]) -> tuple[rx.Var[AnimationEndEvent]]:
-    """
-    Creates a specification for an AnimationEndEvent.
-
-    Args:
-        ev (rx.Var[AnimationEndEvent]): The AnimationEndEvent variable.
-
-    Returns:
-        tuple[rx.Var[AnimationEndEvent]]: A tuple containing the AnimationEndEvent specification.
-    """
-    return (rx.Var.create(AnimationEndEvent(**dataclasses.asdict(animation_event_spec(ev)[0].get()))),)
+animation_end_event_spec = spec_for(AnimationEndEvent)
 
 
 @dataclasses.dataclass
@@ -80,17 +72,7 @@ class AnimationIterationEvent(AnimationEvent):
     pass
 
 
-def animation_iteration_event_spec(ev: rx.Var[AnimationIterationEvent]) -> tuple[rx.Var[AnimationIterationEvent]]:
-    """
-    Creates a specification for an AnimationIterationEvent.
-
-    Args:
-        ev (rx.Var[AnimationIterationEvent]): The AnimationIterationEvent variable.
-
-    Returns:
-        tuple[rx.Var[AnimationIterationEvent]]: A tuple containing the AnimationIterationEvent specification.
-    """
-    return (rx.Var.create(AnimationIterationEvent(**dataclasses.asdict(animation_event_spec(ev)[0].get()))),)
+animation_iteration_event_spec = spec_for(AnimationIterationEvent)
 
 
 @dataclasses.dataclass
@@ -103,17 +85,7 @@ class AnimationStartEvent(AnimationEvent):
     pass
 
 
-def animation_start_event_spec(ev: rx.Var[AnimationStartEvent]) -> tuple[rx.Var[AnimationStartEvent]]:
-    """
-    Creates a specification for an AnimationStartEvent.
-
-    Args:
-        ev (rx.Var[AnimationStartEvent]): The AnimationStartEvent variable.
-
-    Returns:
-        tuple[rx.Var[AnimationStartEvent]]: A tuple containing the AnimationStartEvent specification.
-    """
-    return (rx.Var.create(AnimationStartEvent(**dataclasses.asdict(animation_event_spec(ev)[0].get()))),)
+animation_start_event_spec = spec_for(AnimationStartEvent)
 
 
 # TransitionEvent: https://developer.mozilla.org/en-US/docs/Web/API/TransitionEvent
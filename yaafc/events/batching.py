@@ -0,0 +1,131 @@
+"""
+Batched delivery of bursts of events.
+
+Holding an arrow key or typing ahead in a file panel fires a key event every 30 ms, and every one of them is a
+handler call, a state lock and a delta sent back. A batch gathers the events of a trigger in the browser for a
+short window and delivers them as one list to a batch handler, which processes the whole burst in one call:
+
+    class PanelState(rx.State):
+        @rx.event
+        @batched
+        def navigate(self, events: list[KeyDownEvent]):
+            for event in events:
+                ...
+
+    enhanced_event_watcher(on_key_down=batch(PanelState.navigate, window_ms=50))
+
+The window opens with the first event of a burst, so a single key press reaches the handler ``window_ms`` later, as a
+list of one. ``preventDefault`` and ``stopPropagation`` still apply to every event when it happens.
+"""
+
+import dataclasses
+import functools
+import inspect
+import typing
+from collections.abc import Callable
+from typing import Any
+
+import reflex as rx
+from reflex.vars.object import ObjectVar
+
+from yaafc.events.rate_limit import RateLimit, RateLimited
+from yaafc.events.spec_factory import spec_event_class
+
+
+class NoEventClassError(ValueError):
+    def __init__(self, spec: Callable[..., Any]):
+        super().__init__(f"{spec.__name__} names no event dataclass to batch")
+
+
+def batch(handler: Any, window_ms: int = 50, max_events: int = 0) -> RateLimited:
+    """
+    Delivers the events of a trigger in batches.
+
+    Args:
+        handler (Any): The batch handler, taking a list of the trigger's events.
+        window_ms (int): Milliseconds events are gathered for, from the first event of a burst.
+        max_events (int): Size of a batch delivered before its window ends, unlimited if 0.
+
+    Returns:
+        RateLimited: The handler with its rate limit, for ``EnhancedEventWatcher``.
+    """
+    return RateLimited(handler, RateLimit("batch", window_ms, max_events=max_events))
+
+
+@functools.cache
+def batch_spec(spec: Callable[..., Any]) -> Callable[..., tuple[rx.Var]]:
+    """
+    Turns the spec of an event trigger into the spec of its batches.
+
+    The events are extracted as before, the browser gathers them into a list.
+
+    Args:
+        spec (Callable[..., Any]): The spec of the trigger.
+
+    Returns:
+        Callable[..., tuple[rx.Var]]: The spec, typed as a list of the event dataclass.
+
+    Raises:
+        NoEventClassError: If the annotations of ``spec`` do not name an event dataclass.
+    """
+    event_class = spec_event_class(spec)
+    if event_class is None:
+        raise NoEventClassError(spec)
+    items = list[event_class]  # type: ignore[valid-type]
+
+    def batched_spec(ev: ObjectVar) -> tuple[rx.Var]:
+        return tuple(payload.to(items) for payload in spec(ev))
+
+    # Reflex checks handler arguments against the annotations of the spec, which are generated at runtime
+    batched_spec.__annotations__ = {
+        "ev": ObjectVar[event_class],  # type: ignore[valid-type]
+        "return": tuple[rx.Var[items]],
+    }
+    batched_spec.__name__ = batched_spec.__qualname__ = f"{spec.__name__}_batch"
+    return batched_spec
+
+
+def batched(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Converts the events of a batch handler to their dataclasses.
+
+    Reflex passes the events of a batch as dictionaries; parameters annotated as ``list`` of an event dataclass
+    receive instances of it instead.
+
+    Args:
+        fn (Callable[..., Any]): The handler, decorated before ``rx.event``.
+
+    Returns:
+        Callable[..., Any]: The handler converting its batches.
+    """
+    signature = inspect.signature(fn)
+    event_classes: dict[str, type[Any]] = {}
+    for name, hint in typing.get_type_hints(fn).items():
+        item = next(iter(typing.get_args(hint)), None)
+        if typing.get_origin(hint) is list and isinstance(item, type) and dataclasses.is_dataclass(item):
+            event_classes[name] = item
+
+    def convert(args: tuple[Any, ...], kwargs: dict[str, Any]) -> inspect.BoundArguments:
+        bound = signature.bind(*args, **kwargs)
+        for name, event_class in event_classes.items():
+            if name in bound.arguments:
+                bound.arguments[name] = [
+                    event if isinstance(event, event_class) else event_class(**event) for event in bound.arguments[name]
+                ]
+        return bound
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_handler(*args: Any, **kwargs: Any) -> Any:
+            bound = convert(args, kwargs)
+            return await fn(*bound.args, **bound.kwargs)
+
+        return async_handler
+
+    @functools.wraps(fn)
+    def handler(*args: Any, **kwargs: Any) -> Any:
+        bound = convert(args, kwargs)
+        return fn(*bound.args, **bound.kwargs)
+
+    return handler
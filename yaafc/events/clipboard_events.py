@@ -8,6 +8,8 @@ import dataclasses
 
 import reflex as rx
 
+from yaafc.events.spec_factory import spec_for
+
 
 @dataclasses.dataclass
 class ClipboardEvent:
@@ -45,17 +47,7 @@ class CopyEvent(ClipboardEvent):
     pass
 
 
-def copy_event_spec(ev: rx.Var[CopyEvent]) -> tuple[rx.Var[CopyEvent]]:
-    """
-    Creates a specification for a CopyEvent.
-
-    Args:
-        ev (rx.Var[CopyEvent]): The CopyEvent variable.
-
-    Returns:
-        tuple[rx.Var[CopyEvent]]: A tuple containing the CopyEvent variable.
-    """
-    return (rx.Var.create(CopyEvent(**dataclasses.asdict(clipboard_event_spec(ev)[0].get()))),)
+copy_event_spec = spec_for(CopyEvent)
 
 
 @dataclasses.dataclass
@@ -69,17 +61,7 @@ class CutEvent(ClipboardEvent):
     pass
 
 
-def cut_event_spec(ev: rx.Var[CutEvent]) -> tuple[rx.Var[CutEvent]]:
-    """
-    Creates a specification for a CutEvent.
-
-    Args:
-        ev (rx.Var[CutEvent]): The CutEvent variable.
-
-    Returns:
-        tuple[rx.Var[CutEvent]]: A tuple containing the CutEvent variable.
-    """
-    return (rx.Var.create(CutEvent(**dataclasses.asdict(clipboard_event_spec(ev)[0].get()))),)
+cut_event_spec = spec_for(CutEvent)
 
 
 @dataclasses.dataclass
@@ -93,14 +75,4 @@ class PasteEvent(ClipboardEvent):
     pass
 
 
-def paste_event_spec(ev: rx.Var[PasteEvent]) -> tuple[rx.Var[PasteEvent]]:
-    """
-    Creates a specification for a PasteEvent.
-
-    Args:
-        ev (rx.Var[PasteEvent]): The PasteEvent variable.
-
-    Returns:
-        tuple[rx.Var[PasteEvent]]: A tuple containing the PasteEvent variable.
-    """
-    return (rx.Var.create(PasteEvent(**dataclasses.asdict(clipboard_event_spec(ev)[0].get()))),)
+paste_event_spec = spec_for(PasteEvent)
@@ -1,75 +1,126 @@
+import functools
+import importlib
+import inspect
+from collections.abc import Callable
+from typing import Any, ClassVar, cast
+
 import reflex as rx
+from reflex.event import EventChain, EventHandler
+
+from yaafc.events.batching import batch_spec
+from yaafc.events.rate_limit import RATE_LIMIT_JS, RateLimit, RateLimited
+from yaafc.events.spec_factory import selective_spec
+
+
+class UnknownTriggerError(ValueError):
+    def __init__(self, component: type, trigger: str):
+        super().__init__(f"{component.__name__} has no event trigger {trigger}")
+
+
+class _LazySpec:
+    """A spec function of a submodule, imported when Reflex first inspects or calls it."""
+
+    def __init__(self, module: str, name: str) -> None:
+        self._module = module
+        self._name = name
+
+    @functools.cached_property
+    def __wrapped__(self) -> Callable[..., Any]:
+        return cast(Callable[..., Any], getattr(importlib.import_module(f"yaafc.events.{self._module}"), self._name))
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        return inspect.signature(self.__wrapped__)
+
+    def __getattr__(self, attribute: str) -> Any:
+        # only what Reflex and the spec factory read from spec functions, any other probe must not import
+        if attribute not in {"__annotations__", "__name__", "__qualname__"}:
+            raise AttributeError(attribute)
+        return getattr(self.__wrapped__, attribute)
 
-from yaafc.events.animation_transition_events import (
-    animation_end_event_spec,
-    animation_iteration_event_spec,
-    animation_start_event_spec,
-    transition_event_spec,
-    webgl_context_event_spec,
-)
-from yaafc.events.clipboard_events import (
-    copy_event_spec,
-    cut_event_spec,
-    paste_event_spec,
-)
-from yaafc.events.custom_events import custom_event_spec
-from yaafc.events.fetch_form_submit_events import submit_event_spec
-from yaafc.events.focus_events import (
-    blur_event_spec,
-    focus_event_spec,
-    focus_in_event_spec,
-)
-from yaafc.events.gamepad_hash_popstate_storage_events import (
-    hash_change_event_spec,
-    pop_state_event_spec,
-    storage_event_spec,
-)
-from yaafc.events.generic_events import progress_event_spec, security_policy_violation_event_spec
-from yaafc.events.keyboard_events import (
-    before_input_event_spec,
-    composition_end_event_spec,
-    composition_start_event_spec,
-    composition_update_event_spec,
-    input_event_spec,
-    key_down_event_spec,
-    key_up_event_spec,
-)
-from yaafc.events.mouse_events import (
-    double_click_event_spec,
-    drag_end_event_spec,
-    drag_enter_event_spec,
-    drag_event_spec,
-    drag_leave_event_spec,
-    drag_over_event_spec,
-    drag_start_event_spec,
-    drop_event_spec,
-    mouse_event_spec,
-    wheel_event_spec,
-)
-from yaafc.events.pointer_events import (
-    got_pointer_capture_event_spec,
-    lost_pointer_capture_event_spec,
-    pointer_cancel_event_spec,
-    pointer_down_event_spec,
-    pointer_enter_event_spec,
-    pointer_leave_event_spec,
-    pointer_move_event_spec,
-    pointer_out_event_spec,
-    pointer_over_event_spec,
-    pointer_up_event_spec,
-)
-from yaafc.events.touch_events import touch_event_spec
-from yaafc.events.ui_events import (
-    scroll_end_event_spec,
-    scroll_event_spec,
-)
-from yaafc.events.unload_transition_events import (
-    before_unload_event_spec,
-    page_transition_event_spec,
-)
+    def __call__(self, *args: Any) -> Any:
+        return self.__wrapped__(*args)
+
+
+def _lazy_spec(module: str, name: str) -> Callable[..., Any]:
+    return _LazySpec(module, name)
+
+
+# the specs of the triggers, each submodule is imported once a handler is bound to one of its events; a page
+# watching the keyboard does not load the event classes of gamepads, WebGL and page transitions
+animation_end_event_spec = _lazy_spec("animation_transition_events", "animation_end_event_spec")
+animation_iteration_event_spec = _lazy_spec("animation_transition_events", "animation_iteration_event_spec")
+animation_start_event_spec = _lazy_spec("animation_transition_events", "animation_start_event_spec")
+transition_event_spec = _lazy_spec("animation_transition_events", "transition_event_spec")
+webgl_context_event_spec = _lazy_spec("animation_transition_events", "webgl_context_event_spec")
+copy_event_spec = _lazy_spec("clipboard_events", "copy_event_spec")
+cut_event_spec = _lazy_spec("clipboard_events", "cut_event_spec")
+paste_event_spec = _lazy_spec("clipboard_events", "paste_event_spec")
+custom_event_spec = _lazy_spec("custom_events", "custom_event_spec")
+submit_event_spec = _lazy_spec("fetch_form_submit_events", "submit_event_spec")
+blur_event_spec = _lazy_spec("focus_events", "blur_event_spec")
+focus_event_spec = _lazy_spec("focus_events", "focus_event_spec")
+focus_in_event_spec = _lazy_spec("focus_events", "focus_in_event_spec")
+hash_change_event_spec = _lazy_spec("gamepad_hash_popstate_storage_events", "hash_change_event_spec")
+pop_state_event_spec = _lazy_spec("gamepad_hash_popstate_storage_events", "pop_state_event_spec")
+storage_event_spec = _lazy_spec("gamepad_hash_popstate_storage_events", "storage_event_spec")
+progress_event_spec = _lazy_spec("generic_events", "progress_event_spec")
+security_policy_violation_event_spec = _lazy_spec("generic_events", "security_policy_violation_event_spec")
+before_input_event_spec = _lazy_spec("keyboard_events", "before_input_event_spec")
+composition_end_event_spec = _lazy_spec("keyboard_events", "composition_end_event_spec")
+composition_start_event_spec = _lazy_spec("keyboard_events", "composition_start_event_spec")
+composition_update_event_spec = _lazy_spec("keyboard_events", "composition_update_event_spec")
+input_event_spec = _lazy_spec("keyboard_events", "input_event_spec")
+key_down_event_spec = _lazy_spec("keyboard_events", "key_down_event_spec")
+key_up_event_spec = _lazy_spec("keyboard_events", "key_up_event_spec")
+double_click_event_spec = _lazy_spec("mouse_events", "double_click_event_spec")
+drag_end_event_spec = _lazy_spec("mouse_events", "drag_end_event_spec")
+drag_enter_event_spec = _lazy_spec("mouse_events", "drag_enter_event_spec")
+drag_event_spec = _lazy_spec("mouse_events", "drag_event_spec")
+drag_leave_event_spec = _lazy_spec("mouse_events", "drag_leave_event_spec")
+drag_over_event_spec = _lazy_spec("mouse_events", "drag_over_event_spec")
+drag_start_event_spec = _lazy_spec("mouse_events", "drag_start_event_spec")
+drop_event_spec = _lazy_spec("mouse_events", "drop_event_spec")
+mouse_event_spec = _lazy_spec("mouse_events", "mouse_event_spec")
+wheel_event_spec = _lazy_spec("mouse_events", "wheel_event_spec")
+got_pointer_capture_event_spec = _lazy_spec("pointer_events", "got_pointer_capture_event_spec")
+lost_pointer_capture_event_spec = _lazy_spec("pointer_events", "lost_pointer_capture_event_spec")
+pointer_cancel_event_spec = _lazy_spec("pointer_events", "pointer_cancel_event_spec")
+pointer_down_event_spec = _lazy_spec("pointer_events", "pointer_down_event_spec")
+pointer_enter_event_spec = _lazy_spec("pointer_events", "pointer_enter_event_spec")
+pointer_leave_event_spec = _lazy_spec("pointer_events", "pointer_leave_event_spec")
+pointer_move_event_spec = _lazy_spec("pointer_events", "pointer_move_event_spec")
+pointer_out_event_spec = _lazy_spec("pointer_events", "pointer_out_event_spec")
+pointer_over_event_spec = _lazy_spec("pointer_events", "pointer_over_event_spec")
+pointer_up_event_spec = _lazy_spec("pointer_events", "pointer_up_event_spec")
+touch_event_spec = _lazy_spec("touch_events", "touch_event_spec")
+scroll_end_event_spec = _lazy_spec("ui_events", "scroll_end_event_spec")
+scroll_event_spec = _lazy_spec("ui_events", "scroll_event_spec")
+before_unload_event_spec = _lazy_spec("unload_transition_events", "before_unload_event_spec")
+page_transition_event_spec = _lazy_spec("unload_transition_events", "page_transition_event_spec")
 
 
 class EnhancedEventWatcher(rx.el.Div):
+    """
+    A div forwarding all DOM events to event handlers.
+
+    Handlers may be wrapped in a rate limit, see ``yaafc.events.rate_limit``. High-frequency triggers are limited to
+    one delivery per animation frame unless their handler declares another limit.
+
+    Event handlers only receive the event fields they read, see ``yaafc.events.spec_factory``; the other fields
+    keep the defaults of the event dataclass. Handlers wrapped in ``batch`` receive lists of events, see
+    ``yaafc.events.batching``.
+    """
+
+    default_rate_limits: ClassVar[dict[str, RateLimit]] = {
+        "on_pointer_move": RateLimit("frame", sum_fields=("movementX", "movementY")),
+        "on_mouse_move": RateLimit("frame", sum_fields=("movementX", "movementY")),
+        "on_wheel": RateLimit("frame", sum_fields=("deltaX", "deltaY", "deltaZ")),
+        "on_scroll": RateLimit("frame"),
+        "on_drag": RateLimit("frame"),
+        "on_drag_over": RateLimit("frame"),
+    }
+
     # Mouse events
     on_mouse_down: rx.EventHandler[mouse_event_spec]
     on_mouse_up: rx.EventHandler[mouse_event_spec]
@@ -147,5 +198,43 @@ class EnhancedEventWatcher(rx.el.Div):
     # Security policy violation
     on_security_policy_violation: rx.EventHandler[security_policy_violation_event_spec]
 
+    @classmethod
+    def create(cls, *children, **props) -> "EnhancedEventWatcher":
+        limits = {**cls.default_rate_limits}
+        for trigger, handler in list(props.items()):
+            if isinstance(handler, RateLimited):
+                limits[trigger] = handler.limit
+                props[trigger] = handler.handler
+        # batch handlers take lists of events, they are bound once the specs of their triggers are known
+        batches = {
+            trigger: props.pop(trigger)
+            for trigger, limit in limits.items()
+            if limit.mode == "batch" and trigger in props
+        }
+        handlers = {trigger: handler for trigger, handler in props.items() if isinstance(handler, EventHandler)}
+        component = super().create(*children, **props)
+        specs = component.get_event_triggers()
+        for trigger, handler in handlers.items():
+            spec = selective_spec(handler, specs[trigger]) if trigger in specs else None
+            if spec is not None and spec is not specs[trigger]:
+                component.event_triggers[trigger] = EventChain.create(handler, args_spec=spec, key=trigger)
+        for trigger, handler in batches.items():
+            if trigger not in specs:
+                raise UnknownTriggerError(cls, trigger)
+            trigger_spec = cast(Callable[..., Any], specs[trigger])
+            if isinstance(handler, EventHandler):
+                # only the fields the handler reads from the events of a batch are gathered
+                trigger_spec = selective_spec(handler, trigger_spec, batched=True)
+            spec = batch_spec(trigger_spec)
+            component.event_triggers[trigger] = EventChain.create(handler, args_spec=spec, key=trigger)
+        for trigger, limit in limits.items():
+            chain = component.event_triggers.get(trigger)
+            if isinstance(chain, EventChain):
+                component.event_triggers[trigger] = limit.bind(chain, trigger)
+        return component
+
+    def add_custom_code(self) -> list[str]:
+        return [RATE_LIMIT_JS]
+
 
 enhanced_event_watcher = EnhancedEventWatcher.create
@@ -8,6 +8,8 @@ import dataclasses
 
 import reflex as rx
 
+from yaafc.events.spec_factory import spec_for
+
 
 # FocusEvent: https://developer.mozilla.org/en-US/docs/Web/API/FocusEvent
 @dataclasses.dataclass
@@ -45,17 +47,7 @@ class BlurEvent(FocusEvent):
     pass
 
 
-def blur_event_spec(ev: rx.Var[BlurEvent]) -> tuple[rx.Var[BlurEvent]]:
-    """
-    Event spec function for BlurEvent.
-
-    Args:
-        ev (rx.Var[BlurEvent]): The BlurEvent variable.
-
-    Returns:
-        tuple[rx.Var[BlurEvent]]: A tuple containing the BlurEvent variable.
-    """
-    return (rx.Var.create(BlurEvent(**dataclasses.asdict(focus_event_spec(ev)[0].get()))),)
+blur_event_spec = spec_for(BlurEvent)
 
 
 @dataclasses.dataclass
@@ -68,14 +60,4 @@ class FocusInEvent(FocusEvent):
     pass
 
 
-def focus_in_event_spec(ev: rx.Var[FocusInEvent]) -> tuple[rx.Var[FocusInEvent]]:
-    """
-    Event spec function for FocusInEvent.
-
-    Args:
-        ev (rx.Var[FocusInEvent]): The FocusInEvent variable.
-
-    Returns:
-        tuple[rx.Var[FocusInEvent]]: A tuple containing the FocusInEvent variable.
-    """
-    return (rx.Var.create(FocusInEvent(**dataclasses.asdict(focus_event_spec(ev)[0].get()))),)
+focus_in_event_spec = spec_for(FocusInEvent)
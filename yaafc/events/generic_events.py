@@ -8,6 +8,8 @@ import dataclasses
 
 import reflex as rx
 
+from yaafc.events.spec_factory import spec_for
+
 
 @dataclasses.dataclass
 class Event:
@@ -83,26 +85,7 @@ class ProgressEvent(Event):
     total: int = 0
 
 
-def progress_event_spec(ev: rx.Var[ProgressEvent]) -> tuple[rx.Var[ProgressEvent]]:
-    """
-    Creates a progress event specification for the given ProgressEvent variable.
-
-    Args:
-        ev (rx.Var[ProgressEvent]): The ProgressEvent variable.
-
-    Returns:
-        tuple[rx.Var[ProgressEvent]]: A tuple containing the progress event specification.
-    """
-    return (
-        rx.Var.create(
-            ProgressEvent(
-                **dataclasses.asdict(event_spec(ev)[0].get()),
-                lengthComputable=ev.lengthComputable,
-                loaded=ev.loaded,
-                total=ev.total,
-            )
-        ),
-    )
+progress_event_spec = spec_for(ProgressEvent)
 
 
 @dataclasses.dataclass
@@ -135,32 +118,4 @@ class SecurityPolicyViolationEvent(Event):
     columnNumber: int = 0
 
 
-def security_policy_violation_event_spec(
-    ev: rx.Var[SecurityPolicyViolationEvent],
-) -> tuple[rx.Var[SecurityPolicyViolationEvent]]:
-    """
-    Creates a security policy violation event specification for the given SecurityPolicyViolationEvent variable.
-
-    Args:
-        ev (rx.Var[SecurityPolicyViolationEvent]): The SecurityPolicyViolationEvent variable.
-
-    Returns:
-        tuple[rx.Var[SecurityPolicyViolationEvent]]: A tuple containing the security policy violation event specification.
-    """
-    return (
-        rx.Var.create(
-            SecurityPolicyViolationEvent(
-                **dataclasses.asdict(event_spec(ev)[0].get()),
-                blockedURI=ev.blockedURI,
-                documentURI=ev.documentURI,
-                effectiveDirective=ev.effectiveDirective,
-                originalPolicy=ev.originalPolicy,
-                referrer=ev.referrer,
-                sourceFile=ev.sourceFile,
-                statusCode=ev.statusCode,
-                violatedDirective=ev.violatedDirective,
-                lineNumber=ev.lineNumber,
-                columnNumber=ev.columnNumber,
-            )
-        ),
-    )
+security_policy_violation_event_spec = spec_for(SecurityPolicyViolationEvent)
@@ -8,6 +8,8 @@ import dataclasses
 
 import reflex as rx
 
+from yaafc.events.spec_factory import spec_for
+
 
 # KeyboardEvent: https://developer.mozilla.org/en-US/docs/Web/API/KeyboardEvent
 @dataclasses.dataclass
@@ -75,17 +77,7 @@ class KeyDownEvent(KeyboardEvent):
     pass
 
 
-def key_down_event_spec(ev: rx.Var[KeyDownEvent]) -> tuple[rx.Var[KeyDownEvent]]:
-    """
-    Event spec function for KeyDownEvent.
-
-    Args:
-        ev (rx.Var[KeyDownEvent]): The KeyDownEvent variable.
-
-    Returns:
-        tuple[rx.Var[KeyDownEvent]]: A tuple containing the KeyDownEvent variable.
-    """
-    return (rx.Var.create(KeyDownEvent(**dataclasses.asdict(keyboard_event_spec(ev)[0].get()))),)
+key_down_event_spec = spec_for(KeyDownEvent)
 
 
 @dataclasses.dataclass
@@ -98,17 +90,7 @@ class KeyUpEvent(KeyboardEvent):
     pass
 
 
-def key_up_event_spec(ev: rx.Var[KeyUpEvent]) -> tuple[rx.Var[KeyUpEvent]]:
-    """
-    Event spec function for KeyUpEvent.
-
-    Args:
-        ev (rx.Var[KeyUpEvent]): The KeyUpEvent variable.
-
-    Returns:
-        tuple[rx.Var[KeyUpEvent]]: A tuple containing the KeyUpEvent variable.
-    """
-    return (rx.Var.create(KeyUpEvent(**dataclasses.asdict(keyboard_event_spec(ev)[0].get()))),)
+key_up_event_spec = spec_for(KeyUpEvent)
 
 
 # InputEvent: https://developer.mozilla.org/en-US/docs/Web/API/InputEvent
@@ -159,17 +141,7 @@ class BeforeInputEvent(InputEvent):
     pass
 
 
-def before_input_event_spec(ev: rx.Var[BeforeInputEvent]) -> tuple[rx.Var[BeforeInputEvent]]:
-    """
-    Event spec function for BeforeInputEvent.
-
-    Args:
-        ev (rx.Var[BeforeInputEvent]): The BeforeInputEvent variable.
-
-    Returns:
-        tuple[rx.Var[BeforeInputEvent]]: A tuple containing the BeforeInputEvent variable.
-    """
-    return (rx.Var.create(BeforeInputEvent(**dataclasses.asdict(input_event_spec(ev)[0].get()))),)
+before_input_event_spec = spec_for(BeforeInputEvent)
 
 
 # CompositionEvent: https://developer.mozilla.org/en-US/docs/Web/API/CompositionEvent
@@ -9,6 +9,8 @@ import dataclasses
 import reflex as rx
 from reflex.vars.object import ObjectVar
 
+from yaafc.events.spec_factory import spec_for
+
 
 @dataclasses.dataclass
 class MouseEvent:
@@ -109,26 +111,7 @@ class WheelEvent(MouseEvent):
     deltaMode: int = 0
 
 
-def wheel_event_spec(ev: rx.Var[WheelEvent]) -> tuple[rx.Var[WheelEvent]]:
-    """
-    Event spec for WheelEvent, used to extract event data for Reflex event handlers.
-
-    Args:
-        ev: The WheelEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of WheelEvent.
-    """
-    return (
-        rx.Var.create(
-            WheelEvent(
-                **dataclasses.asdict(mouse_event_spec(ev)[0].get()),
-                deltaX=ev.deltaX,
-                deltaY=ev.deltaY,
-                deltaZ=ev.deltaZ,
-                deltaMode=ev.deltaMode,
-            )
-        ),
-    )
+wheel_event_spec = spec_for(WheelEvent)
 
 
 @dataclasses.dataclass
@@ -161,32 +144,7 @@ class PointerEvent(MouseEvent):
     isPrimary: bool = True
 
 
-def pointer_event_spec(ev: rx.Var[PointerEvent]) -> tuple[rx.Var[PointerEvent]]:
-    """
-    Event spec for PointerEvent, used to extract event data for Reflex event handlers.
-
-    Args:
-        ev: The PointerEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of PointerEvent.
-    """
-    return (
-        rx.Var.create(
-            PointerEvent(
-                **dataclasses.asdict(mouse_event_spec(ev)[0].get()),
-                pointerId=ev.pointerId,
-                width=ev.width,
-                height=ev.height,
-                pressure=ev.pressure,
-                tangentialPressure=ev.tangentialPressure,
-                tiltX=ev.tiltX,
-                tiltY=ev.tiltY,
-                twist=ev.twist,
-                pointerType=ev.pointerType,
-                isPrimary=ev.isPrimary,
-            )
-        ),
-    )
+pointer_event_spec = spec_for(PointerEvent)
 
 
 @dataclasses.dataclass
@@ -201,18 +159,7 @@ class DragEvent(MouseEvent):
     dataTransfer: str = ""
 
 
-def drag_event_spec(ev: rx.Var[DragEvent]) -> tuple[rx.Var[DragEvent]]:
-    """
-    Event spec for DragEvent, used to extract event data for Reflex event handlers.
-
-    Args:
-        ev: The DragEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DragEvent.
-    """
-    return (
-        rx.Var.create(DragEvent(**dataclasses.asdict(mouse_event_spec(ev)[0].get()), dataTransfer=ev.dataTransfer)),
-    )
+drag_event_spec = spec_for(DragEvent)
 
 
 @dataclasses.dataclass
@@ -225,15 +172,7 @@ class DragEnterEvent(DragEvent):
     pass
 
 
-def drag_enter_event_spec(ev: rx.Var[DragEnterEvent]) -> tuple[rx.Var[DragEnterEvent]]:
-    """
-    Event spec for DragEnterEvent, used to extract event data for Reflex event handlers.
-    Args:
-        ev: The DragEnterEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DragEnterEvent.
-    """
-    return (rx.Var.create(DragEnterEvent(**dataclasses.asdict(drag_event_spec(ev)[0].get()))),)
+drag_enter_event_spec = spec_for(DragEnterEvent)
 
 
 @dataclasses.dataclass
@@ -246,15 +185,7 @@ class DragLeaveEvent(DragEvent):
     pass
 
 
-def drag_leave_event_spec(ev: rx.Var[DragLeaveEvent]) -> tuple[rx.Var[DragLeaveEvent]]:
-    """
-    Event spec for DragLeaveEvent, used to extract event data for Reflex event handlers.
-    Args:
-        ev: The DragLeaveEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DragLeaveEvent.
-    """
-    return (rx.Var.create(DragLeaveEvent(**dataclasses.asdict(drag_event_spec(ev)[0].get()))),)
+drag_leave_event_spec = spec_for(DragLeaveEvent)
 
 
 @dataclasses.dataclass
@@ -267,15 +198,7 @@ class DragOverEvent(DragEvent):
     pass
 
 
-def drag_over_event_spec(ev: rx.Var[DragOverEvent]) -> tuple[rx.Var[DragOverEvent]]:
-    """
-    Event spec for DragOverEvent, used to extract event data for Reflex event handlers.
-    Args:
-        ev: The DragOverEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DragOverEvent.
-    """
-    return (rx.Var.create(DragOverEvent(**dataclasses.asdict(drag_event_spec(ev)[0].get()))),)
+drag_over_event_spec = spec_for(DragOverEvent)
 
 
 @dataclasses.dataclass
@@ -288,15 +211,7 @@ class DragStartEvent(DragEvent):
     pass
 
 
-def drag_start_event_spec(ev: rx.Var[DragStartEvent]) -> tuple[rx.Var[DragStartEvent]]:
-    """
-    Event spec for DragStartEvent, used to extract event data for Reflex event handlers.
-    Args:
-        ev: The DragStartEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DragStartEvent.
-    """
-    return (rx.Var.create(DragStartEvent(**dataclasses.asdict(drag_event_spec(ev)[0].get()))),)
+drag_start_event_spec = spec_for(DragStartEvent)
 
 
 @dataclasses.dataclass
@@ -309,15 +224,7 @@ class DragEndEvent(DragEvent):
     pass
 
 
-def drag_end_event_spec(ev: rx.Var[DragEndEvent]) -> tuple[rx.Var[DragEndEvent]]:
-    """
-    Event spec for DragEndEvent, used to extract event data for Reflex event handlers.
-    Args:
-        ev: The DragEndEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DragEndEvent.
-    """
-    return (rx.Var.create(DragEndEvent(**dataclasses.asdict(drag_event_spec(ev)[0].get()))),)
+drag_end_event_spec = spec_for(DragEndEvent)
 
 
 @dataclasses.dataclass
@@ -330,15 +237,7 @@ class DropEvent(DragEvent):
     pass
 
 
-def drop_event_spec(ev: rx.Var[DropEvent]) -> tuple[rx.Var[DropEvent]]:
-    """
-    Event spec for DropEvent, used to extract event data for Reflex event handlers.
-    Args:
-        ev: The DropEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DropEvent.
-    """
-    return (rx.Var.create(DropEvent(**dataclasses.asdict(drag_event_spec(ev)[0].get()))),)
+drop_event_spec = spec_for(DropEvent)
 
 
 @dataclasses.dataclass
@@ -351,12 +250,4 @@ class DoubleClickEvent(MouseEvent):
     pass
 
 
-def double_click_event_spec(ev: rx.Var[DoubleClickEvent]) -> tuple[rx.Var[DoubleClickEvent]]:
-    """
-    Event spec for DoubleClickEvent, used to extract event data for Reflex event handlers.
-    Args:
-        ev: The DoubleClickEvent variable from the event system.
-    Returns:
-        A tuple containing a Reflex Var of DoubleClickEvent.
-    """
-    return (rx.Var.create(DoubleClickEvent(**dataclasses.asdict(mouse_event_spec(ev)[0].get()))),)
+double_click_event_spec = spec_for(DoubleClickEvent)
@@ -8,6 +8,8 @@ import dataclasses
 
 import reflex as rx
 
+from yaafc.events.spec_factory import spec_for
+
 
 @dataclasses.dataclass
 class PointerEvent:
@@ -131,17 +133,7 @@ class GotPointerCaptureEvent(PointerEvent):
     pass
 
 
-def got_pointer_capture_event_spec(ev: rx.Var[GotPointerCaptureEvent]) -> tuple[rx.Var[GotPointerCaptureEvent]]:
-    """
-    Creates a specification for a GotPointerCaptureEvent.
-
-    Args:
-        ev (rx.Var[GotPointerCaptureEvent]): The GotPointerCaptureEvent variable.
-
-    Returns:
-        tuple[rx.Var[GotPointerCaptureEvent]]: A tuple containing the GotPointerCaptureEvent variable.
-    """
-    return (rx.Var.create(GotPointerCaptureEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+got_pointer_capture_event_spec = spec_for(GotPointerCaptureEvent)
 
 
 @dataclasses.dataclass
@@ -154,17 +146,7 @@ class LostPointerCaptureEvent(PointerEvent):
     pass
 
 
-def lost_pointer_capture_event_spec(ev: rx.Var[LostPointerCaptureEvent]) -> tuple[rx.Var[LostPointerCaptureEvent]]:
-    """
-    Creates a specification for a LostPointerCaptureEvent.
-
-    Args:
-        ev (rx.Var[LostPointerCaptureEvent]): The LostPointerCaptureEvent variable.
-
-    Returns:
-        tuple[rx.Var[LostPointerCaptureEvent]]: A tuple containing the LostPointerCaptureEvent variable.
-    """
-    return (rx.Var.create(LostPointerCaptureEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+lost_pointer_capture_event_spec = spec_for(LostPointerCaptureEvent)
 
 
 @dataclasses.dataclass
@@ -177,17 +159,7 @@ class PointerCancelEvent(PointerEvent):
     pass
 
 
-def pointer_cancel_event_spec(ev: rx.Var[PointerCancelEvent]) -> tuple[rx.Var[PointerCancelEvent]]:
-    """
-    Creates a specification for a PointerCancelEvent.
-
-    Args:
-        ev (rx.Var[PointerCancelEvent]): The PointerCancelEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerCancelEvent]]: A tuple containing the PointerCancelEvent variable.
-    """
-    return (rx.Var.create(PointerCancelEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_cancel_event_spec = spec_for(PointerCancelEvent)
 
 
 @dataclasses.dataclass
@@ -200,17 +172,7 @@ class PointerDownEvent(PointerEvent):
     pass
 
 
-def pointer_down_event_spec(ev: rx.Var[PointerDownEvent]) -> tuple[rx.Var[PointerDownEvent]]:
-    """
-    Creates a specification for a PointerDownEvent.
-
-    Args:
-        ev (rx.Var[PointerDownEvent]): The PointerDownEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerDownEvent]]: A tuple containing the PointerDownEvent variable.
-    """
-    return (rx.Var.create(PointerDownEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_down_event_spec = spec_for(PointerDownEvent)
 
 
 @dataclasses.dataclass
@@ -223,17 +185,7 @@ class PointerEnterEvent(PointerEvent):
     pass
 
 
-def pointer_enter_event_spec(ev: rx.Var[PointerEnterEvent]) -> tuple[rx.Var[PointerEnterEvent]]:
-    """
-    Creates a specification for a PointerEnterEvent.
-
-    Args:
-        ev (rx.Var[PointerEnterEvent]): The PointerEnterEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerEnterEvent]]: A tuple containing the PointerEnterEvent variable.
-    """
-    return (rx.Var.create(PointerEnterEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_enter_event_spec = spec_for(PointerEnterEvent)
 
 
 @dataclasses.dataclass
@@ -246,17 +198,7 @@ class PointerLeaveEvent(PointerEvent):
     pass
 
 
-def pointer_leave_event_spec(ev: rx.Var[PointerLeaveEvent]) -> tuple[rx.Var[PointerLeaveEvent]]:
-    """
-    Creates a specification for a PointerLeaveEvent.
-
-    Args:
-        ev (rx.Var[PointerLeaveEvent]): The PointerLeaveEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerLeaveEvent]]: A tuple containing the PointerLeaveEvent variable.
-    """
-    return (rx.Var.create(PointerLeaveEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_leave_event_spec = spec_for(PointerLeaveEvent)
 
 
 @dataclasses.dataclass
@@ -269,17 +211,7 @@ class PointerMoveEvent(PointerEvent):
     pass
 
 
-def pointer_move_event_spec(ev: rx.Var[PointerMoveEvent]) -> tuple[rx.Var[PointerMoveEvent]]:
-    """
-    Creates a specification for a PointerMoveEvent.
-
-    Args:
-        ev (rx.Var[PointerMoveEvent]): The PointerMoveEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerMoveEvent]]: A tuple containing the PointerMoveEvent variable.
-    """
-    return (rx.Var.create(PointerMoveEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_move_event_spec = spec_for(PointerMoveEvent)
 
 
 @dataclasses.dataclass
@@ -292,17 +224,7 @@ class PointerOutEvent(PointerEvent):
     pass
 
 
-def pointer_out_event_spec(ev: rx.Var[PointerOutEvent]) -> tuple[rx.Var[PointerOutEvent]]:
-    """
-    Creates a specification for a PointerOutEvent.
-
-    Args:
-        ev (rx.Var[PointerOutEvent]): The PointerOutEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerOutEvent]]: A tuple containing the PointerOutEvent variable.
-    """
-    return (rx.Var.create(PointerOutEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_out_event_spec = spec_for(PointerOutEvent)
 
 
 @dataclasses.dataclass
@@ -315,17 +237,7 @@ class PointerOverEvent(PointerEvent):
     pass
 
 
-def pointer_over_event_spec(ev: rx.Var[PointerOverEvent]) -> tuple[rx.Var[PointerOverEvent]]:
-    """
-    Creates a specification for a PointerOverEvent.
-
-    Args:
-        ev (rx.Var[PointerOverEvent]): The PointerOverEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerOverEvent]]: A tuple containing the PointerOverEvent variable.
-    """
-    return (rx.Var.create(PointerOverEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_over_event_spec = spec_for(PointerOverEvent)
 
 
 @dataclasses.dataclass
@@ -338,14 +250,4 @@ class PointerUpEvent(PointerEvent):
     pass
 
 
-def pointer_up_event_spec(ev: rx.Var[PointerUpEvent]) -> tuple[rx.Var[PointerUpEvent]]:
-    """
-    Creates a specification for a PointerUpEvent.
-
-    Args:
-        ev (rx.Var[PointerUpEvent]): The PointerUpEvent variable.
-
-    Returns:
-        tuple[rx.Var[PointerUpEvent]]: A tuple containing the PointerUpEvent variable.
-    """
-    return (rx.Var.create(PointerUpEvent(**dataclasses.asdict(pointer_event_spec(ev)[0].get()))),)
+pointer_up_event_spec = spec_for(PointerUpEvent)
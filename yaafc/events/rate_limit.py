@@ -0,0 +1,204 @@
+"""
+Client-side rate limits for high-frequency event handlers.
+
+Pointer moves, wheel turns, scrolling and dragging fire 60 to 120 times per second. Sent as they are, each of
+them is a websocket round trip and a state update on the server. A rate limit holds the events back in the
+browser and only delivers the latest one, optionally with numeric fields summed over the events it replaces, e.g.
+the ``deltaY`` of wheel events or the ``movementX`` of pointer moves.
+
+Rate limits are declared next to the handler they apply to:
+
+    enhanced_event_watcher(
+        on_pointer_move=per_frame(State.track_pointer, sum_fields=("movementX", "movementY")),
+        on_wheel=throttle(State.zoom, 100, sum_fields=("deltaY",)),
+        on_scroll=debounce(State.scrolled, 150),
+    )
+
+Modes:
+
+- ``throttle``: at most one delivery per ``wait_ms``, the first event of a burst at once and the latest at its end
+- ``debounce``: one delivery ``wait_ms`` after the last event of a burst
+- ``frame``: at most one delivery per animation frame
+- ``batch``: every event of a ``wait_ms`` window, delivered as one list, see ``yaafc.events.batching``
+- ``none``: every event is delivered
+
+``preventDefault`` and ``stopPropagation`` of a handler are still applied to every event when it happens, so e.g.
+rate limited ``on_drag_over`` handlers keep allowing drops.
+"""
+
+import dataclasses
+import itertools
+import json
+from typing import Any, Literal
+
+from reflex.constants.compiler import Hooks, Imports
+from reflex.event import EventChain
+from reflex.vars import FunctionStringVar, VarData
+
+RateLimitMode = Literal["throttle", "debounce", "frame", "batch", "none"]
+
+RATE_LIMIT_JS = """
+// held back events by binding key, one slot per element the events happen on, e.g. per row rendered by a foreach
+const rateLimitedEvents = new Map();
+
+const rateLimitEvents = (key, limit, addEvents) => (events, args, eventActions) => {
+  const _events = events.filter((e) => e !== undefined && e !== null);
+  const _args = args instanceof Array ? args : [args];
+  const actions = _events.reduce((acc, e) => ({ ...acc, ...e.event_actions }), eventActions ?? {});
+  const _e = _args.filter((o) => o?.preventDefault !== undefined)[0];
+  if (actions.preventDefault && _e?.preventDefault) _e.preventDefault();
+  if (actions.stopPropagation && _e?.stopPropagation) _e.stopPropagation();
+
+  let slots = rateLimitedEvents.get(key);
+  if (slots === undefined) {
+    slots = { elements: new WeakMap(), shared: undefined };
+    rateLimitedEvents.set(key, slots);
+  }
+  // triggers called without an event, e.g. from a custom component, share the slot of their binding
+  const element = _e?.currentTarget ?? _e?.target ?? null;
+  let pending = element instanceof Object ? slots.elements.get(element) : slots.shared;
+  if (pending === undefined) {
+    pending = { events: null, sums: {}, batch: {}, timer: null, frame: null, delivered: 0 };
+    if (element instanceof Object) slots.elements.set(element, pending);
+    else slots.shared = pending;
+  }
+  // numeric fields of the event payloads are summed over the events held back, batches keep all of them
+  for (const event of _events) {
+    if (limit.mode === "batch") {
+      for (const [arg, value] of Object.entries(event.payload ?? {})) (pending.batch[arg] ??= []).push(value);
+      continue;
+    }
+    for (const value of Object.values(event.payload ?? {})) {
+      if (value === null || typeof value !== "object") continue;
+      for (const field of limit.sum) {
+        if (typeof value[field] === "number") pending.sums[field] = (pending.sums[field] ?? 0) + value[field];
+      }
+    }
+  }
+  pending.events = _events;
+  pending.args = _args;
+  pending.actions = eventActions;
+  pending.addEvents = addEvents;
+
+  const deliver = () => {
+    const { events: latest, sums, batch } = pending;
+    clearTimeout(pending.timer);
+    pending.timer = null;
+    pending.frame = null;
+    pending.delivered = Date.now();
+    pending.events = null;
+    pending.sums = {};
+    pending.batch = {};
+    if (latest === null) return;
+    for (const event of latest) {
+      for (const value of Object.values(event.payload ?? {})) {
+        if (value !== null && typeof value === "object") Object.assign(value, sums);
+      }
+      if (limit.mode === "batch") event.payload = { ...event.payload, ...batch };
+    }
+    pending.addEvents(latest, pending.args, pending.actions);
+  };
+
+  if (limit.mode === "frame") {
+    if (pending.frame === null) pending.frame = requestAnimationFrame(deliver);
+  } else if (limit.mode === "batch") {
+    // the window opens with the first event of a burst, a full batch is delivered at once
+    const size = Math.max(0, ...Object.values(pending.batch).map((values) => values.length));
+    if (limit.max > 0 && size >= limit.max) deliver();
+    else if (pending.timer === null) pending.timer = setTimeout(deliver, limit.wait);
+  } else if (limit.mode === "debounce") {
+    clearTimeout(pending.timer);
+    pending.timer = setTimeout(deliver, limit.wait);
+  } else if (pending.timer === null) {
+    // throttle: the first event of a burst at once, the latest one at the end of the interval
+    const remaining = limit.wait - (Date.now() - pending.delivered);
+    if (remaining <= 0) deliver();
+    else pending.timer = setTimeout(deliver, remaining);
+  }
+};
+"""
+
+# distinguishes the held back events of every bound trigger in the browser; the instances a binding is rendered
+# as, e.g. by rx.foreach, are told apart by the element their events happen on
+_bindings = itertools.count()
+
+
+@dataclasses.dataclass(frozen=True)
+class RateLimit:
+    """
+    How often the events of a trigger reach the backend.
+
+    Attributes:
+        mode (RateLimitMode): One of ``throttle``, ``debounce``, ``frame``, ``batch`` and ``none``, see the module
+            documentation
+        wait_ms (int): Milliseconds between deliveries for ``throttle``, of quiet for ``debounce``, or the window
+            of a ``batch``
+        sum_fields (tuple[str, ...]): Numeric payload fields summed over the events held back
+        max_events (int): Size of a ``batch`` delivered before its window ends, unlimited if 0
+    """
+
+    mode: RateLimitMode
+    wait_ms: int = 0
+    sum_fields: tuple[str, ...] = ()
+    max_events: int = 0
+
+    def bind(self, chain: EventChain, trigger: str) -> EventChain:
+        """
+        Routes the events of a trigger's event chain through the rate limit.
+
+        Every element the chain is rendered on holds back its own events, so the rows of an ``rx.foreach`` sharing
+        one binding do not replace each other's events.
+
+        Args:
+            chain (EventChain): The event chain of the trigger.
+            trigger (str): Name of the trigger, e.g. ``on_pointer_move``.
+
+        Returns:
+            EventChain: The chain delivering its events through the rate limit, the chain itself for ``none``.
+        """
+        if self.mode == "none":
+            return chain
+        options = {"mode": self.mode, "wait": self.wait_ms, "sum": list(self.sum_fields)}
+        if self.max_events:
+            options["max"] = self.max_events
+        limit = json.dumps(options)
+        key = json.dumps(f"{trigger}-{next(_bindings)}")
+        invocation: FunctionStringVar[Any] = FunctionStringVar.create(
+            f"rateLimitEvents({key}, {limit}, addEvents)",
+            _var_data=VarData(imports=Imports.EVENTS, hooks={Hooks.EVENTS: None}),
+        )
+        return dataclasses.replace(chain, invocation=invocation)
+
+
+@dataclasses.dataclass(frozen=True)
+class RateLimited:
+    """
+    An event handler declared together with its rate limit.
+
+    Attributes:
+        handler (Any): The handler, anything an event trigger accepts
+        limit (RateLimit): The rate limit
+    """
+
+    handler: Any
+    limit: RateLimit
+
+
+def throttle(handler: Any, wait_ms: int, sum_fields: tuple[str, ...] = ()) -> RateLimited:
+    """Delivers at most one event per ``wait_ms``, the latest one of each interval."""
+    return RateLimited(handler, RateLimit("throttle", wait_ms, tuple(sum_fields)))
+
+
+def debounce(handler: Any, wait_ms: int, sum_fields: tuple[str, ...] = ()) -> RateLimited:
+    """Delivers the last event of a burst once no event came for ``wait_ms``."""
+    return RateLimited(handler, RateLimit("debounce", wait_ms, tuple(sum_fields)))
+
+
+def per_frame(handler: Any, sum_fields: tuple[str, ...] = ()) -> RateLimited:
+    """Delivers at most one event per animation frame, the latest one."""
+    return RateLimited(handler, RateLimit("frame", 0, tuple(sum_fields)))
+
+
+def every_event(handler: Any) -> RateLimited:
+    """Delivers every event, overriding the default rate limit of a trigger."""
+    return RateLimited(handler, RateLimit("none"))
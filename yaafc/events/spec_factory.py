@@ -0,0 +1,246 @@
+"""
+Event specs sending only the event fields a handler reads.
+
+The spec functions of this package extract every field of their event dataclass, e.g. 18 for a ``MouseEvent``, and
+every event carries all of them to the backend. A handler reading only ``event.altKey`` needs one. The factory
+builds specs for a subset of the fields of an event dataclass, and can infer the subset from the handler itself:
+the handler's bytecode is scanned for the attributes read from its event parameter. Fields not sent keep the
+defaults of the dataclass.
+
+Inference gives up, and the full spec is used, whenever the event parameter is used for anything but reading
+attributes, e.g. passed on to another function or captured by a nested function.
+
+The factory is also the registry of the spec functions of derived event classes: ``spec_for(CopyEvent)`` is
+generated from the dataclass on first use and the same function is returned for every later call with the same
+class and fields. The payload a spec function extracts is memoized as well, Reflex calls spec functions once per
+bound trigger of every compiled component.
+"""
+
+import dataclasses
+import dis
+import functools
+import inspect
+import typing
+from collections.abc import Callable, Iterable
+from typing import Any, cast
+
+import reflex as rx
+from reflex.event import EventHandler
+from reflex.vars.object import LiteralObjectVar, ObjectVar
+
+# opcodes loading a local variable onto the stack
+_LOAD_LOCAL = frozenset({"LOAD_FAST", "LOAD_FAST_CHECK", "LOAD_FAST_AND_CLEAR"})
+
+
+class UnknownEventFieldsError(ValueError):
+    def __init__(self, event_class: type, unknown: Iterable[str]):
+        super().__init__(f"{event_class.__name__} has no fields {sorted(unknown)}")
+
+
+def event_payload(ev: rx.Var, event_class: type, fields: Iterable[str] | None = None) -> tuple[rx.Var]:
+    """
+    Extracts fields of a DOM event, for use in the body of a spec function.
+
+    Args:
+        ev (rx.Var): The DOM event.
+        event_class (type): The event dataclass; its field names are the DOM event properties extracted.
+        fields (Iterable[str] | None): The fields to extract, all fields of ``event_class`` if None.
+
+    Returns:
+        tuple[rx.Var]: A tuple containing the payload, typed as ``event_class``.
+
+    Raises:
+        ValueError: If a field is not a field of ``event_class``.
+    """
+    names = _field_names(event_class, fields)
+    if ev._get_all_var_data() is None:
+        # the usual argument, a bare JavaScript name such as ``_e``
+        return (_payload(event_class, names, ev._js_expr),)
+    return (_build_payload(ev, event_class, names),)
+
+
+def spec_for(event_class: type, fields: Iterable[str] | None = None) -> Callable[[rx.Var], tuple[rx.Var]]:
+    """
+    Returns the spec function extracting fields of an event dataclass, generating it on first use.
+
+    Args:
+        event_class (type): The event dataclass.
+        fields (Iterable[str] | None): The fields sent to the backend, all fields if None.
+
+    Returns:
+        Callable[[rx.Var], tuple[rx.Var]]: The spec function, usable wherever the spec functions of this package are.
+
+    Raises:
+        ValueError: If a field is not a field of ``event_class``.
+    """
+    return _generated_spec(event_class, _field_names(event_class, fields))
+
+
+@functools.cache
+def spec_event_class(spec: Callable[..., Any]) -> type | None:
+    """The event dataclass a spec function produces, None if its annotations do not name one."""
+    try:
+        returned = typing.get_type_hints(spec).get("return")
+    except (NameError, TypeError):
+        return None
+    for var_type in typing.get_args(returned):
+        event_class = next(iter(typing.get_args(var_type)), None)
+        if isinstance(event_class, type) and dataclasses.is_dataclass(event_class):
+            return event_class
+    return None
+
+
+def read_fields(function: Callable[..., Any], parameter: str) -> frozenset[str] | None:
+    """
+    Finds the attributes a function reads from one of its parameters.
+
+    Args:
+        function (Callable[..., Any]): The function.
+        parameter (str): Name of the parameter.
+
+    Returns:
+        frozenset[str] | None: The attribute names, None if the parameter is used in any other way.
+    """
+    instructions = _instructions(function, parameter)
+    return None if instructions is None else _attributes_read(instructions, parameter)
+
+
+def read_item_fields(function: Callable[..., Any], parameter: str) -> frozenset[str] | None:
+    """
+    Finds the attributes a function reads from the items of one of its parameters, e.g. a batch of events.
+
+    Args:
+        function (Callable[..., Any]): The function.
+        parameter (str): Name of the parameter.
+
+    Returns:
+        frozenset[str] | None: The attribute names, None if the parameter is used for anything but ``for`` loops and
+            comprehensions, or their items for anything but reading attributes.
+    """
+    instructions = _instructions(function, parameter)
+    if instructions is None:
+        return None
+    code = inspect.unwrap(function).__code__
+    # loop variables assigned anywhere else than by their loop hold something else than items
+    excluded = {*code.co_varnames[: code.co_argcount + code.co_kwonlyargcount], *code.co_cellvars}
+    items = set()
+    for index, instruction in enumerate(instructions):
+        if not _refers_to(instruction, parameter):
+            continue
+        if instruction.opname not in _LOAD_LOCAL or _opname(instructions, index + 1) != "GET_ITER":
+            return None
+        # the loop over the iterator, after the set-up of a comprehension inlined into the function
+        loop = next((at for at in range(index + 2, len(instructions)) if instructions[at].opname == "FOR_ITER"), None)
+        if loop is None or _opname(instructions, loop + 1) != "STORE_FAST":
+            return None
+        items.add(instructions[loop + 1].argval)
+    fields: set[str] = set()
+    for item in items:
+        read = _attributes_read(instructions, item, loop_variable=True)
+        if read is None or item in excluded:
+            return None
+        fields |= read
+    return frozenset(fields)
+
+
+def selective_spec(handler: EventHandler, spec: Callable[..., Any], batched: bool = False) -> Callable[..., Any]:
+    """
+    Narrows the spec of an event trigger to the fields its handler reads.
+
+    Args:
+        handler (EventHandler): The handler bound to the trigger.
+        spec (Callable[..., Any]): The spec of the trigger.
+        batched (bool): Whether the handler takes lists of events, see ``yaafc.events.batching``.
+
+    Returns:
+        Callable[..., Any]: A spec sending only the fields read, ``spec`` itself if they cannot be inferred.
+    """
+    event_class = spec_event_class(spec)
+    parameters = list(inspect.signature(handler.fn).parameters)
+    # the first parameter is the state
+    if event_class is None or len(parameters) != 2:
+        return spec
+    fields = (read_item_fields if batched else read_fields)(handler.fn, parameters[1])
+    names = {field.name for field in dataclasses.fields(event_class)}
+    if fields is None or not fields <= names:
+        return spec
+    return spec_for(event_class, fields)
+
+
+def _instructions(function: Callable[..., Any], parameter: str) -> list[dis.Instruction] | None:
+    # None if the parameter is captured by a nested function, which the bytecode of the function does not show
+    code = getattr(inspect.unwrap(function), "__code__", None)
+    if code is None or parameter in code.co_cellvars:
+        return None
+    return list(dis.get_instructions(code))
+
+
+def _attributes_read(
+    instructions: list[dis.Instruction], name: str, loop_variable: bool = False
+) -> frozenset[str] | None:
+    fields = set()
+    for index, instruction in enumerate(instructions):
+        if not _refers_to(instruction, name):
+            continue
+        previous = _opname(instructions, index - 1)
+        # a loop variable is assigned by its loop, a comprehension also saves and restores it around the loop
+        if loop_variable and (
+            instruction.opname == "LOAD_FAST_AND_CLEAR"
+            or (instruction.opname == "STORE_FAST" and previous in {"FOR_ITER", "SWAP"})
+        ):
+            continue
+        if instruction.opname not in _LOAD_LOCAL or _opname(instructions, index + 1) != "LOAD_ATTR":
+            return None
+        fields.add(instructions[index + 1].argval)
+    return frozenset(fields)
+
+
+def _refers_to(instruction: dis.Instruction, name: str) -> bool:
+    # superinstructions such as LOAD_FAST_LOAD_FAST name two variables
+    return instruction.argval == name or (isinstance(instruction.argval, tuple) and name in instruction.argval)
+
+
+def _opname(instructions: list[dis.Instruction], index: int) -> str | None:
+    return instructions[index].opname if 0 <= index < len(instructions) else None
+
+
+@functools.cache
+def _generated_spec(event_class: type, selected: tuple[str, ...]) -> Callable[[rx.Var], tuple[rx.Var]]:
+    def spec(ev: rx.Var) -> tuple[rx.Var]:
+        return event_payload(ev, event_class, selected)
+
+    # Reflex checks handler arguments against the annotations of the spec, which are generated at runtime
+    spec.__annotations__ = {
+        "ev": ObjectVar[event_class],  # type: ignore[valid-type]
+        "return": tuple[rx.Var[event_class]],  # type: ignore[valid-type]
+    }
+    spec.__name__ = spec.__qualname__ = f"{_snake_case(event_class.__name__)}_spec"
+    spec.__module__ = event_class.__module__
+    spec.__doc__ = f"Creates a specification for a {event_class.__name__}."
+    return spec
+
+
+@functools.cache
+def _payload(event_class: type, names: tuple[str, ...], expression: str) -> rx.Var:
+    return _build_payload(rx.Var(expression), event_class, names)
+
+
+def _build_payload(ev: rx.Var, event_class: type, names: tuple[str, ...]) -> rx.Var:
+    event = ev if isinstance(ev, ObjectVar) else cast(ObjectVar, ev.to(ObjectVar, event_class))
+    return LiteralObjectVar.create({name: getattr(event, name) for name in names}, _var_type=event_class)
+
+
+def _field_names(event_class: type, fields: Iterable[str] | None) -> tuple[str, ...]:
+    # selected fields in the order of the dataclass
+    names = tuple(field.name for field in dataclasses.fields(event_class))
+    if fields is None:
+        return names
+    selected = set(fields)
+    unknown = selected - set(names)
+    if unknown:
+        raise UnknownEventFieldsError(event_class, unknown)
+    return tuple(name for name in names if name in selected)
+
+
+def _snake_case(name: str) -> str:
+    return "".join(f"_{character.lower()}" if character.isupper() else character for character in name).lstrip("_")
@@ -8,6 +8,8 @@ import dataclasses
 
 import reflex as rx
 
+from yaafc.events.spec_factory import spec_for
+
 
 @dataclasses.dataclass
 class UIEvent:
@@ -47,17 +49,7 @@ class ScrollEvent(UIEvent):
     pass
 
 
-def scroll_event_spec(ev: rx.Var[ScrollEvent]) -> tuple[rx.Var[ScrollEvent]]:
-    """
-    Event spec function for ScrollEvent.
-
-    Args:
-        ev (rx.Var[ScrollEvent]): The ScrollEvent variable.
-
-    Returns:
-        tuple[rx.Var[ScrollEvent]]: A tuple containing the processed ScrollEvent variable.
-    """
-    return (rx.Var.create(ScrollEvent(**dataclasses.asdict(ui_event_spec(ev)[0].get()))),)
+scroll_event_spec = spec_for(ScrollEvent)
 
 
 @dataclasses.dataclass
@@ -71,14 +63,4 @@ class ScrollEndEvent(UIEvent):
     pass
 
 
-def scroll_end_event_spec(ev: rx.Var[ScrollEndEvent]) -> tuple[rx.Var[ScrollEndEvent]]:
-    """
-    Event spec function for ScrollEndEvent.
-
-    Args:
-        ev (rx.Var[ScrollEndEvent]): The ScrollEndEvent variable.
-
-    Returns:
-        tuple[rx.Var[ScrollEndEvent]]: A tuple containing the processed ScrollEndEvent variable.
-    """
-    return (rx.Var.create(ScrollEndEvent(**dataclasses.asdict(ui_event_spec(ev)[0].get()))),)
+scroll_end_event_spec = spec_for(ScrollEndEvent)
@@ -0,0 +1,72 @@
+"""
+File system access for the file panels: directory scanning, listing models, file operations, search and previews.
+"""
+
+from .cache import ListingCache, listing_cache
+from .columns import COLUMN_PROVIDERS, ColumnProvider, column_provider, required_fields
+from .dirsize import DirectorySizeCalculator, directory_sizes
+from .grep import ContentMatch, ContentSearcher, content_searcher
+from .job_plan import Step
+from .jobs import FileJob, JobEngine, JobError, JobProgress, job_engine
+from .listing import LISTING_SCHEMA, DirectoryListing, ListingDelta
+from .preview import PreviewService, TextPreview, preview_service
+from .query import (
+    DateFilter,
+    GlobFilter,
+    InvalidFilterError,
+    ListingFilter,
+    ListingQuery,
+    RegexFilter,
+    SizeFilter,
+    SortKey,
+    parse_filter,
+)
+from .scanner import ALL_FIELDS, DEFAULT_FIELDS, ScanResult, scan_directory, stat_entries
+from .search import FilenameIndex, filename_index
+from .transfer import TransferCancelled, copy_file
+from .watcher import DirectoryWatcher
+
+__all__ = [
+    "ALL_FIELDS",
+    "COLUMN_PROVIDERS",
+    "DEFAULT_FIELDS",
+    "LISTING_SCHEMA",
+    "ColumnProvider",
+    "ContentMatch",
+    "ContentSearcher",
+    "DateFilter",
+    "DirectoryListing",
+    "DirectorySizeCalculator",
+    "DirectoryWatcher",
+    "FileJob",
+    "FilenameIndex",
+    "GlobFilter",
+    "InvalidFilterError",
+    "JobEngine",
+    "JobError",
+    "JobProgress",
+    "ListingCache",
+    "ListingDelta",
+    "ListingFilter",
+    "ListingQuery",
+    "PreviewService",
+    "RegexFilter",
+    "ScanResult",
+    "SizeFilter",
+    "SortKey",
+    "Step",
+    "TextPreview",
+    "TransferCancelled",
+    "column_provider",
+    "content_searcher",
+    "copy_file",
+    "directory_sizes",
+    "filename_index",
+    "job_engine",
+    "listing_cache",
+    "parse_filter",
+    "preview_service",
+    "required_fields",
+    "scan_directory",
+    "stat_entries",
+]
@@ -0,0 +1,176 @@
+"""
+Process-wide cache of directory listings shared by all client sessions.
+
+Listings are immutable snapshots, so every session opening the same directory can reuse one instance. An entry is
+valid while the directory's inode and modification time are unchanged, it is younger than the TTL and it holds
+all raw data fields the caller asks for; the TTL bounds staleness for changes that do not touch the directory
+itself, e.g. a file growing in place.
+"""
+
+import dataclasses
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from yaafc.filesystem.listing import DirectoryListing
+from yaafc.filesystem.scanner import DEFAULT_FIELDS
+
+
+@dataclasses.dataclass(frozen=True)
+class _CacheEntry:
+    mtime_ns: int
+    inode: int
+    created: float
+    listing: DirectoryListing
+
+
+class ListingCache:
+    """
+    Size-bounded LRU cache of directory listings keyed by (path, mtime, inode, fields).
+
+    One listing is kept per directory. A request for fields the cached listing lacks rescans the directory with
+    the union of both field sets, so sessions showing different columns keep sharing one snapshot.
+
+    Attributes:
+        max_entries (int): Maximum number of cached directories
+        ttl (float): Seconds after which a cached listing is rescanned even if the directory looks unchanged
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that required a scan
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 10.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._scan_locks: dict[str, threading.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configure(self, max_entries: int | None = None, ttl: float | None = None) -> None:
+        """
+        Changes the cache limits, evicting entries if the cache shrinks.
+
+        Args:
+            max_entries (int | None): New maximum number of cached directories.
+            ttl (float | None): New time-to-live in seconds.
+        """
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl is not None:
+                self.ttl = ttl
+            self._evict()
+
+    def get(self, path: str, fields: frozenset[str] = DEFAULT_FIELDS) -> DirectoryListing:
+        """
+        Returns the listing of a directory, scanning it only if no valid snapshot is cached.
+
+        Concurrent misses for the same directory are collapsed into a single scan.
+
+        Args:
+            path (str): The directory to list.
+            fields (frozenset[str]): The raw data fields the listing must hold.
+
+        Returns:
+            DirectoryListing: The shared snapshot of the directory.
+
+        Raises:
+            OSError: If the directory cannot be stat'ed or scanned.
+        """
+        stat_result = os.stat(path)
+        listing = self._lookup(path, stat_result, fields)
+        if listing is not None:
+            return listing
+        with self._lock:
+            scan_lock = self._scan_locks.setdefault(path, threading.Lock())
+        with scan_lock:
+            # another session may have scanned the directory while we waited
+            listing = self._lookup(path, stat_result, fields, count=False)
+            if listing is not None:
+                return listing
+            with self._lock:
+                cached = self._entries.get(path)
+            if cached is not None:
+                fields = fields | cached.listing.fields
+            listing = DirectoryListing.scan(path, fields)
+            self._store(path, stat_result, listing)
+        return listing
+
+    def put(self, listing: DirectoryListing) -> None:
+        """
+        Publishes a listing that was updated elsewhere, e.g. by a directory watcher.
+
+        Args:
+            listing (DirectoryListing): The up-to-date snapshot.
+        """
+        try:
+            stat_result = os.stat(listing.path)
+        except OSError:
+            self.invalidate(listing.path)
+            return
+        self._store(listing.path, stat_result, listing)
+
+    def invalidate(self, path: str | None = None) -> None:
+        """
+        Drops one cached directory, or all of them.
+
+        Args:
+            path (str | None): The directory to drop, None to clear the cache.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def stats(self) -> dict[str, int | float]:
+        """Hit and miss counters, hit ratio and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _lookup(
+        self, path: str, stat_result: os.stat_result, fields: frozenset[str], count: bool = True
+    ) -> DirectoryListing | None:
+        with self._lock:
+            entry = self._entries.get(path)
+            valid = (
+                entry is not None
+                and fields <= entry.listing.fields
+                and entry.mtime_ns == stat_result.st_mtime_ns
+                and entry.inode == stat_result.st_ino
+                and time.monotonic() - entry.created < self.ttl
+            )
+            if count:
+                if valid:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if not valid or entry is None:
+                return None
+            self._entries.move_to_end(path)
+            return entry.listing
+
+    def _store(self, path: str, stat_result: os.stat_result, listing: DirectoryListing) -> None:
+        with self._lock:
+            self._entries[path] = _CacheEntry(stat_result.st_mtime_ns, stat_result.st_ino, time.monotonic(), listing)
+            self._entries.move_to_end(path)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            path, _ = self._entries.popitem(last=False)
+            self._scan_locks.pop(path, None)
+
+
+listing_cache = ListingCache()
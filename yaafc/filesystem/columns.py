@@ -0,0 +1,133 @@
+"""
+Registry of the columns a file list can display.
+
+Each column provider declares the raw data fields it needs from a scan and formats a window of listing rows
+into its display strings. Scans only collect the union of the fields required by the visible columns, so
+hidden columns such as ``Owner`` or ``Type`` cost nothing until they are switched on.
+"""
+
+import dataclasses
+import stat
+from collections.abc import Callable, Iterable
+
+import polars as pl
+
+from yaafc.filesystem.scanner import GROUP, MIME, OWNER, STAT, XATTRS
+from yaafc.utilities.humanbytes import HumanBytes
+
+MISSING_VALUE = "--"
+SUB_DIR_SIZE = "> SUB-DIR <"
+PARTIAL_SIZE_SUFFIX = " …"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S%:z"
+
+ColumnFormatter = Callable[[pl.DataFrame], pl.Expr]
+
+
+@dataclasses.dataclass(frozen=True)
+class ColumnProvider:
+    """
+    A displayable column of a directory listing.
+
+    Attributes:
+        title (str): The column title shown in the table header
+        fields (frozenset[str]): The raw data fields a scan must collect for this column
+        formatter (ColumnFormatter): Builds the expression rendering the column for a window of rows
+        sort_key (str | None): Key of ``yaafc.filesystem.query.SORT_COLUMNS`` ordering by this column
+    """
+
+    title: str
+    fields: frozenset[str]
+    formatter: ColumnFormatter
+    sort_key: str | None = None
+
+
+COLUMN_PROVIDERS: dict[str, ColumnProvider] = {}
+
+
+def column_provider(
+    title: str, fields: Iterable[str] = (), sort_key: str | None = None
+) -> Callable[[ColumnFormatter], ColumnFormatter]:
+    """
+    Registers the decorated function as formatter of a column.
+
+    Args:
+        title (str): The column title.
+        fields (Iterable[str]): The raw data fields the column needs besides name and type.
+        sort_key (str | None): The sort key used when the column header is clicked, None if not sortable.
+
+    Returns:
+        Callable[[ColumnFormatter], ColumnFormatter]: The decorator, returning the formatter unchanged.
+    """
+
+    def register(formatter: ColumnFormatter) -> ColumnFormatter:
+        COLUMN_PROVIDERS[title] = ColumnProvider(title, frozenset(fields), formatter, sort_key)
+        return formatter
+
+    return register
+
+
+def required_fields(titles: Iterable[str]) -> frozenset[str]:
+    """
+    Collects the raw data fields needed to display the given columns.
+
+    Args:
+        titles (Iterable[str]): Titles of the visible columns, unknown titles are ignored.
+
+    Returns:
+        frozenset[str]: The union of the fields of all known columns.
+    """
+    return frozenset().union(*(COLUMN_PROVIDERS[title].fields for title in titles if title in COLUMN_PROVIDERS))
+
+
+@column_provider("Name", sort_key="name")
+def _format_name(window: pl.DataFrame) -> pl.Expr:
+    return pl.when(pl.col("is_dir")).then(pl.lit("/") + pl.col("name")).otherwise(pl.col("name")).alias("Name")
+
+
+@column_provider("Size", {STAT}, sort_key="size")
+def _format_size(window: pl.DataFrame) -> pl.Expr:
+    # directories show their recursive size once calculated, partial totals are marked as such
+    sizes = pl.lit(HumanBytes.format_series(window["tree_size"].fill_null(window["size"])))
+    return (
+        pl.when(pl.col("tree_size").is_not_null() & pl.col("tree_size_final"))
+        .then(sizes)
+        .when(pl.col("tree_size").is_not_null())
+        .then(sizes + pl.lit(PARTIAL_SIZE_SUFFIX))
+        .when(pl.col("size").is_null())
+        .then(pl.lit(MISSING_VALUE))
+        .when(pl.col("is_dir"))
+        .then(pl.lit(SUB_DIR_SIZE))
+        .otherwise(sizes)
+        .alias("Size")
+    )
+
+
+@column_provider("Changed", {STAT}, sort_key="mtime")
+def _format_changed(window: pl.DataFrame) -> pl.Expr:
+    return pl.col("mtime").dt.to_string(TIMESTAMP_FORMAT).fill_null(MISSING_VALUE).alias("Changed")
+
+
+@column_provider("Rights", {STAT}, sort_key="mode")
+def _format_rights(window: pl.DataFrame) -> pl.Expr:
+    rights = pl.Series([None if mode is None else stat.filemode(mode) for mode in window["mode"]], dtype=pl.String)
+    return pl.lit(rights).fill_null(MISSING_VALUE).alias("Rights")
+
+
+@column_provider("Owner", {STAT, OWNER}, sort_key="owner")
+def _format_owner(window: pl.DataFrame) -> pl.Expr:
+    return pl.col("owner").fill_null(MISSING_VALUE).alias("Owner")
+
+
+@column_provider("Group", {STAT, GROUP}, sort_key="group")
+def _format_group(window: pl.DataFrame) -> pl.Expr:
+    return pl.col("group").fill_null(MISSING_VALUE).alias("Group")
+
+
+@column_provider("Type", {MIME}, sort_key="extension")
+def _format_type(window: pl.DataFrame) -> pl.Expr:
+    return pl.col("mime").fill_null(MISSING_VALUE).alias("Type")
+
+
+@column_provider("Attributes", {XATTRS})
+def _format_attributes(window: pl.DataFrame) -> pl.Expr:
+    return pl.col("xattrs").fill_null(MISSING_VALUE).alias("Attributes")
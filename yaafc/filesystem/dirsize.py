@@ -0,0 +1,195 @@
+"""
+Recursive directory sizes calculated in the background.
+
+Each requested directory is walked by one task of a bounded thread pool, so the event loop never waits on the
+file system. Walkers report partial totals while they run; the consumer receives them coalesced into one update
+per interval and cancels all walkers simply by no longer iterating. Finished totals are cached per
+(device, inode, mtime) of the walked directory. Changes deep inside a tree do not touch that mtime, so entries
+also expire after a TTL, like the listing cache.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+# reported size of a directory: total bytes found so far and whether the walk completed
+TreeSize = tuple[int, bool]
+
+
+@dataclasses.dataclass(frozen=True)
+class _CacheEntry:
+    size: int
+    created: float
+
+
+class DirectorySizeCalculator:
+    """
+    Calculates apparent sizes of directory trees on a shared, bounded worker pool.
+
+    Symbolic links are not followed and unreadable subdirectories are skipped, so totals are lower bounds in
+    directories the process may not fully read.
+
+    Attributes:
+        max_workers (int): Maximum number of trees walked in parallel
+        report_interval (float): Seconds between two partial totals of one walker
+        ttl (float): Seconds a finished total is reused while the directory looks unchanged
+        max_entries (int): Maximum number of cached totals
+    """
+
+    def __init__(
+        self, max_workers: int = 4, report_interval: float = 0.25, ttl: float = 60.0, max_entries: int = 4096
+    ) -> None:
+        self.max_workers = max_workers
+        self.report_interval = report_interval
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._executor: ThreadPoolExecutor | None = None
+        self._cache: OrderedDict[tuple[int, int, int], _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def sizes(self, paths: list[str], interval: float | None = None) -> AsyncIterator[dict[str, TreeSize]]:
+        """
+        Walks the given directories and yields their growing totals until all walks finished.
+
+        Stopping the iteration, e.g. with ``aclose()`` or by breaking out of an ``async for``, cancels the walkers
+        that are still running.
+
+        Args:
+            paths (list[str]): The directories to measure.
+            interval (float | None): Seconds between two yielded updates, ``report_interval`` if None.
+
+        Yields:
+            dict[str, TreeSize]: The totals that changed since the previous update, keyed by path. Updates may
+                be empty if no walker progressed, giving the consumer a chance to stop regularly.
+        """
+        interval = self.report_interval if interval is None else interval
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue[tuple[str, int, bool]] = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def report(path: str, size: int, done: bool) -> None:
+            # the loop may be gone once the consumer stopped iterating
+            if not cancelled.is_set():
+                with contextlib.suppress(RuntimeError):
+                    loop.call_soon_threadsafe(updates.put_nowait, (path, size, done))
+
+        executor = self._get_executor()
+        pending = set(paths)
+        futures = [loop.run_in_executor(executor, self.walk, path, cancelled, report) for path in pending]
+        try:
+            while pending:
+                batch: dict[str, TreeSize] = {}
+                deadline = loop.time() + interval
+                while pending and (timeout := deadline - loop.time()) > 0:
+                    try:
+                        path, size, done = await asyncio.wait_for(updates.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    batch[path] = (size, done)
+                    if done:
+                        pending.discard(path)
+                yield batch
+        finally:
+            cancelled.set()
+            for future in futures:
+                future.cancel()
+
+    def walk(self, path: str, cancelled: threading.Event, report: Callable[[str, int, bool], None]) -> int | None:
+        """
+        Sums the sizes of all files below ``path``, blocking the calling thread.
+
+        Args:
+            path (str): The directory to measure.
+            cancelled (threading.Event): Stops the walk as soon as it is set.
+            report (Callable[[str, int, bool], None]): Called with the path, the total so far and whether the walk
+                is complete; at most once per ``report_interval`` while walking and once at the end.
+
+        Returns:
+            int | None: The total in bytes, None if the walk was cancelled.
+        """
+        key = _cache_key(path)
+        cached = self._lookup(key)
+        if cached is not None:
+            report(path, cached, True)
+            return cached
+
+        total = 0
+        stack = [path]
+        last_report = time.monotonic()
+        while stack:
+            if cancelled.is_set():
+                return None
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            else:
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            now = time.monotonic()
+            if now - last_report >= self.report_interval:
+                report(path, total, False)
+                last_report = now
+
+        self._store(key, total)
+        report(path, total, True)
+        return total
+
+    def invalidate(self) -> None:
+        """Drops all cached totals."""
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self) -> None:
+        """Stops the worker pool; it is recreated on the next calculation."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="yaafc-dirsize")
+            return self._executor
+
+    def _lookup(self, key: tuple[int, int, int] | None) -> int | None:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or time.monotonic() - entry.created >= self.ttl:
+                return None
+            self._cache.move_to_end(key)
+            return entry.size
+
+    def _store(self, key: tuple[int, int, int] | None, size: int) -> None:
+        if key is None:
+            return
+        with self._lock:
+            self._cache[key] = _CacheEntry(size, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+
+def _cache_key(path: str) -> tuple[int, int, int] | None:
+    try:
+        stat_result = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return None
+    return stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns
+
+
+directory_sizes = DirectorySizeCalculator()
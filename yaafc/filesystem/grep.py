@@ -0,0 +1,228 @@
+"""
+Content search across a directory tree.
+
+The tree is walked on a thread while the files found are searched in batches by a process pool, so searching is
+not limited by the GIL and the event loop only collects results. Files are memory-mapped and searched in place,
+without reading them into Python objects; files that look binary or exceed the size limit are skipped.
+
+Matches are yielded batch by batch as worker processes finish. Stopping the iteration cancels all batches not
+yet started, so at most the batches in flight are still searched after a search was abandoned.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import functools
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+from collections.abc import AsyncIterator, Generator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# leading bytes checked for NUL bytes to tell binary files from text files
+BINARY_CHECK_SIZE = 8192
+# characters of the matching line kept around a match
+SNIPPET_LENGTH = 200
+
+
+@dataclasses.dataclass(frozen=True)
+class ContentMatch:
+    """
+    One line of a file matching a content search.
+
+    Attributes:
+        path (str): The file, relative to the searched directory
+        line_number (int): One-based number of the matching line
+        snippet (str): The matching line, shortened around the match if it is long
+    """
+
+    path: str
+    line_number: int
+    snippet: str
+
+
+class ContentSearcher:
+    """
+    Searches file contents for a literal text or a regular expression on a shared process pool.
+
+    Attributes:
+        max_workers (int): Number of worker processes
+        max_file_size (int): Files larger than this many bytes are skipped
+        max_matches_per_file (int): Matching lines reported per file at most
+        files_per_batch (int): Number of files sent to a worker at once
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_file_size: int = 64 * 1024 * 1024,
+        max_matches_per_file: int = 100,
+        files_per_batch: int = 64,
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_file_size = max_file_size
+        self.max_matches_per_file = max_matches_per_file
+        self.files_per_batch = files_per_batch
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    async def search(
+        self, pattern: str, directory: str, regex: bool = False, case_sensitive: bool = False
+    ) -> AsyncIterator[list[ContentMatch]]:
+        """
+        Searches all files below ``directory`` and yields the matches as they are found.
+
+        Symbolic links are not followed. Lines are matched on the raw bytes, so case-insensitive matching only
+        folds ASCII letters.
+
+        Args:
+            pattern (str): The text to find, or a regular expression if ``regex`` is True.
+            directory (str): The directory to search in.
+            regex (bool): Interpret ``pattern`` as a Python regular expression.
+            case_sensitive (bool): Match the case of letters.
+
+        Yields:
+            list[ContentMatch]: The matches of one or more finished batches of files.
+
+        Raises:
+            re.error: If ``pattern`` is not a valid regular expression.
+        """
+        expression = (pattern if regex else re.escape(pattern)).encode()
+        flags = 0 if case_sensitive else re.IGNORECASE
+        re.compile(expression, flags | re.MULTILINE)
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        batches = _batches(directory, self.max_file_size, self.files_per_batch)
+        pending: set[asyncio.Future] = set()
+        walking = True
+        try:
+            while True:
+                # keep every worker busy without queueing the whole tree
+                while walking and len(pending) < 2 * self.max_workers:
+                    batch = await loop.run_in_executor(None, next, batches, None)
+                    if batch is None:
+                        walking = False
+                        break
+                    future: Future = executor.submit(
+                        _search_files, batch, expression, flags, self.max_file_size, self.max_matches_per_file
+                    )
+                    pending.add(asyncio.wrap_future(future))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                matches = [
+                    ContentMatch(os.path.relpath(path, directory), line_number, snippet)
+                    for finished in done
+                    for path, line_number, snippet in finished.result()
+                ]
+                if matches:
+                    yield matches
+        finally:
+            for waiting in pending:
+                waiting.cancel()
+            await loop.run_in_executor(None, batches.close)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes; they are restarted on the next search."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # forking the multi-threaded server process is unsafe, workers start from a clean interpreter
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context(method))
+            return self._executor
+
+
+def search_file(
+    path: str, expression: bytes, flags: int, max_file_size: int, max_matches: int
+) -> list[tuple[str, int, str]]:
+    """
+    Searches one file for a byte pattern, reporting at most one match per line.
+
+    Args:
+        path (str): The file to search.
+        expression (bytes): The regular expression to find.
+        flags (int): Flags of ``re.compile``.
+        max_file_size (int): Larger files are skipped.
+        max_matches (int): Stop after this many matching lines.
+
+    Returns:
+        list[tuple[str, int, str]]: Path, line number and snippet of each matching line; empty for binary,
+            empty, oversized and unreadable files.
+    """
+    compiled = _compile(expression, flags)
+    matches: list[tuple[str, int, str]] = []
+    try:
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0 or size > max_file_size:
+                return matches
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                if content.find(b"\0", 0, BINARY_CHECK_SIZE) != -1:
+                    return matches
+                line_number = 1
+                counted = 0
+                position = 0
+                while len(matches) < max_matches and (match := compiled.search(content, position)):
+                    line_start = content.rfind(b"\n", 0, match.start()) + 1
+                    line_end = content.find(b"\n", match.end())
+                    line_end = size if line_end == -1 else line_end
+                    line_number += content[counted:line_start].count(b"\n")
+                    counted = line_start
+                    snippet = _snippet(content[line_start:line_end], match.start() - line_start)
+                    matches.append((path, line_number, snippet))
+                    position = line_end + 1
+    except (OSError, ValueError):
+        pass
+    return matches
+
+
+def _search_files(
+    paths: list[str], expression: bytes, flags: int, max_file_size: int, max_matches: int
+) -> list[tuple[str, int, str]]:
+    # runs in a worker process
+    return [match for path in paths for match in search_file(path, expression, flags, max_file_size, max_matches)]
+
+
+@functools.lru_cache(maxsize=16)
+def _compile(expression: bytes, flags: int) -> re.Pattern[bytes]:
+    return re.compile(expression, flags | re.MULTILINE)
+
+
+def _snippet(line: bytes, offset: int) -> str:
+    if len(line) > SNIPPET_LENGTH:
+        start = max(0, min(offset - SNIPPET_LENGTH // 4, len(line) - SNIPPET_LENGTH))
+        line = line[start : start + SNIPPET_LENGTH]
+    return line.decode(errors="replace").strip()
+
+
+def _batches(directory: str, max_file_size: int, files_per_batch: int) -> Generator[list[str], None, None]:
+    # walks the tree without following symbolic links and groups the regular files to search
+    batch: list[str] = []
+    stack = [directory]
+    while stack:
+        with contextlib.suppress(OSError), os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                with contextlib.suppress(OSError):
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif (
+                        entry.is_file(follow_symlinks=False)
+                        and 0 < entry.stat(follow_symlinks=False).st_size <= max_file_size
+                    ):
+                        batch.append(entry.path)
+                        if len(batch) == files_per_batch:
+                            yield batch
+                            batch = []
+    if batch:
+        yield batch
+
+
+content_searcher = ContentSearcher()
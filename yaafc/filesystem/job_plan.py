@@ -0,0 +1,107 @@
+"""
+Plans of file jobs: the single-path steps a copy, move or delete job is expanded into, see ``yaafc.filesystem.jobs``.
+"""
+
+import dataclasses
+import os
+import stat
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from yaafc.filesystem.transfer import same_device
+
+if TYPE_CHECKING:
+    from yaafc.filesystem.jobs import FileJob
+
+# step actions of a plan
+MKDIR = "mkdir"
+COPY = "copy"
+MOVE = "move"
+RENAME = "rename"
+REMOVE = "remove"
+RMDIR = "rmdir"
+
+
+@dataclasses.dataclass(frozen=True)
+class Step:
+    """
+    One single-path operation of a job plan.
+
+    Attributes:
+        action (str): One of MKDIR, COPY, MOVE, RENAME, REMOVE, RMDIR
+        source (str): The path operated on
+        destination (str): The target path, empty for REMOVE and RMDIR
+        size (int): Bytes transferred by the step, zero for all but COPY and MOVE of regular files
+    """
+
+    action: str
+    source: str
+    destination: str = ""
+    size: int = 0
+
+
+def plan_steps(job: "FileJob") -> Iterator[Step]:
+    """Expands a job into its steps, reporting sources that cannot be planned as errors of the job."""
+    for source in job.sources:
+        if job.cancelled.is_set():
+            return
+        if not os.path.lexists(source):
+            job.errors.append(f"{source}: no such file or directory")
+            continue
+        if job.kind == "delete":
+            yield from _plan_delete(source)
+            continue
+        target = os.path.join(job.destination, os.path.basename(source))
+        if target == source or target.startswith(source + os.sep):
+            job.errors.append(f"{source}: cannot {job.kind} a directory into itself")
+            continue
+        if os.path.lexists(target) and not job.overwrite:
+            job.errors.append(f"{target}: already exists")
+            continue
+        if job.kind == "move" and same_device(source, job.destination) and not os.path.isdir(target):
+            yield Step(RENAME, source, target)
+            continue
+        yield from _plan_transfer(source, target, COPY if job.kind == "copy" else MOVE)
+
+
+def _plan_transfer(source: str, target: str, action: str) -> Iterator[Step]:
+    source_stat = os.lstat(source)
+    if not stat.S_ISDIR(source_stat.st_mode):
+        yield Step(action, source, target, source_stat.st_size if stat.S_ISREG(source_stat.st_mode) else 0)
+        return
+    directories = []
+    stack = [(source, target)]
+    while stack:
+        directory, directory_target = stack.pop()
+        directories.append(directory)
+        yield Step(MKDIR, directory, directory_target)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                entry_target = os.path.join(directory_target, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, entry_target))
+                else:
+                    size = entry.stat(follow_symlinks=False).st_size if entry.is_file(follow_symlinks=False) else 0
+                    yield Step(action, entry.path, entry_target, size)
+    if action == MOVE:
+        for directory in reversed(directories):
+            yield Step(RMDIR, directory)
+
+
+def _plan_delete(source: str) -> Iterator[Step]:
+    if not stat.S_ISDIR(os.lstat(source).st_mode):
+        yield Step(REMOVE, source)
+        return
+    directories = []
+    stack = [source]
+    while stack:
+        directory = stack.pop()
+        directories.append(directory)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield Step(REMOVE, entry.path)
+    for directory in reversed(directories):
+        yield Step(RMDIR, directory)
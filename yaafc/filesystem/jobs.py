@@ -0,0 +1,494 @@
+"""
+Job engine for bulk copy, move and delete operations.
+
+A job is first expanded into a plan of single-path steps, which is written to a JSON lines journal before anything
+is touched. Directories are created up front, then file steps run in parallel on a bounded worker pool shared by
+all jobs, and emptied source directories are removed last. Completed steps are appended to the journal in batches,
+so a job interrupted by a crash or a restart resumes with the steps still missing. A file copy journals its start
+before it truncates the destination and the bytes it has written since, so a half copied file continues where its
+journal says it got to; a destination the job never started on is replaced from the beginning. A paused job
+continues from its journal the same way. See ``yaafc.filesystem.journal`` for the journal format.
+
+Progress is kept in counters of the job and read as snapshots at the consumer's pace (see ``JobEngine.watch``),
+so tens of thousands of small files do not turn into tens of thousands of UI updates.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import os
+import threading
+import uuid
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Literal
+
+from yaafc.filesystem.job_plan import MKDIR, MOVE, REMOVE, RENAME, RMDIR, Step, plan_steps
+from yaafc.filesystem.journal import Journal, JournalRecords, create_journal, read_journal
+from yaafc.filesystem.transfer import TransferCancelled, copy_file, copy_symlink, remove_path
+
+JobKind = Literal["copy", "move", "delete"]
+JobState = Literal["planning", "running", "paused", "done", "failed", "cancelled"]
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+DEFAULT_JOURNAL_DIR = os.path.join(
+    os.environ.get("XDG_STATE_HOME", os.path.join(os.path.expanduser("~"), ".local", "state")), "yaafc", "jobs"
+)
+
+
+class JobError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class UnknownJobKindError(JobError):
+    def __init__(self, kind: str):
+        super().__init__(f"unknown job kind {kind!r}")
+
+
+class DestinationNotDirectoryError(JobError):
+    def __init__(self, destination: str):
+        super().__init__(f"destination {destination!r} is not a directory")
+
+
+class JobNotPausedError(JobError):
+    def __init__(self, job_id: str, state: str):
+        super().__init__(f"job {job_id} is {state}, only paused jobs resume")
+
+
+@dataclasses.dataclass(frozen=True)
+class JobProgress:
+    """
+    Snapshot of a job's progress.
+
+    Attributes:
+        job_id (str): The job
+        kind (str): copy, move or delete
+        state (str): One of the JobState values
+        total_files (int): Number of steps in the plan
+        total_bytes (int): Number of bytes to transfer
+        done_files (int): Number of finished or failed steps
+        done_bytes (int): Number of bytes transferred so far
+        errors (list[str]): One message per failed step
+        current (str): A path being worked on
+    """
+
+    job_id: str
+    kind: str
+    state: str
+    total_files: int
+    total_bytes: int
+    done_files: int
+    done_bytes: int
+    errors: list[str]
+    current: str
+
+    @property
+    def fraction(self) -> float:
+        """Share of the job completed, by bytes if there are any and by steps otherwise."""
+        if self.total_bytes:
+            return min(self.done_bytes / self.total_bytes, 1.0)
+        return self.done_files / self.total_files if self.total_files else float(self.state in FINISHED_STATES)
+
+
+class FileJob:
+    """
+    A bulk file operation and its live counters.
+
+    Attributes:
+        job_id (str): Unique id, also the name of the journal file
+        kind (JobKind): copy, move or delete
+        sources (list[str]): The paths to operate on
+        destination (str): The target directory of copy and move jobs
+        overwrite (bool): Replace existing targets instead of reporting them as errors
+        state (JobState): Current state
+        steps (list[Step]): The plan, empty while planning
+    """
+
+    def __init__(
+        self, kind: JobKind, sources: list[str], destination: str = "", overwrite: bool = False, job_id: str = ""
+    ) -> None:
+        if kind not in ("copy", "move", "delete"):
+            raise UnknownJobKindError(kind)
+        if kind != "delete" and not os.path.isdir(destination):
+            raise DestinationNotDirectoryError(destination)
+        self.job_id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.sources = [os.path.abspath(source) for source in sources]
+        self.destination = os.path.abspath(destination) if destination else ""
+        self.overwrite = overwrite
+        self.state: JobState = "planning"
+        self.steps: list[Step] = []
+        self.total_bytes = 0
+        self.completed: set[int] = set()
+        # bytes journaled as written by the file copies this job started, the offsets to resume them at
+        self.written: dict[int, int] = {}
+        self.done_bytes = 0
+        self.errors: list[str] = []
+        self.current = ""
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        self.resumed = False
+        self._lock = threading.Lock()
+        self._cancel_state: JobState = "cancelled"
+
+    def progress(self) -> JobProgress:
+        """Returns a consistent snapshot of the counters."""
+        with self._lock:
+            return JobProgress(
+                job_id=self.job_id,
+                kind=self.kind,
+                state=self.state,
+                total_files=len(self.steps),
+                total_bytes=self.total_bytes,
+                done_files=len(self.completed),
+                done_bytes=self.done_bytes,
+                errors=list(self.errors),
+                current=self.current,
+            )
+
+    def _set_steps(self, steps: list[Step]) -> None:
+        with self._lock:
+            self.steps = steps
+            self.total_bytes = sum(step.size for step in steps)
+
+    def _add_bytes(self, count: int) -> None:
+        with self._lock:
+            self.done_bytes += count
+
+    def _complete(self, index: int, error: str | None = None) -> None:
+        with self._lock:
+            self.completed.add(index)
+            if error is not None:
+                self.errors.append(error)
+
+
+class JobEngine:
+    """
+    Runs file jobs on a bounded worker pool and journals them for resuming.
+
+    Attributes:
+        journal_dir (str): Directory holding one journal per unfinished job
+        max_workers (int): Maximum number of steps executed in parallel over all jobs
+        journal_interval (float): Seconds between two journal flushes of a running job
+    """
+
+    def __init__(self, journal_dir: str = DEFAULT_JOURNAL_DIR, max_workers: int = 4, journal_interval: float = 0.5):
+        self.journal_dir = journal_dir
+        self.max_workers = max_workers
+        self.journal_interval = journal_interval
+        self.jobs: dict[str, FileJob] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, kind: JobKind, sources: list[str], destination: str = "", overwrite: bool = False) -> FileJob:
+        """
+        Plans and starts a job in the background.
+
+        Args:
+            kind (JobKind): copy, move or delete.
+            sources (list[str]): The files and directories to operate on.
+            destination (str): The directory receiving copies or moved entries, ignored for delete.
+            overwrite (bool): Replace existing targets instead of reporting them as errors.
+
+        Returns:
+            FileJob: The started job.
+
+        Raises:
+            JobError: If the kind is unknown or the destination is not a directory.
+        """
+        return self._start(FileJob(kind, sources, destination, overwrite))
+
+    def resume(self, job_id: str | None = None) -> list[FileJob]:
+        """
+        Restarts the jobs whose journals were left behind by an interruption, or one paused job.
+
+        Args:
+            job_id (str | None): A job paused with ``pause``, continued from its journal; None for the journals
+                of jobs this engine does not know, e.g. those of a previous process.
+
+        Returns:
+            list[FileJob]: The resumed jobs.
+
+        Raises:
+            KeyError: If ``job_id`` is not a job of the engine.
+            JobError: If the job is not paused.
+        """
+        if job_id is not None:
+            return [self._resume_paused(self.jobs[job_id])]
+        if not os.path.isdir(self.journal_dir):
+            return []
+        jobs = []
+        # concurrent calls, e.g. from several clients, must not start a journal twice
+        with self._lock:
+            for name in sorted(os.listdir(self.journal_dir)):
+                job_id, extension = os.path.splitext(name)
+                if extension != ".jsonl" or job_id in self.jobs:
+                    continue
+                job = self._read_journal(os.path.join(self.journal_dir, name))
+                if job is not None:
+                    jobs.append(self._start(job))
+        return jobs
+
+    def get(self, job_id: str) -> FileJob:
+        """Returns a job known to the engine, raising KeyError for unknown ids."""
+        return self.jobs[job_id]
+
+    def pause(self, job_id: str) -> None:
+        """Stops a job after the chunks in flight and keeps its journal, so ``resume`` continues it."""
+        job = self.jobs[job_id]
+        job._cancel_state = "paused"
+        job.cancelled.set()
+
+    def cancel(self, job_id: str) -> None:
+        """Stops a job after the chunks in flight and discards its journal; finished steps are not undone."""
+        job = self.jobs[job_id]
+        with job._lock:
+            job._cancel_state = "cancelled"
+            job.cancelled.set()
+            # a paused job has no thread left to discard its journal
+            paused = job.finished.is_set() and job.state == "paused"
+            if paused:
+                job.state = "cancelled"
+        if paused:
+            self._remove_journal(job)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> JobProgress:
+        """Blocks until a job finished or was stopped, or the timeout expired."""
+        job = self.jobs[job_id]
+        job.finished.wait(timeout)
+        return job.progress()
+
+    async def watch(self, job_id: str, interval: float = 0.25) -> AsyncGenerator[JobProgress, None]:
+        """
+        Yields progress snapshots of a job at a fixed pace until it finished or was stopped.
+
+        Args:
+            job_id (str): The job to watch.
+            interval (float): Seconds between two snapshots.
+
+        Yields:
+            JobProgress: The current progress; the last snapshot has a final or paused state.
+        """
+        job = self.jobs[job_id]
+        while not job.finished.is_set():
+            yield job.progress()
+            await asyncio.to_thread(job.finished.wait, interval)
+        yield job.progress()
+
+    def shutdown(self) -> None:
+        """Pauses all running jobs and stops the worker pool."""
+        for job in list(self.jobs.values()):
+            if not job.finished.is_set():
+                self.pause(job.job_id)
+        for job in list(self.jobs.values()):
+            job.finished.wait()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _start(self, job: FileJob) -> FileJob:
+        self.jobs[job.job_id] = job
+        threading.Thread(target=self._run, args=(job,), name=f"yaafc-job-{job.job_id[:8]}", daemon=True).start()
+        return job
+
+    def _resume_paused(self, job: FileJob) -> FileJob:
+        with job._lock:
+            if not job.finished.is_set() or job.state != "paused":
+                raise JobNotPausedError(job.job_id, job.state)
+            job.state = "planning"
+        _restore(job, read_journal(self._journal_path(job)))
+        job._cancel_state = "cancelled"
+        job.cancelled.clear()
+        job.finished.clear()
+        return self._start(job)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="yaafc-job")
+            return self._executor
+
+    def _run(self, job: FileJob) -> None:
+        try:
+            if not job.steps:
+                job._set_steps(list(plan_steps(job)))
+                if job.cancelled.is_set():
+                    # a partial plan cannot be resumed
+                    job._cancel_state = "cancelled"
+                    return
+                self._create_journal(job)
+            with open(self._journal_path(job), "a", encoding="utf-8") as journal_file:
+                with job._lock:
+                    job.state = "running"
+                journal = Journal(journal_file, self.journal_interval)
+                try:
+                    self._execute(job, journal)
+                finally:
+                    journal.flush()
+        except Exception as error:
+            # a broken job must not take the engine down
+            with job._lock:
+                job.errors.append(str(error))
+                job.state = "failed"
+        finally:
+            with job._lock:
+                if job.state in ("planning", "running"):
+                    job.state = job._cancel_state if job.cancelled.is_set() else ("failed" if job.errors else "done")
+                state = job.state
+            if state in FINISHED_STATES:
+                self._remove_journal(job)
+            job.finished.set()
+
+    def _execute(self, job: FileJob, journal: Journal) -> None:
+        # directories first, in plan order, so parents exist before their entries
+        for index in self._pending(job, lambda step: step.action == MKDIR):
+            if job.cancelled.is_set():
+                return
+            self._run_step(job, index, journal)
+        self._execute_parallel(job, journal)
+        # emptied source directories last, deepest first
+        for index in self._pending(job, lambda step: step.action == RMDIR):
+            if job.cancelled.is_set():
+                return
+            self._run_step(job, index, journal)
+
+    def _execute_parallel(self, job: FileJob, journal: Journal) -> None:
+        executor = self._get_executor()
+        in_flight: set[Future] = set()
+        for index in self._pending(job, lambda step: step.action not in (MKDIR, RMDIR)):
+            if job.cancelled.is_set():
+                break
+            if len(in_flight) >= self.max_workers * 2:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    future.result()
+            in_flight.add(executor.submit(self._run_step, job, index, journal))
+        for future in wait(in_flight).done:
+            future.result()
+
+    @staticmethod
+    def _pending(job: FileJob, selected: Callable[[Step], bool]) -> list[int]:
+        return [index for index, step in enumerate(job.steps) if selected(step) and index not in job.completed]
+
+    def _run_step(self, job: FileJob, index: int, journal: Journal) -> None:
+        """Executes one step and journals it, unless it was interrupted and must run again on resume."""
+        step = job.steps[index]
+        job.current = step.source
+        try:
+            _execute_step(job, index, journal)
+        except TransferCancelled:
+            return
+        except OSError as error:
+            job._complete(index, f"{step.action} {step.source}: {error.strerror or error}")
+        else:
+            job._complete(index)
+        journal.done(index)
+
+    def _journal_path(self, job: FileJob) -> str:
+        return os.path.join(self.journal_dir, f"{job.job_id}.jsonl")
+
+    def _create_journal(self, job: FileJob) -> None:
+        os.makedirs(self.journal_dir, exist_ok=True)
+        header = {
+            "job": job.job_id,
+            "kind": job.kind,
+            "sources": job.sources,
+            "destination": job.destination,
+            "overwrite": job.overwrite,
+        }
+        create_journal(self._journal_path(job), header, job.steps)
+
+    def _read_journal(self, path: str) -> FileJob | None:
+        records = read_journal(path)
+        job = _job_from_header(records.header)
+        if job is None:
+            os.unlink(path)
+            return None
+        _restore(job, records)
+        return job
+
+    def _remove_journal(self, job: FileJob) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._journal_path(job))
+
+
+def _execute_step(job: FileJob, index: int, journal: Journal) -> None:
+    step = job.steps[index]
+    if step.action == MKDIR:
+        os.makedirs(step.destination, exist_ok=True)
+        return
+    if step.action in (REMOVE, RMDIR):
+        remove_path(step.source)
+        return
+    if step.action == RENAME:
+        if job.resumed and not os.path.lexists(step.source) and os.path.lexists(step.destination):
+            return
+        os.rename(step.source, step.destination)
+        return
+    if job.resumed and step.action == MOVE and not os.path.lexists(step.source):
+        # moved before the interruption, only the journal record is missing
+        return
+    if os.path.islink(step.source):
+        copy_symlink(step.source, step.destination)
+    else:
+        _copy_step(job, index, journal)
+    if step.action == MOVE:
+        os.unlink(step.source)
+
+
+def _copy_step(job: FileJob, index: int, journal: Journal) -> None:
+    step = job.steps[index]
+    offset = _resume_offset(step, job.written.get(index))
+    copied = offset
+
+    def progress(count: int) -> None:
+        nonlocal copied
+        copied += count
+        job._add_bytes(count)
+        journal.written(index, copied)
+
+    if not offset:
+        journal.started(index)
+    copy_file(step.source, step.destination, progress, job.cancelled, offset)
+    if offset:
+        job._add_bytes(offset)
+
+
+def _resume_offset(step: Step, written: int | None) -> int:
+    # only bytes this job journaled as written are kept, an existing destination it never started on is replaced
+    if not written:
+        return 0
+    try:
+        copied = os.stat(step.destination).st_size
+    except OSError:
+        return 0
+    return min(written, copied, step.size)
+
+
+def _restore(job: FileJob, records: JournalRecords) -> None:
+    if not records.planned:
+        # nothing ran before the plan was complete, the job plans again
+        return
+    # continue with the missing steps
+    steps = [Step(*step) for step in records.steps]
+    completed = records.completed
+    job._set_steps(steps)
+    with job._lock:
+        job.completed = set(completed)
+        job.written = {index: records.written.get(index, 0) for index in records.started - completed}
+        job.done_bytes = sum(steps[index].size for index in completed if index < len(steps))
+        job.resumed = True
+
+
+def _job_from_header(header: dict[str, Any] | None) -> FileJob | None:
+    if header is None:
+        return None
+    try:
+        return FileJob(header["kind"], header["sources"], header["destination"], header["overwrite"], header["job"])
+    except JobError:
+        return None
+
+
+job_engine = JobEngine()
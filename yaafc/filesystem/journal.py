@@ -0,0 +1,131 @@
+"""
+JSON lines journals of file jobs, see ``yaafc.filesystem.jobs``.
+
+A journal starts with a header naming the job, followed by its plan in batches of steps and a record marking the
+plan complete. While the job runs, the start of every file copy, the bytes copies have written and the finished
+steps are appended. Reading a journal back tolerates a last line cut off by an interruption.
+"""
+
+import dataclasses
+import json
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from typing import Any, TextIO
+
+# plan steps written per journal line
+_PLAN_BATCH = 1000
+
+
+@dataclasses.dataclass
+class JournalRecords:
+    """
+    The contents of a journal.
+
+    Attributes:
+        header (dict[str, Any] | None): The job's kind, sources, destination, overwrite flag and id, None if missing
+        steps (list[list[Any]]): The plan, one field list per step
+        planned (bool): Whether the plan was written completely
+        completed (set[int]): Indices of the finished steps
+        started (set[int]): Indices of the file copies started
+        written (dict[int, int]): Bytes written by the started copies, by step index
+    """
+
+    header: dict[str, Any] | None = None
+    steps: list[list[Any]] = dataclasses.field(default_factory=list)
+    planned: bool = False
+    completed: set[int] = dataclasses.field(default_factory=set)
+    started: set[int] = dataclasses.field(default_factory=set)
+    written: dict[int, int] = dataclasses.field(default_factory=dict)
+
+
+class Journal:
+    """
+    Appends the progress of a running job to its journal, from the job's thread and its workers.
+
+    Finished steps and the bytes written by running copies are buffered and flushed at most once per interval. The
+    start of a copy is written right away, before the copy truncates its destination.
+    """
+
+    def __init__(self, journal: TextIO, interval: float) -> None:
+        self._journal = journal
+        self._interval = interval
+        self._done: list[int] = []
+        self._written: dict[int, int] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def started(self, index: int) -> None:
+        with self._lock:
+            write_record(self._journal, {"started": index})
+
+    def written(self, index: int, count: int) -> None:
+        with self._lock:
+            self._written[index] = count
+            self._flush_due()
+
+    def done(self, index: int) -> None:
+        with self._lock:
+            self._done.append(index)
+            self._written.pop(index, None)
+            self._flush_due()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush_due(self) -> None:
+        if time.monotonic() - self._last_flush >= self._interval:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._written:
+            write_record(self._journal, {"written": list(self._written.items())})
+            self._written.clear()
+        if self._done:
+            write_record(self._journal, {"done": self._done})
+            self._done = []
+        self._last_flush = time.monotonic()
+
+
+def create_journal(path: str, header: dict[str, Any], steps: Sequence[Any]) -> None:
+    """Writes the header and the plan of a job, the steps being dataclasses."""
+    with open(path, "w", encoding="utf-8") as journal:
+        write_record(journal, header)
+        for start in range(0, len(steps), _PLAN_BATCH):
+            write_record(journal, {"steps": [dataclasses.astuple(step) for step in steps[start : start + _PLAN_BATCH]]})
+        write_record(journal, {"planned": len(steps)})
+
+
+def read_journal(path: str) -> JournalRecords:
+    """Reads a journal back, up to its last complete line."""
+    records = JournalRecords()
+    for record in read_records(path):
+        if "job" in record:
+            records.header = record
+        elif "steps" in record:
+            records.steps.extend(record["steps"])
+        elif "planned" in record:
+            records.planned = True
+        elif "started" in record:
+            records.started.add(record["started"])
+        elif "written" in record:
+            records.written.update(record["written"])
+        elif "done" in record:
+            records.completed.update(record["done"])
+    return records
+
+
+def read_records(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as journal:
+        for line in journal:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # the last line may be cut off by the interruption
+                return
+
+
+def write_record(journal: TextIO, record: dict) -> None:
+    journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+    journal.flush()
@@ -0,0 +1,259 @@
+"""
+Columnar directory listing model backed by a Polars DataFrame.
+
+A listing keeps the raw values of a directory scan in typed columns. Sorting and filtering run as vectorized
+Polars operations, and formatting for display is deferred to the rows that are actually rendered.
+"""
+
+import dataclasses
+import os
+
+import polars as pl
+
+from yaafc.filesystem.columns import COLUMN_PROVIDERS
+from yaafc.filesystem.scanner import DEFAULT_FIELDS, ScanResult, scan_directory
+
+LISTING_SCHEMA: dict[str, pl.DataType] = {
+    "name": pl.String(),
+    "is_dir": pl.Boolean(),
+    "size": pl.Int64(),
+    "mtime": pl.Datetime("us", time_zone="UTC"),
+    "mode": pl.UInt32(),
+    "uid": pl.UInt32(),
+    "gid": pl.UInt32(),
+    "inode": pl.UInt64(),
+    "owner": pl.String(),
+    "group": pl.String(),
+    "mime": pl.String(),
+    "xattrs": pl.String(),
+    # sort keys derived from the name once per scan, see yaafc.filesystem.query
+    "sort_name": pl.String(),
+    "extension": pl.String(),
+    # recursive size of directories and whether it is final, see with_tree_sizes
+    "tree_size": pl.Int64(),
+    "tree_size_final": pl.Boolean(),
+}
+
+SORT_KEY_COLUMNS = ["sort_name", "extension"]
+TREE_SIZE_COLUMNS = ["tree_size", "tree_size_final"]
+# digit runs are zero-padded to this width in ``sort_name``, so "file10" sorts after "file9"
+NATURAL_DIGITS = 20
+
+# columns compared to decide whether an entry changed between two listings
+CHANGE_COLUMNS = [column for column in LISTING_SCHEMA if column not in SORT_KEY_COLUMNS + TREE_SIZE_COLUMNS]
+
+
+@dataclasses.dataclass
+class ListingDelta:
+    """
+    Difference between two snapshots of the same directory.
+
+    Attributes:
+        added (pl.DataFrame): Rows of new entries
+        changed (pl.DataFrame): Current rows of entries whose metadata changed
+        removed (list[str]): Names of entries that no longer exist
+    """
+
+    added: pl.DataFrame = dataclasses.field(default_factory=lambda: pl.DataFrame(schema=LISTING_SCHEMA))
+    changed: pl.DataFrame = dataclasses.field(default_factory=lambda: pl.DataFrame(schema=LISTING_SCHEMA))
+    removed: list[str] = dataclasses.field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added.height or self.changed.height or self.removed)
+
+    def summary(self) -> dict[str, int]:
+        """Number of added, changed and removed entries."""
+        return {"added": self.added.height, "changed": self.changed.height, "removed": len(self.removed)}
+
+
+class DirectoryListing:
+    """
+    Immutable snapshot of a directory's entries held as a typed Polars DataFrame.
+
+    Columns whose raw data field was not collected hold nulls.
+
+    Attributes:
+        path (str): The listed directory
+        frame (pl.DataFrame): One row per entry with the columns of ``LISTING_SCHEMA``
+        fields (frozenset[str]): The raw data fields collected by the scan
+    """
+
+    def __init__(self, path: str, frame: pl.DataFrame, fields: frozenset[str] = DEFAULT_FIELDS) -> None:
+        self.path = path
+        self.frame = frame
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return self.frame.height
+
+    @classmethod
+    def from_scan(cls, scan: ScanResult) -> "DirectoryListing":
+        """
+        Creates a listing from a scanner row store, directories first and each partition in name order.
+
+        Args:
+            scan (ScanResult): The result of a directory scan.
+
+        Returns:
+            DirectoryListing: The listing of the scanned directory.
+        """
+        frame = pl.DataFrame(
+            {
+                "name": scan.name,
+                "is_dir": scan.is_dir,
+                "size": scan.size,
+                "mtime": [None if mtime is None else int(mtime * 1_000_000) for mtime in scan.mtime],
+                "mode": scan.mode,
+                "uid": scan.uid,
+                "gid": scan.gid,
+                "inode": scan.inode,
+                "owner": scan.owner,
+                "group": scan.group,
+                "mime": scan.mime,
+                "xattrs": scan.xattrs,
+            },
+            schema={column: LISTING_SCHEMA[column] for column in CHANGE_COLUMNS},
+        ).with_columns(
+            *_sort_key_columns(),
+            *[pl.lit(None, dtype=LISTING_SCHEMA[column]).alias(column) for column in TREE_SIZE_COLUMNS],
+        )
+        return cls(scan.path, _default_order(frame), scan.fields)
+
+    @classmethod
+    def scan(cls, path: str | os.PathLike[str], fields: frozenset[str] = DEFAULT_FIELDS) -> "DirectoryListing":
+        """
+        Scans a directory and returns its listing.
+
+        Args:
+            path (str | os.PathLike[str]): The directory to scan.
+            fields (frozenset[str]): The raw data fields to collect, see ``required_fields``.
+
+        Returns:
+            DirectoryListing: The listing of the directory.
+
+        Raises:
+            OSError: If the directory cannot be opened.
+        """
+        return cls.from_scan(scan_directory(path, fields))
+
+    def sort(self, by: str | list[str], descending: bool | list[bool] = False) -> "DirectoryListing":
+        """
+        Returns a new listing sorted by the given columns.
+
+        Args:
+            by (str | list[str]): Column name(s) to sort by.
+            descending (bool | list[bool]): Sort order per column.
+
+        Returns:
+            DirectoryListing: The sorted listing.
+        """
+        frame = self.frame.sort(by, descending=descending, maintain_order=True)
+        return DirectoryListing(self.path, frame, self.fields)
+
+    def filter(self, predicate: pl.Expr) -> "DirectoryListing":
+        """
+        Returns a new listing holding only the rows matching the predicate.
+
+        Args:
+            predicate (pl.Expr): A boolean Polars expression over the listing columns.
+
+        Returns:
+            DirectoryListing: The filtered listing.
+        """
+        return DirectoryListing(self.path, self.frame.filter(predicate), self.fields)
+
+    def with_tree_sizes(self, sizes: dict[str, tuple[int, bool]]) -> "DirectoryListing":
+        """
+        Returns a new listing with recursive sizes filled in for some directories.
+
+        Args:
+            sizes (dict[str, tuple[int, bool]]): Total bytes and whether the total is final, keyed by entry name.
+
+        Returns:
+            DirectoryListing: The listing with ``tree_size`` and ``tree_size_final`` set for the given entries.
+        """
+        if not sizes:
+            return self
+        update = pl.DataFrame(
+            {
+                "name": list(sizes),
+                "tree_size": [size for size, _ in sizes.values()],
+                "tree_size_final": [final for _, final in sizes.values()],
+            },
+            schema={column: LISTING_SCHEMA[column] for column in ["name", *TREE_SIZE_COLUMNS]},
+        )
+        return DirectoryListing(self.path, self.frame.update(update, on="name"), self.fields)
+
+    def diff(self, newer: "DirectoryListing", partial: bool = False) -> ListingDelta:
+        """
+        Computes the delta that turns this listing into a newer snapshot of the same directory.
+
+        Args:
+            newer (DirectoryListing): The more recent listing.
+            partial (bool): If True, ``newer`` only holds some re-stat'ed entries and entries missing from it
+                are not reported as removed.
+
+        Returns:
+            ListingDelta: The added, changed and removed entries.
+        """
+        upserts = newer.frame.join(self.frame, on=CHANGE_COLUMNS, how="anti", nulls_equal=True)
+        known = upserts["name"].is_in(self.frame["name"])
+        removed = [] if partial else self.frame.join(newer.frame, on="name", how="anti")["name"].to_list()
+        return ListingDelta(added=upserts.filter(~known), changed=upserts.filter(known), removed=removed)
+
+    def apply(self, delta: ListingDelta) -> "DirectoryListing":
+        """
+        Returns a new listing with the delta applied, without touching the file system.
+
+        Args:
+            delta (ListingDelta): The changes to apply.
+
+        Returns:
+            DirectoryListing: The updated listing, directories first and each partition in name order.
+        """
+        if not delta:
+            return self
+        replaced = pl.concat([delta.added["name"], delta.changed["name"], pl.Series(delta.removed, dtype=pl.String)])
+        frame = pl.concat([self.frame.filter(~pl.col("name").is_in(replaced)), delta.added, delta.changed])
+        return DirectoryListing(self.path, _default_order(frame), self.fields)
+
+    def format_rows(self, columns: list[str], offset: int = 0, length: int | None = None) -> list[list[str]]:
+        """
+        Formats a slice of the listing for display.
+
+        Only the rows inside the slice are converted to strings.
+
+        Args:
+            columns (list[str]): Titles of registered columns to render, e.g. ``["Name", "Size", "Changed"]``.
+            offset (int): Index of the first row to render.
+            length (int | None): Number of rows to render, all remaining rows if None.
+
+        Returns:
+            list[list[str]]: One list of cell strings per rendered row.
+        """
+        window = self.frame.slice(offset, length)
+        expressions = [COLUMN_PROVIDERS[title].formatter(window) for title in columns if title in COLUMN_PROVIDERS]
+        if not expressions:
+            return [[] for _ in range(window.height)]
+        return [list(row) for row in window.select(expressions).rows()]
+
+
+def _default_order(frame: pl.DataFrame) -> pl.DataFrame:
+    return frame.sort("is_dir", "sort_name", "name", descending=[True, False, False], maintain_order=True)
+
+
+def _sort_key_columns() -> list[pl.Expr]:
+    digit_run = pl.element().str.contains(r"^\d")
+    natural = (
+        pl.col("name")
+        .str.to_lowercase()
+        .str.extract_all(r"\d+|\D+")
+        .list.eval(pl.when(digit_run).then(pl.element().str.zfill(NATURAL_DIGITS)).otherwise(pl.element()))
+        .list.join("")
+    )
+    # hidden files like ".bashrc" have no extension, neither do directories
+    extension = pl.col("name").str.extract(r"^.+\.([^.]+)$").str.to_lowercase()
+    return [
+        natural.alias("sort_name"),
+        pl.when(pl.col("is_dir")).then(pl.lit("")).otherwise(extension.fill_null("")).alias("extension"),
+    ]
@@ -0,0 +1,345 @@
+"""
+File previews that never load whole files.
+
+Text is read straight from a memory mapping, by byte range or by line. Line positions come from a sparse index
+holding the number of line breaks before every block of the file; it is built by counting line breaks block by
+block, only as far as the requested lines, so the first page of a multi-GB log is shown without reading the rest.
+
+Image thumbnails are rendered by a process pool and stored in a disk cache keyed by a hash of the image content,
+so renamed or copied images share their thumbnail. The cache is trimmed to a size limit, least recently used
+thumbnails first. Thumbnails need the optional Pillow package.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import mmap
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails are optional
+    Image = None  # type: ignore[assignment]
+
+DEFAULT_THUMBNAIL_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "yaafc", "thumbnails"
+)
+# bytes of a file whose line breaks are counted in one go, the granularity of the line index
+BLOCK_SIZE = 1024 * 1024
+# lines longer than this are cut when returned by TextPreview.lines
+MAX_LINE_LENGTH = 64 * 1024
+# bytes of an image read at a time while hashing it
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class TextPreview:
+    """
+    Random access to the bytes and lines of a file of any size.
+
+    The file is mapped once when the preview is created; later changes to its length are not seen. A preview
+    handed out by ``PreviewService.text`` may be shared, so every holder closes it once and the mapping is
+    released with the last one.
+
+    Attributes:
+        path (str): The previewed file
+        size (int): Length of the file in bytes when the preview was created
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self.size = os.fstat(file.fileno()).st_size
+            self._content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        # _breaks[i] is the number of line breaks before block i
+        self._breaks = [0]
+        self._lock = threading.Lock()
+        self._references = 1
+
+    def __enter__(self) -> "TextPreview":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Gives up one reference, the memory mapping is released with the last one."""
+        with self._lock:
+            self._references -= 1
+            if self._references == 0 and isinstance(self._content, mmap.mmap):
+                self._content.close()
+
+    def _acquire(self) -> "TextPreview":
+        with self._lock:
+            self._references += 1
+        return self
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Returns up to ``length`` bytes starting at ``offset``."""
+        return self._content[max(offset, 0) : max(offset, 0) + max(length, 0)]
+
+    def line_offset(self, line: int) -> int | None:
+        """
+        Finds where a line starts.
+
+        Args:
+            line (int): Zero-based line number.
+
+        Returns:
+            int | None: The byte offset of the line, None if the file has fewer lines.
+        """
+        if line <= 0:
+            return 0 if line == 0 else None
+        # the line starts after the line-th line break, find the block holding that break
+        block = self._index_until(line)
+        if block is None:
+            return None
+        position = block * BLOCK_SIZE - 1
+        for _ in range(line - self._breaks[block]):
+            position = self._content.find(b"\n", position + 1)
+        start = position + 1
+        return start if start < self.size else None
+
+    def lines(self, start: int, count: int) -> list[str]:
+        """
+        Returns a page of lines without their line breaks.
+
+        Args:
+            start (int): Zero-based number of the first line.
+            count (int): Maximum number of lines to return.
+
+        Returns:
+            list[str]: The lines, decoded as UTF-8 with invalid bytes replaced and cut at ``MAX_LINE_LENGTH``.
+        """
+        position = self.line_offset(start)
+        lines: list[str] = []
+        while position is not None and position < self.size and len(lines) < count:
+            end = self._content.find(b"\n", position)
+            end = self.size if end == -1 else end
+            line = self._content[position : min(end, position + MAX_LINE_LENGTH)]
+            lines.append(line.decode(errors="replace").removesuffix("\r"))
+            position = end + 1
+        return lines
+
+    def line_count(self) -> int:
+        """Number of lines of the file, counting a last line without line break."""
+        self._index_until(None)
+        breaks = self._breaks[-1]
+        ends_with_break = self.size > 0 and self._content[self.size - 1 : self.size] == b"\n"
+        return breaks if ends_with_break or self.size == 0 else breaks + 1
+
+    def _index_until(self, line_break: int | None) -> int | None:
+        # extends the index until it covers the given line break, or the whole file if None,
+        # and returns the block holding that line break
+        with self._lock:
+            while line_break is None or self._breaks[-1] < line_break:
+                start = (len(self._breaks) - 1) * BLOCK_SIZE
+                if start >= self.size:
+                    break
+                self._breaks.append(self._breaks[-1] + self._content[start : start + BLOCK_SIZE].count(b"\n"))
+            if line_break is None or self._breaks[-1] < line_break:
+                return None
+            return bisect.bisect_left(self._breaks, line_break) - 1
+
+
+class PreviewService:
+    """
+    Hands out text previews and image thumbnails.
+
+    Text previews are kept open per file version, so paging through a file reuses its line index. The least
+    recently used preview is dropped once more than ``max_open`` are kept; it stays usable until the last
+    session holding it closed it.
+
+    Attributes:
+        cache_dir (str): Directory of the thumbnail cache
+        max_cache_bytes (int): The thumbnail cache is trimmed to this size
+        max_workers (int): Number of processes rendering thumbnails
+        max_open (int): Number of text previews kept open
+        max_digests (int): Number of image versions whose content hash is remembered
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_THUMBNAIL_DIR,
+        max_cache_bytes: int = 256 * 1024 * 1024,
+        max_workers: int = 2,
+        max_open: int = 16,
+        max_digests: int = 4096,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self.max_workers = max_workers
+        self.max_open = max_open
+        self.max_digests = max_digests
+        self._texts: OrderedDict[tuple[str, int, int], TextPreview] = OrderedDict()
+        # content hashes of image versions already rendered, saves hashing an image again; least recently used first
+        self._digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._cache_bytes: int | None = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def text(self, path: str) -> TextPreview:
+        """
+        Returns a preview of the current version of a text file, to be closed by the caller when done with it.
+
+        Raises:
+            OSError: If the file cannot be opened.
+        """
+        key = _version(path)
+        with self._lock:
+            preview = self._texts.get(key)
+            if preview is not None:
+                self._texts.move_to_end(key)
+                return preview._acquire()
+        preview = TextPreview(path)
+        with self._lock:
+            cached = self._texts.setdefault(key, preview)
+            self._texts.move_to_end(key)
+            evicted = [self._texts.popitem(last=False)[1] for _ in range(len(self._texts) - self.max_open)]
+            cached._acquire()
+        if cached is not preview:
+            # opened concurrently by another session
+            preview.close()
+        # the cache holds one reference of its own, dropped on eviction
+        for dropped in evicted:
+            dropped.close()
+        return cached
+
+    async def thumbnail(self, path: str, size: int = 256) -> str | None:
+        """
+        Renders or looks up the thumbnail of an image.
+
+        Args:
+            path (str): The image.
+            size (int): Maximum width and height of the thumbnail in pixels.
+
+        Returns:
+            str | None: Path of the PNG thumbnail in the cache, None if Pillow is not installed or the file is
+                not an image it can read.
+        """
+        if Image is None:
+            return None
+        try:
+            key = _version(path)
+        except OSError:
+            return None
+        digest = self._digests.get(key)
+        if digest is not None:
+            self._digests.move_to_end(key)
+            target = _thumbnail_path(self.cache_dir, digest, size)
+            if os.path.exists(target):
+                # the access time may not be updated by the file system, the mtime orders the eviction
+                os.utime(target)
+                return target
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._get_executor(), render_thumbnail, path, self.cache_dir, size)
+        if result is None:
+            return None
+        digest, target, written = result
+        self._digests[key] = digest
+        while len(self._digests) > self.max_digests:
+            self._digests.popitem(last=False)
+        if written:
+            await loop.run_in_executor(None, self._trim, written)
+        return target
+
+    def shutdown(self) -> None:
+        """Stops the thumbnail workers and closes all text previews."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            texts, self._texts = self._texts, OrderedDict()
+        for preview in texts.values():
+            preview.close()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _trim(self, added: int) -> None:
+        # removes the least recently used thumbnails once the cache outgrew its limit
+        with self._lock:
+            if self._cache_bytes is None:
+                self._cache_bytes = sum(size for _, size, _ in _cached_files(self.cache_dir))
+            else:
+                self._cache_bytes += added
+            if self._cache_bytes <= self.max_cache_bytes:
+                return
+            for path, size, _ in sorted(_cached_files(self.cache_dir), key=lambda cached: cached[2]):
+                if self._cache_bytes <= self.max_cache_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                self._cache_bytes -= size
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context(method))
+            return self._executor
+
+
+def render_thumbnail(path: str, cache_dir: str, size: int) -> tuple[str, str, int] | None:
+    """
+    Renders the thumbnail of an image into the cache unless it is cached already.
+
+    Args:
+        path (str): The image.
+        cache_dir (str): Directory of the thumbnail cache.
+        size (int): Maximum width and height of the thumbnail in pixels.
+
+    Returns:
+        tuple[str, str, int] | None: Content hash of the image, path of the thumbnail and the number of bytes
+            written to the cache, which is 0 if the thumbnail existed. None if the image cannot be read.
+    """
+    if Image is None:
+        return None
+    try:
+        content_hash = hashlib.sha256()
+        with open(path, "rb") as file:
+            while chunk := file.read(HASH_CHUNK_SIZE):
+                content_hash.update(chunk)
+        digest = content_hash.hexdigest()
+        target = _thumbnail_path(cache_dir, digest, size)
+        if os.path.exists(target):
+            os.utime(target)
+            return digest, target, 0
+        with Image.open(path) as image:
+            image.thumbnail((size, size))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # written under a temporary name, so readers never see a partial thumbnail
+            temporary = f"{target}.{os.getpid()}.tmp"
+            image.save(temporary, "PNG")
+        os.replace(temporary, target)
+        return digest, target, os.path.getsize(target)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def _thumbnail_path(cache_dir: str, digest: str, size: int) -> str:
+    # two-level fan-out keeps directories small
+    return os.path.join(cache_dir, digest[:2], f"{digest}-{size}.png")
+
+
+def _cached_files(cache_dir: str) -> list[tuple[str, int, float]]:
+    files = []
+    for directory, _, names in os.walk(cache_dir):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, stat_result.st_size, stat_result.st_mtime))
+    return files
+
+
+def _version(path: str) -> tuple[str, int, int]:
+    stat_result = os.stat(path)
+    return os.path.abspath(path), stat_result.st_mtime_ns, stat_result.st_size
+
+
+preview_service = PreviewService()
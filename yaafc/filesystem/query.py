@@ -0,0 +1,312 @@
+"""
+Sort and filter engine for directory listings.
+
+Sorting runs on key columns precomputed once per scan (natural name order and lower case extension, see
+``DirectoryListing.from_scan``), so re-sorting a listing is a single vectorized Polars sort that neither stats
+entries nor creates Python objects per row. Filters are translated into Polars expressions as well.
+"""
+
+import abc
+import dataclasses
+import datetime
+import fnmatch
+import re
+from collections.abc import Callable
+from typing import TypeVar
+
+import polars as pl
+
+from yaafc.filesystem.listing import LISTING_SCHEMA, DirectoryListing
+
+# listing columns ordering each sort key, all in the direction of the key
+SORT_COLUMNS: dict[str, list[str]] = {
+    "name": ["sort_name", "name"],
+    "extension": ["extension"],
+    # calculated directory sizes take precedence, files have none
+    "size": ["tree_size", "size"],
+    "mtime": ["mtime"],
+    "mode": ["mode"],
+    "owner": ["owner"],
+    "group": ["group"],
+    "mime": ["mime"],
+}
+# columns breaking remaining ties, always ascending
+TIE_BREAK_COLUMNS = ["sort_name", "name"]
+
+Bound = TypeVar("Bound", int, datetime.datetime)
+
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4, "p": 1024**5}
+_SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([kmgtp]?)(?:i?b)?$", re.IGNORECASE)
+
+
+class InvalidFilterError(ValueError):
+    def __init__(self, text: str, reason: str) -> None:
+        super().__init__(f"invalid filter {text!r}: {reason}")
+
+
+class UnknownSortKeyError(ValueError):
+    def __init__(self, key: str) -> None:
+        super().__init__(f"unknown sort key {key!r}, expected one of {sorted(SORT_COLUMNS)}")
+
+
+class UnreadableSizeError(ValueError):
+    def __init__(self, text: str) -> None:
+        super().__init__(f"cannot read size {text!r}")
+
+
+@dataclasses.dataclass(frozen=True)
+class SortKey:
+    """
+    One level of a multi-key sort.
+
+    Attributes:
+        key (str): One of the keys of ``SORT_COLUMNS``
+        descending (bool): Sort order of this level
+    """
+
+    key: str = "name"
+    descending: bool = False
+
+
+class ListingFilter(abc.ABC):
+    """Base class of the listing filters, each one translates into a boolean Polars expression."""
+
+    @abc.abstractmethod
+    def expression(self) -> pl.Expr:
+        """The boolean expression selecting the entries kept by the filter."""
+
+
+@dataclasses.dataclass(frozen=True)
+class GlobFilter(ListingFilter):
+    """
+    Keeps entries whose name matches a shell-style pattern like ``*.py`` or ``report-[0-9]*``.
+
+    Attributes:
+        pattern (str): The glob pattern, matched against the whole name
+        case_sensitive (bool): Whether letter case must match
+    """
+
+    pattern: str
+    case_sensitive: bool = False
+
+    def expression(self) -> pl.Expr:
+        # fnmatch emits Python only syntax: \Z anchors and atomic groups, which only prevent backtracking
+        regex = "^" + fnmatch.translate(self.pattern).replace(r"\Z", r"\z").replace("(?>", "(?:")
+        return pl.col("name").str.contains(regex if self.case_sensitive else "(?i)" + regex)
+
+
+@dataclasses.dataclass(frozen=True)
+class RegexFilter(ListingFilter):
+    """
+    Keeps entries whose name contains a match of a regular expression.
+
+    Attributes:
+        pattern (str): The regular expression, in the syntax of the Rust regex crate
+        case_sensitive (bool): Whether letter case must match
+    """
+
+    pattern: str
+    case_sensitive: bool = True
+
+    def expression(self) -> pl.Expr:
+        return pl.col("name").str.contains(self.pattern if self.case_sensitive else "(?i)" + self.pattern)
+
+
+@dataclasses.dataclass(frozen=True)
+class SizeFilter(ListingFilter):
+    """
+    Keeps entries whose size lies within the given bounds.
+
+    Attributes:
+        minimum (int | None): Smallest size in bytes, inclusive
+        maximum (int | None): Largest size in bytes, inclusive
+    """
+
+    minimum: int | None = None
+    maximum: int | None = None
+
+    def expression(self) -> pl.Expr:
+        return _between(pl.col("size"), self.minimum, self.maximum)
+
+
+@dataclasses.dataclass(frozen=True)
+class DateFilter(ListingFilter):
+    """
+    Keeps entries modified within the given time range.
+
+    Attributes:
+        after (datetime.datetime | None): Earliest modification time, inclusive
+        before (datetime.datetime | None): Latest modification time, exclusive
+    """
+
+    after: datetime.datetime | None = None
+    before: datetime.datetime | None = None
+
+    def expression(self) -> pl.Expr:
+        expression = pl.lit(True)
+        if self.after is not None:
+            expression = expression & (pl.col("mtime") >= _as_utc(self.after))
+        if self.before is not None:
+            expression = expression & (pl.col("mtime") < _as_utc(self.before))
+        return expression & pl.col("mtime").is_not_null()
+
+
+@dataclasses.dataclass(frozen=True)
+class ListingQuery:
+    """
+    Sort order and filters applied to a listing before it is displayed.
+
+    Attributes:
+        sort (tuple[SortKey, ...]): Sort levels, the first one being the most significant
+        directories_first (bool): Keep directories above files regardless of the sort keys
+        filters (tuple[ListingFilter, ...]): Filters an entry must all pass
+        filter_directories (bool): Apply the filters to directories too, otherwise directories are always kept
+    """
+
+    sort: tuple[SortKey, ...] = (SortKey(),)
+    directories_first: bool = True
+    filters: tuple[ListingFilter, ...] = ()
+    filter_directories: bool = False
+
+    def apply(self, listing: DirectoryListing) -> DirectoryListing:
+        """
+        Filters and sorts a listing.
+
+        Args:
+            listing (DirectoryListing): The listing to query.
+
+        Returns:
+            DirectoryListing: A new listing with the matching entries in query order.
+
+        Raises:
+            InvalidFilterError: If a filter pattern is rejected by the regex engine.
+            ValueError: If a sort key is unknown.
+        """
+        by, descending = self._sort_columns()
+        frame = self._filter(listing.frame).sort(by, descending=descending, nulls_last=True, maintain_order=True)
+        return DirectoryListing(listing.path, frame, listing.fields)
+
+    def validate(self) -> None:
+        """
+        Checks the sort keys and filter patterns without querying a listing.
+
+        Raises:
+            InvalidFilterError: If a filter pattern is rejected by the regex engine.
+            ValueError: If a sort key is unknown.
+        """
+        self._sort_columns()
+        self._filter(pl.DataFrame(schema=LISTING_SCHEMA))
+
+    def _filter(self, frame: pl.DataFrame) -> pl.DataFrame:
+        if not self.filters:
+            return frame
+        predicate = pl.all_horizontal([listing_filter.expression() for listing_filter in self.filters])
+        if not self.filter_directories:
+            predicate = predicate | pl.col("is_dir")
+        try:
+            return frame.filter(predicate)
+        except pl.exceptions.ComputeError as error:
+            text = " ".join(repr(listing_filter) for listing_filter in self.filters)
+            raise InvalidFilterError(text, str(error).splitlines()[0]) from error
+
+    def _sort_columns(self) -> tuple[list[str], list[bool]]:
+        by: list[str] = ["is_dir"] if self.directories_first else []
+        descending: list[bool] = [True] if self.directories_first else []
+        for sort_key in self.sort:
+            if sort_key.key not in SORT_COLUMNS:
+                raise UnknownSortKeyError(sort_key.key)
+            for column in SORT_COLUMNS[sort_key.key]:
+                if column not in by:
+                    by.append(column)
+                    descending.append(sort_key.descending)
+        for column in TIE_BREAK_COLUMNS:
+            if column not in by:
+                by.append(column)
+                descending.append(False)
+        return by, descending
+
+
+def parse_filter(text: str) -> tuple[ListingFilter, ...]:
+    """
+    Parses the filter field of a file panel into filters.
+
+    Terms are separated by whitespace and must all match. ``re:<regex>`` filters by regular expression,
+    ``size:>10M``, ``size:<1k`` and ``size:1k..2M`` by size, ``date:>2024-01-31``, ``date:<2024-02-01`` and
+    ``date:2024-01-01..2024-02-01`` by modification date. Any other term is a glob pattern; without wildcards
+    it matches names containing it.
+
+    Args:
+        text (str): The filter text.
+
+    Returns:
+        tuple[ListingFilter, ...]: The parsed filters, empty for blank text.
+
+    Raises:
+        InvalidFilterError: If a size or date term cannot be parsed.
+    """
+    filters: list[ListingFilter] = []
+    for term in text.split():
+        kind, _, argument = term.partition(":")
+        if kind == "re" and argument:
+            filters.append(RegexFilter(argument))
+        elif kind == "size" and argument:
+            minimum, maximum = _parse_range(term, argument, _parse_size)
+            filters.append(SizeFilter(minimum, maximum))
+        elif kind == "date" and argument:
+            after, before = _parse_range(term, argument, _parse_date)
+            if before is not None and not argument.startswith("<"):
+                # a single day and the end of a range include the whole day
+                before += datetime.timedelta(days=1)
+            filters.append(DateFilter(after, before))
+        elif any(wildcard in term for wildcard in "*?["):
+            filters.append(GlobFilter(term))
+        else:
+            filters.append(GlobFilter(f"*{glob_escape(term)}*"))
+    return tuple(filters)
+
+
+def glob_escape(text: str) -> str:
+    """Escapes the glob wildcards in ``text`` so it matches literally."""
+    return re.sub(r"([*?[])", r"[\1]", text)
+
+
+def _parse_range(term: str, argument: str, parse: Callable[[str], Bound]) -> tuple[Bound | None, Bound | None]:
+    try:
+        if argument.startswith(">"):
+            return parse(argument[1:]), None
+        if argument.startswith("<"):
+            return None, parse(argument[1:])
+        if ".." in argument:
+            low, _, high = argument.partition("..")
+            return parse(low) if low else None, parse(high) if high else None
+        value = parse(argument)
+    except ValueError as error:
+        raise InvalidFilterError(term, str(error)) from error
+    else:
+        return value, value
+
+
+def _parse_size(text: str) -> int:
+    match = _SIZE_PATTERN.match(text.strip())
+    if match is None:
+        raise UnreadableSizeError(text)
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def _parse_date(text: str) -> datetime.datetime:
+    return _as_utc(datetime.datetime.fromisoformat(text))
+
+
+def _as_utc(moment: datetime.datetime) -> datetime.datetime:
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(datetime.timezone.utc)
+
+
+def _between(column: pl.Expr, minimum: int | None, maximum: int | None) -> pl.Expr:
+    expression = column.is_not_null()
+    if minimum is not None:
+        expression = expression & (column >= minimum)
+    if maximum is not None:
+        expression = expression & (column <= maximum)
+    return expression
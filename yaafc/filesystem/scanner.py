@@ -0,0 +1,251 @@
+"""
+Directory scanner building listings from a single ``os.scandir`` pass.
+
+Every entry is classified through the ``d_type`` cached on its ``os.DirEntry`` and stat'ed at most once, so
+a listing costs one ``getdents`` sweep plus one ``stat`` per entry instead of several syscalls per column.
+
+What is collected beyond names and types is selected by a set of raw data fields. A scan for the ``Name``
+column alone needs no ``stat`` call at all, and owner or group names are only resolved when a visible column
+asks for them.
+"""
+
+import dataclasses
+import functools
+import mimetypes
+import os
+import stat
+
+try:
+    import grp
+    import pwd
+except ImportError:  # not available on Windows
+    grp = None  # type: ignore[assignment]
+    pwd = None  # type: ignore[assignment]
+
+# raw data fields a scan can collect, see yaafc.filesystem.columns for the columns requiring them
+STAT = "stat"
+OWNER = "owner"
+GROUP = "group"
+MIME = "mime"
+XATTRS = "xattrs"
+
+ALL_FIELDS: frozenset[str] = frozenset({STAT, OWNER, GROUP, MIME, XATTRS})
+DEFAULT_FIELDS: frozenset[str] = frozenset({STAT})
+
+DIRECTORY_MIME_TYPE = "inode/directory"
+
+
+@functools.lru_cache(maxsize=1024)
+def user_name(uid: int) -> str:
+    """
+    Resolves a user id to its login name, memoized per uid.
+
+    Args:
+        uid (int): The user id.
+
+    Returns:
+        str: The login name, or the id itself if it has no passwd entry.
+    """
+    if pwd is None:
+        return str(uid)
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@functools.lru_cache(maxsize=1024)
+def group_name(gid: int) -> str:
+    """
+    Resolves a group id to its name, memoized per gid.
+
+    Args:
+        gid (int): The group id.
+
+    Returns:
+        str: The group name, or the id itself if it has no group entry.
+    """
+    if grp is None:
+        return str(gid)
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+@dataclasses.dataclass
+class ScanResult:
+    """
+    Compact column-oriented row store of one directory scan.
+
+    Each attribute holds one value per entry, rows are sorted by name. Stat based columns are ``None`` for
+    entries that vanished or could not be stat'ed between the directory read and the stat call, and for all
+    entries if the corresponding field was not requested.
+
+    Attributes:
+        path (str): The scanned directory
+        fields (frozenset[str]): The raw data fields collected besides name and type
+        name (list[str]): Entry names
+        is_dir (list[bool]): True if the entry is a directory (symlinks are followed)
+        size (list[int | None]): Size in bytes
+        mtime (list[float | None]): Modification time as POSIX timestamp
+        mode (list[int | None]): File mode bits
+        uid (list[int | None]): Owner user id
+        gid (list[int | None]): Owner group id
+        inode (list[int | None]): Inode number
+        owner (list[str | None]): Owner login name
+        group (list[str | None]): Owner group name
+        mime (list[str | None]): MIME type guessed from the name
+        xattrs (list[str | None]): Comma separated names of the extended attributes
+    """
+
+    path: str
+    fields: frozenset[str] = DEFAULT_FIELDS
+    name: list[str] = dataclasses.field(default_factory=list)
+    is_dir: list[bool] = dataclasses.field(default_factory=list)
+    size: list[int | None] = dataclasses.field(default_factory=list)
+    mtime: list[float | None] = dataclasses.field(default_factory=list)
+    mode: list[int | None] = dataclasses.field(default_factory=list)
+    uid: list[int | None] = dataclasses.field(default_factory=list)
+    gid: list[int | None] = dataclasses.field(default_factory=list)
+    inode: list[int | None] = dataclasses.field(default_factory=list)
+    owner: list[str | None] = dataclasses.field(default_factory=list)
+    group: list[str | None] = dataclasses.field(default_factory=list)
+    mime: list[str | None] = dataclasses.field(default_factory=list)
+    xattrs: list[str | None] = dataclasses.field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    @property
+    def directories(self) -> list[int]:
+        """Row indices of all directory entries, in name order."""
+        return [index for index, is_dir in enumerate(self.is_dir) if is_dir]
+
+    @property
+    def files(self) -> list[int]:
+        """Row indices of all non-directory entries, in name order."""
+        return [index for index, is_dir in enumerate(self.is_dir) if not is_dir]
+
+    def append(self, entry: os.DirEntry) -> None:
+        """
+        Appends one directory entry, reusing its cached type and stat information.
+
+        Args:
+            entry (os.DirEntry): The entry as returned by ``os.scandir``.
+        """
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        stat_result: os.stat_result | None = None
+        if self._needs_stat:
+            try:
+                stat_result = entry.stat()
+            except OSError:
+                # dangling symlinks or entries removed since the directory was read
+                stat_result = None
+
+        self._append_row(entry.name, is_dir, stat_result)
+
+    def append_path(self, name: str) -> bool:
+        """
+        Appends the entry ``name`` of the scanned directory by stat'ing its path.
+
+        Args:
+            name (str): Name of the entry inside ``path``.
+
+        Returns:
+            bool: False if the entry does not exist (anymore), in which case nothing is appended.
+        """
+        entry_path = os.path.join(self.path, name)
+        try:
+            stat_result: os.stat_result | None = os.stat(entry_path)
+        except FileNotFoundError:
+            if not os.path.lexists(entry_path):
+                return False
+            stat_result = None
+        except OSError:
+            stat_result = None
+        is_dir = stat_result is not None and stat.S_ISDIR(stat_result.st_mode)
+        # the type always needs a stat call here, its values are only kept if requested
+        self._append_row(name, is_dir, stat_result if self._needs_stat else None)
+        return True
+
+    @property
+    def _needs_stat(self) -> bool:
+        return bool(self.fields & {STAT, OWNER, GROUP})
+
+    def _append_row(self, name: str, is_dir: bool, stat_result: os.stat_result | None) -> None:
+        self.name.append(name)
+        self.is_dir.append(is_dir)
+        self.mime.append(_guess_mime(name, is_dir) if MIME in self.fields else None)
+        self.xattrs.append(_list_xattrs(os.path.join(self.path, name)) if XATTRS in self.fields else None)
+        if stat_result is None:
+            for column in (self.size, self.mtime, self.mode, self.uid, self.gid, self.inode, self.owner, self.group):
+                column.append(None)
+            return
+        self.size.append(stat_result.st_size)
+        self.mtime.append(stat_result.st_mtime)
+        self.mode.append(stat_result.st_mode)
+        self.uid.append(stat_result.st_uid)
+        self.gid.append(stat_result.st_gid)
+        self.inode.append(stat_result.st_ino)
+        self.owner.append(user_name(stat_result.st_uid) if OWNER in self.fields else None)
+        self.group.append(group_name(stat_result.st_gid) if GROUP in self.fields else None)
+
+
+def _guess_mime(name: str, is_dir: bool) -> str | None:
+    if is_dir:
+        return DIRECTORY_MIME_TYPE
+    return mimetypes.guess_type(name, strict=False)[0]
+
+
+def _list_xattrs(path: str) -> str | None:
+    if not hasattr(os, "listxattr"):
+        return None
+    try:
+        return ", ".join(sorted(os.listxattr(path)))
+    except OSError:
+        return None
+
+
+def scan_directory(path: str | os.PathLike[str], fields: frozenset[str] = DEFAULT_FIELDS) -> ScanResult:
+    """
+    Scans a directory in one ``os.scandir`` pass.
+
+    Args:
+        path (str | os.PathLike[str]): The directory to scan.
+        fields (frozenset[str]): The raw data fields to collect.
+
+    Returns:
+        ScanResult: The entries of the directory, sorted by name.
+
+    Raises:
+        OSError: If the directory cannot be opened.
+    """
+    with os.scandir(path) as iterator:
+        entries = sorted(iterator, key=lambda entry: entry.name)
+    result = ScanResult(path=os.fspath(path), fields=frozenset(fields))
+    for entry in entries:
+        result.append(entry)
+    return result
+
+
+def stat_entries(
+    path: str | os.PathLike[str], names: list[str], fields: frozenset[str] = DEFAULT_FIELDS
+) -> tuple[ScanResult, list[str]]:
+    """
+    Stats selected entries of a directory without reading the whole directory.
+
+    Args:
+        path (str | os.PathLike[str]): The directory holding the entries.
+        names (list[str]): Names of the entries to stat.
+        fields (frozenset[str]): The raw data fields to collect.
+
+    Returns:
+        tuple[ScanResult, list[str]]: The existing entries sorted by name, and the names that no longer exist.
+    """
+    result = ScanResult(path=os.fspath(path), fields=frozenset(fields))
+    missing = [name for name in sorted(set(names)) if not result.append_path(name)]
+    return result, missing
@@ -0,0 +1,446 @@
+"""
+Persistent filename index for fast searches below configured roots.
+
+Only the configured roots are indexed, in a background thread, and mount points of kernel pseudo-filesystems such
+as /proc and /sys are left out. Directories outside the roots, or below a root whose first indexing has not
+finished yet, are searched by walking them. Paths are kept in a local SQLite database: one row per directory with the
+mtime it had when it was last read, and one row per entry with its name. Entry names are indexed by an FTS5 table
+with the trigram tokenizer, so substring and glob queries are answered from the index instead of walking the tree.
+
+Updating a root stats every indexed directory but only lists the directories whose mtime changed, since adding,
+removing or renaming an entry always touches the mtime of its parent. Searches read the index while an update
+writes to it, and return what was indexed so far. Patterns without three consecutive literal characters give the
+trigram index nothing to look up, so they are matched against the entries below the searched directory instead.
+"""
+
+import asyncio
+import contextlib
+import fnmatch
+import os
+import re
+import sqlite3
+import stat
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Generator, Iterator, Sequence
+
+from yaafc.filesystem.query import glob_escape
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.environ.get("XDG_STATE_HOME", os.path.join(os.path.expanduser("~"), ".local", "state")), "yaafc", "search.db"
+)
+# directories kept in the index, separated like PATH
+DEFAULT_INDEX_ROOTS = os.environ.get("YAAFC_SEARCH_ROOTS", os.path.expanduser("~")).split(os.pathsep)
+
+# kernel file systems whose entries are generated on access and change all the time
+PSEUDO_FILESYSTEMS = frozenset({
+    "autofs",
+    "binfmt_misc",
+    "bpf",
+    "cgroup",
+    "cgroup2",
+    "configfs",
+    "debugfs",
+    "devpts",
+    "devtmpfs",
+    "efivarfs",
+    "fusectl",
+    "hugetlbfs",
+    "mqueue",
+    "nsfs",
+    "proc",
+    "pstore",
+    "rpc_pipefs",
+    "securityfs",
+    "selinuxfs",
+    "sysfs",
+    "tracefs",
+})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY, refreshed REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS directories (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, mtime_ns INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    directory INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    UNIQUE (directory, name)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(name, content='entries', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO names (rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO names (names, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+"""
+
+# directories read between two commits of an update
+_COMMIT_BATCH = 500
+
+
+class FilenameIndex:
+    """
+    Trigram index of the file and directory names below a set of roots.
+
+    Attributes:
+        database (str): Path of the SQLite database file, created on first use
+        configured_roots (list[str]): Directories ``ensure`` indexes when a search below them needs it
+        refresh_interval (float): Seconds after which ``ensure`` updates a root again in the background
+        batch_size (int): Number of paths yielded per search batch
+    """
+
+    def __init__(
+        self,
+        database: str = DEFAULT_INDEX_PATH,
+        configured_roots: Sequence[str] = DEFAULT_INDEX_ROOTS,
+        refresh_interval: float = 60.0,
+        batch_size: int = 500,
+    ):
+        self.database = database
+        self.configured_roots = [os.path.abspath(root) for root in configured_roots if root]
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self._created = False
+        # one writer at a time; readers are not blocked thanks to the write-ahead log
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+
+    def roots(self) -> list[str]:
+        """The indexed roots."""
+        with contextlib.closing(self._connect()) as connection:
+            return [path for (path,) in connection.execute("SELECT path FROM roots ORDER BY path")]
+
+    def root_of(self, path: str) -> str | None:
+        """Returns the indexed root containing ``path``, or None if it is not indexed."""
+        path = os.path.abspath(path)
+        for root in self.roots():
+            if _is_below(path, root):
+                return root
+        return None
+
+    def add_root(self, path: str) -> str:
+        """
+        Indexes a directory tree and keeps it up to date with ``update``.
+
+        Roots nested in the new root are merged into it; their directories are reused as they are.
+
+        Args:
+            path (str): The directory to index.
+
+        Returns:
+            str: The root now covering ``path``, which is an existing root if one contains ``path`` already.
+
+        Raises:
+            NotADirectoryError: If ``path`` is not a directory.
+        """
+        root = self.root_of(path)
+        if root is not None:
+            return root
+        root = self._register_root(path)
+        self.update(root)
+        return root
+
+    def remove_root(self, root: str) -> None:
+        """Drops a root and everything indexed below it."""
+        root = os.path.abspath(root)
+        with self._write_lock, contextlib.closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM roots WHERE path = ?", (root,))
+            _delete_tree(connection, root)
+
+    def ensure(self, path: str) -> str | None:
+        """
+        Starts indexing or updating the root covering ``path`` in the background, without blocking.
+
+        The configured root containing ``path`` becomes an indexed root on the first search below it; a root
+        older than ``refresh_interval`` is updated. Searches answer from the index once its first update finished
+        and pick up later changes once an update committed them.
+
+        Args:
+            path (str): The directory to search in.
+
+        Returns:
+            str | None: The root covering ``path``, None if ``path`` is outside the configured roots.
+        """
+        path = os.path.abspath(path)
+        root = self.root_of(path)
+        if root is None:
+            configured = [root for root in self.configured_roots if _is_below(path, root) and os.path.isdir(root)]
+            if not configured:
+                return None
+            root = self._register_root(min(configured, key=len))
+        refreshed = self._refreshed(root)
+        with self._lock:
+            stale = time.time() - refreshed >= self.refresh_interval and root not in self._refreshing
+            if stale:
+                self._refreshing.add(root)
+        if stale:
+            threading.Thread(target=self._refresh, args=(root,), name="yaafc-search-index", daemon=True).start()
+        return root
+
+    def update(self, root: str) -> int:
+        """
+        Brings the index of a root in line with the file system, blocking the calling thread.
+
+        Args:
+            root (str): An indexed root.
+
+        Returns:
+            int: Number of directories that were listed because they changed.
+        """
+        root = os.path.abspath(root)
+        listed = 0
+        skipped = pseudo_filesystem_mounts()
+        with self._write_lock, contextlib.closing(self._connect()) as connection:
+            stack = [root]
+            while stack:
+                path = stack.pop()
+                try:
+                    stat_result = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    _delete_tree(connection, path)
+                    continue
+                if not stat.S_ISDIR(stat_result.st_mode) or path in skipped:
+                    _delete_tree(connection, path)
+                    continue
+                row = connection.execute("SELECT id, mtime_ns FROM directories WHERE path = ?", (path,)).fetchone()
+                if row is not None and row[1] == stat_result.st_mtime_ns:
+                    stack.extend(_subdirectories(connection, path, row[0]))
+                    continue
+                stack.extend(_update_directory(connection, path, stat_result.st_mtime_ns, row))
+                listed += 1
+                if listed % _COMMIT_BATCH == 0:
+                    connection.commit()
+            connection.execute("UPDATE roots SET refreshed = ? WHERE path = ?", (time.time(), root))
+            connection.commit()
+        return listed
+
+    def search(self, pattern: str, directory: str) -> Generator[list[str], None, None]:
+        """
+        Finds the entries below ``directory`` whose name matches ``pattern``.
+
+        Args:
+            pattern (str): A glob like ``*.py`` or plain text matched as a substring, both case-insensitive.
+            directory (str): The directory to search in; only indexed entries are found, see ``ensure``.
+
+        Yields:
+            list[str]: Batches of at most ``batch_size`` paths relative to ``directory``.
+        """
+        directory = os.path.abspath(directory)
+        glob = pattern if any(wildcard in pattern for wildcard in "*?[") else f"*{glob_escape(pattern)}*"
+        matches = re.compile(fnmatch.translate(glob.casefold())).match
+        root = self.root_of(directory)
+        if root is None or not self._refreshed(root):
+            yield from _walk(directory, matches, self.batch_size)
+            return
+        prefix = directory.rstrip(os.sep) + os.sep
+        like = _like_pattern(glob)
+        with contextlib.closing(self._connect()) as connection:
+            if max(len(literal) for literal in re.split("[%_]", like)) >= 3:
+                # the LIKE pattern is answered by the trigram index and may match too much, fnmatch has the last word
+                cursor = connection.execute(
+                    """
+                    SELECT directories.path, entries.name FROM names
+                    JOIN entries ON entries.id = names.rowid
+                    JOIN directories ON directories.id = entries.directory
+                    WHERE names.name LIKE ? AND (directories.path = ? OR directories.path BETWEEN ? AND ?)
+                    """,
+                    (like, directory, prefix, prefix + "\U0010ffff"),
+                )
+            else:
+                # too short for a trigram, go through the entries of the directories below instead of all names
+                cursor = connection.execute(
+                    """
+                    SELECT directories.path, entries.name FROM directories
+                    JOIN entries ON entries.directory = directories.id
+                    WHERE directories.path = ? OR directories.path BETWEEN ? AND ?
+                    """,
+                    (directory, prefix, prefix + "\U0010ffff"),
+                )
+            while rows := cursor.fetchmany(self.batch_size):
+                batch = [
+                    os.path.relpath(os.path.join(parent, name), directory)
+                    for parent, name in rows
+                    if matches(name.casefold())
+                ]
+                if batch:
+                    yield batch
+
+    async def stream(self, pattern: str, directory: str) -> AsyncIterator[list[str]]:
+        """
+        Runs ``search`` on a worker thread and yields its batches as they arrive.
+
+        Stopping the iteration stops the query after the batch being read.
+        """
+        loop = asyncio.get_running_loop()
+        batches = self.search(pattern, directory)
+        try:
+            while (batch := await loop.run_in_executor(None, next, batches, None)) is not None:
+                yield batch
+        finally:
+            await loop.run_in_executor(None, batches.close)
+
+    def _register_root(self, path: str) -> str:
+        root = os.path.abspath(path)
+        if not os.path.isdir(root):
+            raise NotADirectoryError(root)
+        with self._write_lock, contextlib.closing(self._connect()) as connection, connection:
+            for (nested,) in connection.execute("SELECT path FROM roots").fetchall():
+                if _is_below(nested, root):
+                    connection.execute("DELETE FROM roots WHERE path = ?", (nested,))
+            connection.execute("INSERT OR IGNORE INTO roots (path, refreshed) VALUES (?, 0)", (root,))
+        return root
+
+    def _refreshed(self, root: str) -> float:
+        # time of the last finished update of a root, 0 while its first update runs
+        with contextlib.closing(self._connect()) as connection:
+            row = connection.execute("SELECT refreshed FROM roots WHERE path = ?", (root,)).fetchone()
+        return row[0] if row is not None else 0.0
+
+    def _refresh(self, root: str) -> None:
+        try:
+            self.update(root)
+        finally:
+            with self._lock:
+                self._refreshing.discard(root)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.database) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.database, timeout=30.0, check_same_thread=False)
+        if not self._created:
+            with connection:
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.executescript(_SCHEMA)
+            self._created = True
+        return connection
+
+
+def _update_directory(
+    connection: sqlite3.Connection, path: str, mtime_ns: int, row: tuple[int, int] | None
+) -> list[str]:
+    # lists a changed directory, stores the difference to the indexed entries and returns its subdirectories
+    current: dict[str, bool] = {}
+    with contextlib.suppress(OSError), os.scandir(path) as entries:
+        for entry in entries:
+            if _storable(entry.name):
+                with contextlib.suppress(OSError):
+                    current[entry.name] = entry.is_dir(follow_symlinks=False)
+    if row is None:
+        directory_id = connection.execute(
+            "INSERT INTO directories (path, mtime_ns) VALUES (?, ?)", (path, mtime_ns)
+        ).lastrowid
+        known: dict[str, tuple[int, bool]] = {}
+    else:
+        directory_id = row[0]
+        connection.execute("UPDATE directories SET mtime_ns = ? WHERE id = ?", (mtime_ns, directory_id))
+        known = {
+            name: (entry_id, bool(is_dir))
+            for entry_id, name, is_dir in connection.execute(
+                "SELECT id, name, is_dir FROM entries WHERE directory = ?", (directory_id,)
+            )
+        }
+    for name, (entry_id, is_dir) in known.items():
+        if current.get(name) != is_dir:
+            connection.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+            if is_dir:
+                _delete_tree(connection, os.path.join(path, name))
+    connection.executemany(
+        "INSERT INTO entries (directory, name, is_dir) VALUES (?, ?, ?)",
+        [
+            (directory_id, name, is_dir)
+            for name, is_dir in current.items()
+            if name not in known or known[name][1] != is_dir
+        ],
+    )
+    return [os.path.join(path, name) for name, is_dir in current.items() if is_dir]
+
+
+def _subdirectories(connection: sqlite3.Connection, path: str, directory_id: int) -> list[str]:
+    return [
+        os.path.join(path, name)
+        for (name,) in connection.execute("SELECT name FROM entries WHERE directory = ? AND is_dir", (directory_id,))
+    ]
+
+
+def _delete_tree(connection: sqlite3.Connection, path: str) -> None:
+    # removes a directory and everything below it from the index
+    prefix = path.rstrip(os.sep) + os.sep
+    arguments = (path, prefix, prefix + "\U0010ffff")
+    connection.execute(
+        "DELETE FROM entries WHERE directory IN (SELECT id FROM directories WHERE path = ? OR path BETWEEN ? AND ?)",
+        arguments,
+    )
+    connection.execute("DELETE FROM directories WHERE path = ? OR path BETWEEN ? AND ?", arguments)
+
+
+def _walk(directory: str, matches: Callable[[str], object], batch_size: int) -> Iterator[list[str]]:
+    # searches a directory that is not indexed by listing it, leaving out pseudo-filesystems like the index does
+    skipped = pseudo_filesystem_mounts()
+    batch: list[str] = []
+    stack = [directory]
+    while stack:
+        path = stack.pop()
+        with contextlib.suppress(OSError), os.scandir(path) as entries:
+            for entry in entries:
+                with contextlib.suppress(OSError):
+                    if entry.is_dir(follow_symlinks=False) and entry.path not in skipped:
+                        stack.append(entry.path)
+                if matches(entry.name.casefold()):
+                    batch.append(os.path.relpath(entry.path, directory))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def pseudo_filesystem_mounts() -> frozenset[str]:
+    """Returns the mount points of the PSEUDO_FILESYSTEMS, empty where /proc/self/mounts does not exist."""
+    try:
+        with open("/proc/self/mounts", encoding="utf-8", errors="surrogateescape") as mounts:
+            lines = mounts.read().splitlines()
+    except OSError:
+        return frozenset()
+    # fields are device, mount point, type, ...; blanks and backslashes in mount points are escaped in octal
+    return frozenset(
+        re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), fields[1])
+        for fields in (line.split() for line in lines)
+        if len(fields) > 2 and fields[2] in PSEUDO_FILESYSTEMS
+    )
+
+
+def _storable(name: str) -> bool:
+    # names that are not valid UTF-8 come back from the file system with surrogate escapes SQLite cannot store
+    try:
+        name.encode()
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _is_below(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def _like_pattern(glob: str) -> str:
+    # a LIKE pattern matching at least everything the glob matches; classes and literal % or _ become _
+    pattern = []
+    index = 0
+    while index < len(glob):
+        character = glob[index]
+        if character == "[":
+            # as in fnmatch, a ] right after [ or [! is part of the class
+            start = index + 2 if glob[index + 1 : index + 2] == "!" else index + 1
+            end = glob.find("]", start + 1)
+            if end != -1:
+                pattern.append("_")
+                index = end + 1
+                continue
+        pattern.append({"*": "%", "?": "_", "%": "_"}.get(character, character))
+        index += 1
+    return "".join(pattern)
+
+
+filename_index = FilenameIndex()
@@ -0,0 +1,165 @@
+"""
+Single-file transfer primitives for the job engine.
+
+File contents are copied inside the kernel where possible: ``os.copy_file_range`` first (which also lets file
+systems clone extents or copy server side), then ``os.sendfile``, and only then a plain read/write loop. Copies
+report the bytes written through a callback and check a cancellation event between chunks, so a multi-GB file can
+be interrupted and later resumed at the byte it stopped at.
+"""
+
+import errno
+import os
+import shutil
+import stat
+import threading
+from collections.abc import Callable
+
+# bytes handed to the kernel per call; bounds the latency of progress reports and cancellation
+CHUNK_SIZE = 32 * 1024 * 1024
+BUFFER_SIZE = 1024 * 1024
+
+ProgressCallback = Callable[[int], None]
+
+
+class TransferCancelled(Exception):
+    def __init__(self, path: str):
+        super().__init__(f"transfer of {path} was cancelled")
+
+
+def copy_file(
+    source: str,
+    destination: str,
+    progress: ProgressCallback | None = None,
+    cancelled: threading.Event | None = None,
+    offset: int = 0,
+) -> int:
+    """
+    Copies a regular file including its permission bits and timestamps.
+
+    Args:
+        source (str): The file to copy.
+        destination (str): The path of the copy, replaced if it exists.
+        progress (ProgressCallback | None): Called with the number of bytes written after every chunk.
+        cancelled (threading.Event | None): Interrupts the copy between two chunks when set.
+        offset (int): Resume an interrupted copy: the first ``offset`` bytes of ``destination`` are kept.
+
+    Returns:
+        int: Number of bytes written by this call.
+
+    Raises:
+        TransferCancelled: If ``cancelled`` was set; the partial destination is kept for resuming.
+        OSError: If reading or writing fails.
+    """
+    with open(source, "rb") as source_file:
+        size = os.fstat(source_file.fileno()).st_size
+        flags = os.O_WRONLY | os.O_CREAT | (0 if offset else os.O_TRUNC)
+        destination_fd = os.open(destination, flags, 0o600)
+        with open(destination_fd, "wb", closefd=True) as destination_file:
+            if offset:
+                destination_file.truncate(offset)
+            written = _copy_range(
+                source_file.fileno(), destination_file.fileno(), offset, size, source, progress, cancelled
+            )
+    shutil.copystat(source, destination)
+    return written
+
+
+def copy_symlink(source: str, destination: str) -> None:
+    """
+    Recreates a symbolic link without following it.
+
+    Args:
+        source (str): The link to copy.
+        destination (str): The path of the new link, replaced if it exists.
+    """
+    target = os.readlink(source)
+    if os.path.lexists(destination):
+        os.unlink(destination)
+    os.symlink(target, destination)
+
+
+def same_device(source: str, destination_directory: str) -> bool:
+    """True if ``source`` can be renamed into ``destination_directory`` without copying."""
+    try:
+        return os.lstat(source).st_dev == os.stat(destination_directory).st_dev
+    except OSError:
+        return False
+
+
+def remove_path(path: str) -> None:
+    """
+    Removes a file, a symbolic link or an empty directory.
+
+    Args:
+        path (str): The path to remove; missing paths are ignored.
+    """
+    try:
+        if stat.S_ISDIR(os.lstat(path).st_mode):
+            os.rmdir(path)
+        else:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _copy_range(
+    source_fd: int,
+    destination_fd: int,
+    offset: int,
+    size: int,
+    path: str,
+    progress: ProgressCallback | None,
+    cancelled: threading.Event | None,
+) -> int:
+    position = offset
+    # the cheapest mechanism available is tried first and dropped for the rest of the file once unsupported
+    strategies = [_copy_file_range, _sendfile]
+    while position < size:
+        if cancelled is not None and cancelled.is_set():
+            raise TransferCancelled(path)
+        count = min(CHUNK_SIZE, size - position)
+        while strategies:
+            try:
+                copied = strategies[0](source_fd, destination_fd, position, count)
+                break
+            except OSError as error:
+                if error.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                    raise
+                strategies.pop(0)
+        else:
+            copied = _copy_buffered(source_fd, destination_fd, position, count)
+        if copied == 0:
+            # the source shrank while being copied
+            break
+        position += copied
+        if progress is not None:
+            progress(copied)
+    return position - offset
+
+
+def _copy_file_range(source_fd: int, destination_fd: int, position: int, count: int) -> int:
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    return os.copy_file_range(source_fd, destination_fd, count, position, position)
+
+
+def _sendfile(source_fd: int, destination_fd: int, position: int, count: int) -> int:
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile is not available")
+    os.lseek(destination_fd, position, os.SEEK_SET)
+    return os.sendfile(destination_fd, source_fd, position, count)
+
+
+def _copy_buffered(source_fd: int, destination_fd: int, position: int, count: int) -> int:
+    os.lseek(source_fd, position, os.SEEK_SET)
+    os.lseek(destination_fd, position, os.SEEK_SET)
+    copied = 0
+    while copied < count:
+        chunk = os.read(source_fd, min(BUFFER_SIZE, count - copied))
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(destination_fd, view) :]
+        copied += len(chunk)
+    return copied
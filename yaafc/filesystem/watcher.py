@@ -0,0 +1,356 @@
+"""
+Directory watcher keeping a listing current through small deltas.
+
+On Linux the watcher subscribes to inotify and re-stats only the entries named in the received events. On other
+platforms, or when inotify is unavailable, it falls back to polling the directory and diffing consecutive scans.
+Events arriving within ``coalesce_interval`` are merged into one delta, so directories churning hundreds of files
+per second produce a few deltas per second instead of one per file. A watcher stops once its directory is deleted or
+moved away.
+
+Panels share watchers through ``directory_watchers``: every directory shown is watched once, however many sessions
+show it, and its watcher is stopped when the last of them unsubscribes.
+"""
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from collections.abc import AsyncIterator
+from typing import Any
+
+import polars as pl
+
+from yaafc.filesystem.listing import DirectoryListing, ListingDelta
+from yaafc.filesystem.scanner import stat_entries
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+RESCAN_MASK = IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+# the watched directory is gone, or no longer at its path, and no further events arrive
+GONE_MASK = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class _Inotify:
+    """Thin ctypes wrapper around one inotify instance watching a single directory."""
+
+    def __init__(self, path: str) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def read(self) -> tuple[set[str], bool, bool]:
+        """
+        Drains all pending events.
+
+        Returns:
+            tuple[set[str], bool, bool]: Names of the touched entries, whether a full rescan is required and whether
+                the watched directory is gone.
+        """
+        names: set[str] = set()
+        rescan = False
+        gone = False
+        while True:
+            try:
+                buffer = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                return names, rescan, gone
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                gone = gone or bool(mask & GONE_MASK)
+                if mask & RESCAN_MASK:
+                    rescan = True
+                elif name:
+                    names.add(os.fsdecode(name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """
+    Watches one directory and yields deltas against a known listing.
+
+    Attributes:
+        listing (DirectoryListing): The latest snapshot, updated with every yielded delta
+        coalesce_interval (float): Seconds to collect further events before emitting a delta
+        poll_interval (float): Seconds between scans when polling instead of using inotify
+        gone (bool): True once the directory was deleted or moved away; no more deltas follow
+    """
+
+    def __init__(
+        self,
+        listing: DirectoryListing,
+        coalesce_interval: float = 0.25,
+        poll_interval: float = 1.0,
+        use_inotify: bool | None = None,
+    ) -> None:
+        self.listing = listing
+        self.coalesce_interval = coalesce_interval
+        self.poll_interval = poll_interval
+        self.gone = False
+        self._inotify: _Inotify | None = None
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        if use_inotify:
+            with contextlib.suppress(OSError, AttributeError):
+                self._inotify = _Inotify(listing.path)
+
+    @property
+    def uses_inotify(self) -> bool:
+        """True if changes are received from inotify, False if the directory is polled."""
+        return self._inotify is not None
+
+    async def deltas(self, heartbeat: float | None = None) -> AsyncIterator[ListingDelta]:
+        """
+        Yields one delta per batch of changes until the consumer stops iterating or the directory is gone.
+
+        Args:
+            heartbeat (float | None): If set, an empty delta is yielded after this many idle seconds, giving the
+                consumer a chance to stop watching even if the directory stays quiet.
+
+        Yields:
+            ListingDelta: The coalesced changes since the previous delta, already applied to ``listing``.
+        """
+        while not self.gone:
+            if self._inotify is not None:
+                delta = await self._next_inotify_delta(self._inotify, heartbeat)
+            else:
+                await asyncio.sleep(self.poll_interval)
+                delta = await asyncio.to_thread(self.rescan)
+            if delta:
+                self.listing = self.listing.apply(delta)
+                yield delta
+            elif heartbeat is not None and not self.gone:
+                yield delta
+        # the inotify watch is dead, release the instance right away
+        self.close()
+
+    def rescan(self) -> ListingDelta:
+        """
+        Scans the whole directory and diffs it against the current listing.
+
+        Returns:
+            ListingDelta: The changes found, empty if the directory vanished.
+        """
+        try:
+            return self.listing.diff(DirectoryListing.scan(self.listing.path, self.listing.fields))
+        except FileNotFoundError:
+            self.gone = True
+            return ListingDelta()
+        except OSError:
+            return ListingDelta()
+
+    def delta_for(self, names: set[str]) -> ListingDelta:
+        """
+        Re-stats the given entries only and classifies them against the current listing.
+
+        Args:
+            names (set[str]): Names of the entries reported as touched.
+
+        Returns:
+            ListingDelta: The changes among the given entries.
+        """
+        scan, missing = stat_entries(self.listing.path, list(names), self.listing.fields)
+        delta = self.listing.diff(DirectoryListing.from_scan(scan), partial=True)
+        delta.removed = self.listing.frame.filter(pl.col("name").is_in(missing))["name"].to_list()
+        return delta
+
+    async def _next_inotify_delta(self, inotify: _Inotify, timeout: float | None) -> ListingDelta:
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        loop.add_reader(inotify.fd, readable.set)
+        try:
+            try:
+                await asyncio.wait_for(readable.wait(), timeout)
+            except asyncio.TimeoutError:
+                return ListingDelta()
+            # let the burst settle, then drain everything that accumulated in the meantime
+            await asyncio.sleep(self.coalesce_interval)
+        finally:
+            loop.remove_reader(inotify.fd)
+        names, rescan, gone = inotify.read()
+        if gone:
+            self.gone = True
+            return ListingDelta()
+        if rescan:
+            return await asyncio.to_thread(self.rescan)
+        return await asyncio.to_thread(self.delta_for, names)
+
+    def close(self) -> None:
+        """Releases the inotify instance, if any."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+class WatchSubscription:
+    """
+    One panel's view of a shared watcher.
+
+    Attributes:
+        listing (DirectoryListing): The latest snapshot of the directory
+    """
+
+    def __init__(self, listing: DirectoryListing) -> None:
+        self.listing = listing
+        self._changed = asyncio.Event()
+        self._ended = False
+
+    async def updates(self, heartbeat: float | None = None) -> AsyncIterator[DirectoryListing | None]:
+        """
+        Yields the listing whenever the directory changed, until the directory is gone or the watcher stopped.
+
+        Args:
+            heartbeat (float | None): If set, None is yielded after this many idle seconds, giving the consumer a
+                chance to stop watching even if the directory stays quiet.
+
+        Yields:
+            DirectoryListing | None: The changed listing, None after an idle heartbeat.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if self._ended:
+                return
+            self._changed.clear()
+            yield self.listing
+
+    def _notify(self, listing: DirectoryListing) -> None:
+        self.listing = listing
+        self._changed.set()
+
+    def _end(self) -> None:
+        self._ended = True
+        self._changed.set()
+
+
+class _SharedWatch:
+    """A watcher and the task forwarding its deltas to every subscription of its directory."""
+
+    def __init__(self, watcher: DirectoryWatcher) -> None:
+        self.watcher = watcher
+        self.subscriptions: set[WatchSubscription] = set()
+        self.task = asyncio.create_task(self._forward())
+
+    async def _forward(self) -> None:
+        try:
+            async for _ in self.watcher.deltas():
+                for subscription in self.subscriptions:
+                    subscription._notify(self.watcher.listing)
+        finally:
+            self.watcher.close()
+            for subscription in self.subscriptions:
+                subscription._end()
+
+    async def stop(self) -> None:
+        self.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.task
+
+
+class DirectoryWatchers:
+    """
+    Shares one watcher per directory between all subscribers.
+
+    Subscribing with listings of more fields than the running watcher keeps restarts the watcher with the fields of
+    all subscribers. The watcher of a directory stops, and releases its inotify instance, when its last subscriber
+    leaves.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        # keyword arguments of every DirectoryWatcher created
+        self._options = options
+        self._watches: dict[str, _SharedWatch] = {}
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, listing: DirectoryListing) -> AsyncIterator[WatchSubscription]:
+        """
+        Subscribes to the changes of a directory for the duration of the context.
+
+        Args:
+            listing (DirectoryListing): The subscriber's listing of the directory.
+
+        Yields:
+            WatchSubscription: The subscription, starting at the listing of the shared watcher; one without updates
+                if the directory cannot be rescanned with the fields of all subscribers.
+        """
+        path = listing.path
+        watch = self._watches.get(path)
+        if watch is None or watch.task.done():
+            watch = self._watches[path] = _SharedWatch(DirectoryWatcher(listing, **self._options))
+        elif not listing.fields <= watch.watcher.listing.fields:
+            # watch the fields of all subscribers, the subscriptions move on to the new watcher
+            fields = listing.fields | watch.watcher.listing.fields
+            if not listing.fields >= fields:
+                try:
+                    listing = await asyncio.to_thread(DirectoryListing.scan, path, fields)
+                except OSError:
+                    # unreadable like a failed first scan, the running watcher is left alone and the subscriber is
+                    # told the directory is gone
+                    subscription = WatchSubscription(listing)
+                    subscription._end()
+                    yield subscription
+                    return
+            subscriptions, watch.subscriptions = watch.subscriptions, set()
+            await watch.stop()
+            watch = self._watches[path] = _SharedWatch(DirectoryWatcher(listing, **self._options))
+            watch.subscriptions |= subscriptions
+        subscription = WatchSubscription(watch.watcher.listing)
+        watch.subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            current = self._watches.get(path)
+            if current is not None:
+                current.subscriptions.discard(subscription)
+                if not current.subscriptions:
+                    del self._watches[path]
+                    await current.stop()
+
+
+directory_watchers = DirectoryWatchers()
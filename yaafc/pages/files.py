@@ -1,5 +1,6 @@
 import reflex as rx
 
+from yaafc.components.file_jobs import file_jobs
 from yaafc.components.file_list import file_list
 from yaafc.templates.template import template
 
@@ -8,6 +9,7 @@ from yaafc.templates.template import template
 def files() -> rx.Component:
     return rx.box(
         file_list(),
+        file_jobs(),
         background_color=rx.Color("accent", 2),
         justify="center",
         padding="0em",
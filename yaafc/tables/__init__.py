@@ -0,0 +1,29 @@
+"""
+Table data for the table widgets, evaluated lazily with Polars.
+"""
+
+from .aggregate import GROUP_SIZE_COLUMN, SUMMARY_STATISTICS
+from .filters import InvalidFilterError, compile_filter
+from .registry import DatasetRegistry, UnknownDatasetError, UnsupportedTableFormatError, datasets
+from .source import ColumnFilters, KeyMatches, SortOrder, TableSource
+from .transport import ARROW_MEDIA_TYPE, TABLE_ROUTE, encode_page, page_path, table_api
+
+__all__ = [
+    "ARROW_MEDIA_TYPE",
+    "GROUP_SIZE_COLUMN",
+    "SUMMARY_STATISTICS",
+    "TABLE_ROUTE",
+    "ColumnFilters",
+    "DatasetRegistry",
+    "InvalidFilterError",
+    "KeyMatches",
+    "SortOrder",
+    "TableSource",
+    "UnknownDatasetError",
+    "UnsupportedTableFormatError",
+    "compile_filter",
+    "datasets",
+    "encode_page",
+    "page_path",
+    "table_api",
+]
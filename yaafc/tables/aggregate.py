@@ -0,0 +1,76 @@
+"""
+Column summaries and group-by aggregations of table data, run by Polars.
+
+A summary has one set of statistics per column: the number of values and of distinct values for every column,
+minimum and maximum for orderable columns and the sum for numeric columns. Nulls are not counted.
+
+Grouping a table by key columns yields one row per distinct key with the number of rows of the group and the
+sums of all other numeric columns, e.g. the total size per owner or per extension.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import polars as pl
+
+# statistics of a column summary, in display order
+SUMMARY_STATISTICS = ("count", "distinct", "sum", "min", "max")
+# column of a grouped table holding the number of rows per group
+GROUP_SIZE_COLUMN = "rows"
+
+
+def summary_expressions(schema: pl.Schema) -> list[pl.Expr]:
+    """
+    Expressions computing the summary of every column of a table in one pass.
+
+    Args:
+        schema (pl.Schema): Schema of the summarized table.
+
+    Returns:
+        list[pl.Expr]: Aggregations named ``statistic:column``, see ``parse_summary``.
+    """
+    expressions = []
+    for column, dtype in schema.items():
+        if dtype.is_nested():
+            continue
+        value = pl.col(column)
+        expressions += [value.count().alias(f"count:{column}"), value.n_unique().alias(f"distinct:{column}")]
+        if dtype.is_numeric():
+            expressions.append(value.sum().alias(f"sum:{column}"))
+        if dtype.is_numeric() or dtype.is_temporal() or dtype in (pl.String, pl.Boolean):
+            expressions += [value.min().alias(f"min:{column}"), value.max().alias(f"max:{column}")]
+    return expressions
+
+
+def parse_summary(row: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Turns the single row computed by ``summary_expressions`` into statistics by column."""
+    summary: dict[str, dict[str, Any]] = {}
+    for name, value in row.items():
+        statistic, _, column = name.partition(":")
+        summary.setdefault(column, {})[statistic] = value
+    return {
+        column: {statistic: values[statistic] for statistic in SUMMARY_STATISTICS if statistic in values}
+        for column, values in summary.items()
+    }
+
+
+def group_rows(frame: pl.LazyFrame, keys: Sequence[str], schema: pl.Schema) -> pl.LazyFrame:
+    """
+    Groups a table by key columns.
+
+    Args:
+        frame (pl.LazyFrame): The table.
+        keys (Sequence[str]): The key columns.
+        schema (pl.Schema): Schema of the table.
+
+    Returns:
+        pl.LazyFrame: The key columns, ``GROUP_SIZE_COLUMN`` and a ``column (sum)`` column per other numeric
+            column, one row per key ordered by the keys.
+    """
+    sums = [
+        pl.col(column).sum().alias(f"{column} (sum)")
+        for column, dtype in schema.items()
+        if column not in keys and dtype.is_numeric()
+    ]
+    grouped = frame.group_by(list(keys)).agg(pl.len().alias(GROUP_SIZE_COLUMN), *sums)
+    return grouped.sort(list(keys), nulls_last=True)
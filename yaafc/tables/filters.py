@@ -0,0 +1,93 @@
+"""
+Per-column filter texts compiled into Polars expressions.
+
+Filter syntax, matched against the column the text was typed into:
+
+- ``text``: cells containing ``text``, ignoring case; equal cells for numeric columns
+- ``re:pattern``: cells with a match of a regular expression (Rust regex syntax)
+- ``>x``, ``>=x``, ``<x``, ``<=x``, ``=x``, ``!=x``: comparisons
+- ``a..b``: cells between ``a`` and ``b``, inclusive; either bound may be omitted
+
+Numeric columns compare numbers. All other columns compare their text, which orders ISO dates and times
+chronologically, so ``>=2024-01-01`` works on date and datetime columns as well.
+"""
+
+import re
+
+import polars as pl
+from polars.exceptions import PolarsError
+
+_COMPARISON = re.compile(r"^(>=|<=|!=|>|<|=)\s*(.+)$")
+_OPERATORS = {
+    ">": pl.Expr.gt,
+    ">=": pl.Expr.ge,
+    "<": pl.Expr.lt,
+    "<=": pl.Expr.le,
+    "=": pl.Expr.eq,
+    "!=": pl.Expr.ne,
+}
+
+
+class InvalidFilterError(ValueError):
+    def __init__(self, text: str, reason: str) -> None:
+        super().__init__(f"invalid filter {text!r}: {reason}")
+
+
+def compile_filter(column: str, text: str, dtype: pl.DataType) -> pl.Expr | None:
+    """
+    Compiles the filter text of one column.
+
+    Args:
+        column (str): The filtered column.
+        text (str): The filter text, see the module documentation for the syntax.
+        dtype (pl.DataType): Type of the column.
+
+    Returns:
+        pl.Expr | None: A boolean expression keeping the matching rows, None for an empty text.
+
+    Raises:
+        InvalidFilterError: If a number or a regular expression cannot be parsed.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    numeric = dtype.is_numeric()
+    value = pl.col(column) if numeric else pl.col(column).cast(pl.String)
+    if text.startswith("re:"):
+        expression = pl.col(column).cast(pl.String).str.contains(text.removeprefix("re:"))
+        _check(expression, column, text)
+        return expression
+    comparison = _COMPARISON.match(text)
+    if comparison is not None:
+        operator, operand = comparison.groups()
+        return _OPERATORS[operator](value, _operand(operand, numeric, text))
+    if ".." in text:
+        low, _, high = (bound.strip() for bound in text.partition(".."))
+        bounds = [
+            compare(value, _operand(bound, numeric, text))
+            for compare, bound in [(pl.Expr.ge, low), (pl.Expr.le, high)]
+            if bound
+        ]
+        if not bounds:
+            raise InvalidFilterError(text, "a range needs at least one bound")
+        return pl.all_horizontal(bounds)
+    if numeric:
+        return value.eq(_operand(text, numeric, text))
+    return value.str.to_lowercase().str.contains(text.lower(), literal=True)
+
+
+def _operand(operand: str, numeric: bool, text: str) -> float | str:
+    if not numeric:
+        return operand.strip()
+    try:
+        return float(operand)
+    except ValueError:
+        raise InvalidFilterError(text, f"{operand!r} is not a number") from None
+
+
+def _check(expression: pl.Expr, column: str, text: str) -> None:
+    # the regex is compiled by Polars even for an empty frame
+    try:
+        pl.DataFrame({column: []}, schema={column: pl.String}).filter(expression)
+    except PolarsError as error:
+        raise InvalidFilterError(text, str(error).splitlines()[0]) from None
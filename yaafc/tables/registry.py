@@ -0,0 +1,142 @@
+"""
+Process-wide registry of the datasets shown by table widgets.
+
+A dataset is registered once per process and referenced by its handle from any number of table widgets and
+sessions. Table states only keep the handle and their own view of it (offset, sort order, filters and projected
+columns), so ten sessions on the same 2 GB table share one frame and the sorted and filtered views cached by its
+``TableSource``.
+
+Files opened through the registry are shared by path: opening a file again returns the handle of the dataset
+already registered for it, until the file changes. Opening a changed file registers its new version and releases
+the handle of the old one, so the old version and its cached views are not kept alive by the registry.
+"""
+
+import os
+import threading
+import uuid
+from typing import Any
+
+import polars as pl
+
+from yaafc.tables.source import TableSource
+
+
+class UnknownDatasetError(KeyError):
+    """Raised for a handle that is not, or no longer, registered."""
+
+
+class UnsupportedTableFormatError(ValueError):
+    def __init__(self, suffix: str):
+        super().__init__(f"unsupported table format {suffix!r}")
+
+
+class DatasetRegistry:
+    """
+    Table sources by handle.
+
+    Datasets stay registered until they are released; a state still referring to a released handle fails to
+    page it with ``UnknownDatasetError``.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[str, TableSource] = {}
+        # handle of the dataset registered for each opened file, with the file version it was opened at
+        self._files: dict[str, tuple[tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, handle: object) -> bool:
+        return handle in self._sources
+
+    def handles(self) -> list[str]:
+        """The registered handles in registration order."""
+        with self._lock:
+            return list(self._sources)
+
+    def register(self, source: TableSource | pl.LazyFrame | pl.DataFrame, handle: str | None = None) -> str:
+        """
+        Registers a dataset.
+
+        Args:
+            source (TableSource | pl.LazyFrame | pl.DataFrame): The data; frames are wrapped in a ``TableSource``.
+            handle (str | None): Handle to register the dataset under, replacing a dataset registered under it.
+                A new unguessable handle if None, or the existing handle if the source is registered already.
+
+        Returns:
+            str: The handle of the dataset.
+        """
+        if not isinstance(source, TableSource):
+            source = TableSource(source)
+        with self._lock:
+            if handle is None:
+                handle = next((known for known, registered in self._sources.items() if registered is source), None)
+            handle = handle or uuid.uuid4().hex
+            self._sources[handle] = source
+        return handle
+
+    def open(self, path: str | os.PathLike[str], **options: Any) -> str:
+        """
+        Registers a Parquet or CSV file, read on demand, or returns the handle it is registered under already.
+
+        A file that changed since it was opened is registered again under a new handle, and the handle of its
+        previous version is released.
+
+        Args:
+            path (str | os.PathLike[str]): The file; the format is chosen by its suffix.
+            **options (Any): Options of ``polars.scan_parquet`` or ``polars.scan_csv``.
+
+        Returns:
+            str: The handle of the dataset.
+
+        Raises:
+            OSError: If the file cannot be accessed.
+            UnsupportedTableFormatError: If the suffix names no supported format.
+        """
+        path = os.path.abspath(path)
+        stat_result = os.stat(path)
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            opened = self._files.get(path)
+            if opened is not None and opened[0] == version and opened[1] in self._sources:
+                return opened[1]
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix == ".parquet":
+            source = TableSource.scan_parquet(path, **options)
+        elif suffix in (".csv", ".tsv"):
+            options = {"separator": "\t", **options} if suffix == ".tsv" else options
+            source = TableSource.scan_csv(path, **options)
+        else:
+            raise UnsupportedTableFormatError(suffix)
+        handle = uuid.uuid4().hex
+        with self._lock:
+            opened = self._files.get(path)
+            if opened is not None and opened[0] == version and opened[1] in self._sources:
+                # opened by another session meanwhile
+                return opened[1]
+            if opened is not None:
+                self._sources.pop(opened[1], None)
+            self._sources[handle] = source
+            self._files[path] = (version, handle)
+        return handle
+
+    def get(self, handle: str) -> TableSource:
+        """
+        Looks up a dataset.
+
+        Raises:
+            UnknownDatasetError: If no dataset is registered under the handle.
+        """
+        try:
+            return self._sources[handle]
+        except KeyError:
+            raise UnknownDatasetError(handle) from None
+
+    def release(self, handle: str) -> None:
+        """Unregisters a dataset; unknown handles are ignored."""
+        with self._lock:
+            self._sources.pop(handle, None)
+            for path, (_, opened) in list(self._files.items()):
+                if opened == handle:
+                    del self._files[path]
+
+
+datasets = DatasetRegistry()
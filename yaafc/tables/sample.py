@@ -0,0 +1,201 @@
+"""
+A small sample table, registered with ``yaafc.tables.datasets`` when this module is imported.
+"""
+
+import polars as pl
+
+from yaafc.tables.registry import datasets
+
+# shown by tables created without data, see yaafc.ui.table
+SAMPLE_DATASET = datasets.register(
+    pl.DataFrame({
+        "Index": list(range(1, 61)),
+        "Name": [
+            "Alice",
+            "Bob",
+            "Charlie",
+            "David",
+            "Eve",
+            "Frank",
+            "Grace",
+            "Heidi",
+            "Ivan",
+            "Judy",
+            "Karl",
+            "Laura",
+            "Mallory",
+            "Niaj",
+            "Olivia",
+            "Peggy",
+            "Quentin",
+            "Rupert",
+            "Sybil",
+            "Trent",
+            "Uma",
+            "Victor",
+            "Wendy",
+            "Xander",
+            "Yvonne",
+            "Zach",
+            "Aaron",
+            "Bianca",
+            "Carter",
+            "Diana",
+            "Ethan",
+            "Fiona",
+            "Gavin",
+            "Hannah",
+            "Isabel",
+            "Jonas",
+            "Kylie",
+            "Liam",
+            "Mona",
+            "Nolan",
+            "Opal",
+            "Paul",
+            "Quincy",
+            "Rita",
+            "Sam",
+            "Tina",
+            "Ursula",
+            "Vince",
+            "Will",
+            "Xenia",
+            "Yara",
+            "Zane",
+            "Ava",
+            "Ben",
+            "Clara",
+            "Derek",
+            "Elena",
+            "Felix",
+            "Gina",
+            "Henry",
+        ],
+        "Age": [
+            25,
+            30,
+            35,
+            28,
+            22,
+            40,
+            31,
+            29,
+            27,
+            33,
+            26,
+            32,
+            38,
+            24,
+            21,
+            41,
+            34,
+            28,
+            36,
+            39,
+            23,
+            37,
+            29,
+            31,
+            35,
+            30,
+            27,
+            33,
+            25,
+            32,
+            28,
+            34,
+            26,
+            38,
+            24,
+            40,
+            29,
+            31,
+            37,
+            22,
+            39,
+            23,
+            36,
+            35,
+            27,
+            33,
+            25,
+            32,
+            28,
+            34,
+            26,
+            38,
+            24,
+            40,
+            29,
+            31,
+            37,
+            22,
+            39,
+            23,
+        ],
+        "City": [
+            "NY",
+            "LA",
+            "Chicago",
+            "Boston",
+            "Miami",
+            "Dallas",
+            "Seattle",
+            "Denver",
+            "Austin",
+            "SF",
+            "Houston",
+            "Phoenix",
+            "Portland",
+            "Atlanta",
+            "Orlando",
+            "Detroit",
+            "Baltimore",
+            "Cleveland",
+            "Columbus",
+            "Charlotte",
+            "San Diego",
+            "San Jose",
+            "Jacksonville",
+            "Indianapolis",
+            "Fort Worth",
+            "El Paso",
+            "Memphis",
+            "Nashville",
+            "Louisville",
+            "Milwaukee",
+            "Albuquerque",
+            "Tucson",
+            "Fresno",
+            "Sacramento",
+            "Kansas City",
+            "Mesa",
+            "Omaha",
+            "Colorado Springs",
+            "Raleigh",
+            "Long Beach",
+            "Virginia Beach",
+            "Oakland",
+            "Minneapolis",
+            "Tulsa",
+            "Arlington",
+            "Tampa",
+            "New Orleans",
+            "Wichita",
+            "Bakersfield",
+            "Aurora",
+            "Anaheim",
+            "Honolulu",
+            "Santa Ana",
+            "Riverside",
+            "Corpus Christi",
+            "Lexington",
+            "Stockton",
+            "Henderson",
+            "Saint Paul",
+            "St. Louis",
+        ],
+    }),
+    handle="sample",
+)
@@ -0,0 +1,348 @@
+"""
+Lazily evaluated table data for the table widgets.
+
+A table source wraps a Polars ``LazyFrame``, e.g. an in-memory frame or a scan over Parquet or CSV files. Pages of
+the unsorted, unfiltered table are requested with their offset, length and columns, which all become part of the
+query, so Polars only reads the projected columns and only materializes the requested rows.
+
+A sorted or filtered view is evaluated once over the whole table and kept in a small LRU cache keyed by its sort
+order and filters, as the row numbers of the table in view order rather than a copy of its columns. Its pages slice
+their rows out of the table, nearby rows sharing one slice. A grouped view is a table of its own and is
+cached as such. Sessions asking for the same view at the same time wait for one evaluation of it, and switching back
+to a recent view costs nothing. Column summaries of views are cached the same way. A source is one version of a
+dataset; its caches are dropped with it when the dataset is replaced, see ``yaafc.tables.registry``.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future
+from typing import Any, cast
+
+import polars as pl
+from polars.exceptions import PolarsError
+
+from yaafc.tables.aggregate import group_rows, parse_summary, summary_expressions
+from yaafc.tables.filters import InvalidFilterError, compile_filter
+
+# a sort order as (column, descending) pairs, the first pair being the primary key
+SortOrder = Sequence[tuple[str, bool]]
+# filter texts keyed by column, see yaafc.tables.filters for the syntax
+ColumnFilters = Mapping[str, str]
+# values keyed by column, e.g. the keys of a group; None matches nulls
+KeyMatches = Mapping[str, Any]
+
+_ViewKey = tuple[
+    tuple[tuple[str, bool], ...], tuple[tuple[str, str], ...], tuple[str, ...], tuple[tuple[str, Any], ...]
+]
+# a grouped view, or the row numbers of a sorted or filtered view
+_View = pl.DataFrame | pl.Series
+
+# column numbering the rows of the table while a view is evaluated
+_ROW_NUMBER = "__yaafc_row"
+# rows of a page further apart are sliced separately; reading the rows between them costs less than another slice
+_SPAN_GAP = 4096
+# a page of more spans reads the range of its rows at once
+_MAX_SPANS = 16
+
+
+class NotAFrameError(TypeError):
+    def __init__(self, frame: object):
+        super().__init__(f"expected a polars LazyFrame or DataFrame, got {type(frame).__name__}")
+
+
+class UnknownGroupKeyError(pl.exceptions.ColumnNotFoundError):  # type: ignore[no-any-unimported]
+    def __init__(self, column: str):
+        super().__init__(f"unknown group key {column!r}")
+
+
+class TableSource:
+    """
+    Table data evaluated page by page.
+
+    Sources are shared, not copied, by the states holding them, so all sessions showing a table share its views.
+
+    Attributes:
+        frame (pl.LazyFrame): The query producing the whole table
+        max_views (int): Number of sorted, filtered or grouped views, and of view summaries, kept evaluated
+    """
+
+    def __init__(self, frame: pl.LazyFrame | pl.DataFrame, max_views: int = 4) -> None:
+        if not isinstance(frame, (pl.LazyFrame, pl.DataFrame)):
+            raise NotAFrameError(frame)
+        self.frame = frame.lazy()
+        self.max_views = max_views
+        self._schema: pl.Schema | None = None
+        self._height: int | None = None
+        self._views: OrderedDict[_ViewKey, _View] = OrderedDict()
+        # views being evaluated, for the threads asking for them meanwhile
+        self._evaluating: dict[_ViewKey, Future[_View]] = {}
+        self._summaries: OrderedDict[_ViewKey, dict[str, dict[str, object]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo: dict) -> "TableSource":
+        # Reflex deep-copies backend vars into every new state
+        return self
+
+    @classmethod
+    def scan_parquet(cls, source: str | os.PathLike[str], **options: Any) -> "TableSource":
+        """Creates a source reading Parquet files on demand, see ``polars.scan_parquet`` for the options."""
+        return cls(pl.scan_parquet(os.fspath(source), **options))
+
+    @classmethod
+    def scan_csv(cls, source: str | os.PathLike[str], **options: Any) -> "TableSource":
+        """Creates a source reading a CSV file on demand, see ``polars.scan_csv`` for the options."""
+        return cls(pl.scan_csv(os.fspath(source), **options))
+
+    @property
+    def schema(self) -> pl.Schema:
+        """Column names and types, resolved once without reading any rows."""
+        if self._schema is None:
+            self._schema = self.frame.collect_schema()
+        return self._schema
+
+    @property
+    def columns(self) -> list[str]:
+        """The column names in table order."""
+        return self.schema.names()
+
+    @property
+    def height(self) -> int:
+        """Number of rows, counted once; Parquet files answer this from their metadata."""
+        if self._height is None:
+            self._height = self.frame.select(pl.len()).collect().item()
+        return self._height
+
+    def page(
+        self,
+        offset: int,
+        length: int,
+        columns: Sequence[str] | None = None,
+        sort: SortOrder = (),
+        filters: ColumnFilters | None = None,
+        group_by: Sequence[str] = (),
+        matches: KeyMatches | None = None,
+    ) -> pl.DataFrame:
+        """
+        Materializes a slice of the table or of a sorted, filtered or grouped view of it.
+
+        Args:
+            offset (int): Index of the first row of the page in the view.
+            length (int): Maximum number of rows of the page.
+            columns (Sequence[str] | None): Columns to return, in this order; all columns if None.
+            sort (SortOrder): Columns to sort the whole table by before slicing, nulls last and stable.
+            filters (ColumnFilters | None): Filter texts keyed by column; rows must match all of them.
+            group_by (Sequence[str]): Key columns to group the filtered rows by, see ``yaafc.tables.aggregate``.
+                Sort columns and projected columns then refer to the grouped table.
+            matches (KeyMatches | None): Values keyed by column the rows must equal, compared with their type;
+                None matches nulls. Drilling into a group of a grouped view matches its keys.
+
+        Returns:
+            pl.DataFrame: The rows of the page.
+
+        Raises:
+            InvalidFilterError: If a filter text is invalid.
+            ColumnNotFoundError: If a group key or a matched column is not a column of the table.
+        """
+        key = _view_key(sort, filters, group_by, matches)
+        view = self._view(key) if any(key) else None
+        if isinstance(view, pl.Series):
+            return self._gather(view.slice(max(offset, 0), max(length, 0)), columns)
+        frame: pl.LazyFrame | pl.DataFrame = self.frame if view is None else view
+        if columns is not None:
+            frame = frame.select(columns)
+        page = frame.slice(max(offset, 0), max(length, 0))
+        return page.collect() if isinstance(page, pl.LazyFrame) else page
+
+    def count(
+        self,
+        sort: SortOrder = (),
+        filters: ColumnFilters | None = None,
+        group_by: Sequence[str] = (),
+        matches: KeyMatches | None = None,
+    ) -> int:
+        """
+        Number of rows of a view.
+
+        Raises:
+            InvalidFilterError: If a filter text is invalid.
+            ColumnNotFoundError: If a group key or a matched column is not a column of the table.
+        """
+        key = _view_key(sort, filters, group_by, matches)
+        return len(self._view(key)) if any(key[1:]) else self.height
+
+    def view_columns(self, group_by: Sequence[str] = ()) -> list[str]:
+        """
+        The column names of a view, which differ from the table's for a grouped view.
+
+        Raises:
+            ColumnNotFoundError: If a group key is not a column of the table.
+        """
+        if not group_by:
+            return self.columns
+        self._check_keys(tuple(group_by))
+        return group_rows(self.frame, group_by, self.schema).collect_schema().names()
+
+    def summary(
+        self, filters: ColumnFilters | None = None, group_by: Sequence[str] = (), matches: KeyMatches | None = None
+    ) -> dict[str, dict[str, object]]:
+        """
+        Summarizes every column of a view, see ``yaafc.tables.aggregate``.
+
+        Returns:
+            dict[str, dict[str, object]]: Statistics by name, by column.
+
+        Raises:
+            InvalidFilterError: If a filter text is invalid.
+            ColumnNotFoundError: If a group key or a matched column is not a column of the table.
+        """
+        # the order does not change a summary
+        key = _view_key((), filters, group_by, matches)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is not None:
+                self._summaries.move_to_end(key)
+                return summary
+        # a grouped view is a table, the rows of a filtered view are taken straight from the table
+        view = cast(pl.DataFrame, self._view(key)).lazy() if key[2] else self._filtered(key[1], key[3])
+        row = view.select(summary_expressions(view.collect_schema())).collect().row(0, named=True)
+        summary = parse_summary(row)
+        with self._lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > self.max_views:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def validate(self, filters: ColumnFilters) -> None:
+        """
+        Checks filter texts without evaluating them.
+
+        Raises:
+            InvalidFilterError: If a filter text is invalid or names an unknown column.
+        """
+        self._predicates(_view_key((), filters, (), None)[1])
+
+    def _view(self, key: _ViewKey) -> _View:
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                return view
+            evaluating = self._evaluating.get(key)
+            if evaluating is None:
+                evaluating = self._evaluating[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return evaluating.result()
+        try:
+            view = self._evaluate(key)
+        except BaseException as error:
+            with self._lock:
+                del self._evaluating[key]
+            evaluating.set_exception(error)
+            raise
+        with self._lock:
+            del self._evaluating[key]
+            self._views[key] = view
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        evaluating.set_result(view)
+        return view
+
+    def _evaluate(self, key: _ViewKey) -> _View:
+        sort, filters, group_by, matches = key
+        if group_by:
+            self._check_keys(group_by)
+            frame = group_rows(self._filtered(filters, matches), group_by, self.schema)
+        else:
+            frame = self._filtered(filters, matches, self.frame.with_row_index(_ROW_NUMBER))
+        if sort:
+            frame = frame.sort(
+                [column for column, _ in sort],
+                descending=[descending for _, descending in sort],
+                nulls_last=True,
+                maintain_order=True,
+            )
+        try:
+            if group_by:
+                return frame.collect()
+            return frame.select(_ROW_NUMBER).collect().to_series()
+        except PolarsError as error:
+            raise InvalidFilterError(str(dict(filters)), str(error).splitlines()[0]) from None
+
+    def _filtered(
+        self,
+        filters: tuple[tuple[str, str], ...],
+        matches: tuple[tuple[str, Any], ...] = (),
+        frame: pl.LazyFrame | None = None,
+    ) -> pl.LazyFrame:
+        frame = self.frame if frame is None else frame
+        self._check_keys(tuple(column for column, _ in matches))
+        # typed comparisons, a group key may be a datetime or a null no filter text can express
+        predicates = self._predicates(filters) + [
+            pl.col(column).is_null() if value is None else pl.col(column) == value for column, value in matches
+        ]
+        return frame.filter(pl.all_horizontal(predicates)) if predicates else frame
+
+    def _gather(self, rows: pl.Series, columns: Sequence[str] | None) -> pl.DataFrame:
+        # slices the spans of nearby rows out of the table one query each, Polars pushes a slice into the scan, so a
+        # page costs about its own rows however far apart they are; a filter on the row numbers, or one query over
+        # all spans, reads the whole table
+        frame = self.frame if columns is None else self.frame.select(columns)
+        if rows.is_empty():
+            return frame.clear().collect()
+        rows = rows.alias(_ROW_NUMBER)
+        wanted = rows.unique().sort()
+        found = pl.concat(
+            frame.slice(start, length)
+            .select(pl.all().gather(wanted.filter(wanted.is_between(start, start + length - 1)) - start))
+            .collect()
+            for start, length in _spans(wanted)
+        ).with_columns(wanted)
+        ordered = rows.to_frame().join(found, on=_ROW_NUMBER, how="left", maintain_order="left")
+        return ordered.drop(_ROW_NUMBER)
+
+    def _check_keys(self, group_by: tuple[str, ...]) -> None:
+        for column in group_by:
+            if column not in self.schema:
+                raise UnknownGroupKeyError(column)
+
+    def _predicates(self, filters: tuple[tuple[str, str], ...]) -> list[pl.Expr]:
+        predicates = []
+        for column, text in filters:
+            if column not in self.schema:
+                raise InvalidFilterError(text, f"unknown column {column!r}")
+            predicate = compile_filter(column, text, self.schema[column])
+            if predicate is not None:
+                predicates.append(predicate)
+        return predicates
+
+
+def _spans(rows: pl.Series) -> list[tuple[int, int]]:
+    """The (start, length) slices covering sorted rows, rows closer than _SPAN_GAP sharing one, at most _MAX_SPANS."""
+    spans: list[tuple[int, int]] = []
+    for row in rows:
+        if spans and row - (spans[-1][0] + spans[-1][1]) < _SPAN_GAP:
+            spans[-1] = (spans[-1][0], row - spans[-1][0] + 1)
+        else:
+            spans.append((row, 1))
+    if len(spans) > _MAX_SPANS:
+        # rows scattered all over the table, one read of their range costs less than a query per span
+        return [(spans[0][0], spans[-1][0] + spans[-1][1] - spans[0][0])]
+    return spans
+
+
+def _view_key(
+    sort: SortOrder, filters: ColumnFilters | None, group_by: Sequence[str], matches: KeyMatches | None
+) -> _ViewKey:
+    # empty filter texts do not change the view
+    active = sorted((column, text.strip()) for column, text in (filters or {}).items() if text.strip())
+    return (
+        tuple((column, bool(descending)) for column, descending in sort),
+        tuple(active),
+        tuple(group_by),
+        tuple(sorted((matches or {}).items())),
+    )
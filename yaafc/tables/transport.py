@@ -0,0 +1,108 @@
+"""
+Binary transport of table pages as Arrow IPC streams.
+
+Reflex syncs state as JSON, which turns every cell of a page into text and every row into a nested array. For wide
+numeric tables that is several times the size of the data. A registered dataset can instead be paged through an
+HTTP endpoint answering with the Arrow IPC stream of the page, written by Polars straight from the column buffers
+and decoded in the browser (see ``yaafc.ui.libraries.arrow_rows``). The state only carries the page URL.
+"""
+
+import asyncio
+import base64
+import io
+import json
+from collections.abc import Sequence
+from typing import Any
+from urllib.parse import urlencode
+
+import polars as pl
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from yaafc.tables.filters import InvalidFilterError
+from yaafc.tables.registry import UnknownDatasetError, datasets
+from yaafc.tables.source import ColumnFilters, KeyMatches, SortOrder
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+TABLE_ROUTE = "/api/tables/{handle}"
+# upper bound of rows per request, a page is a screenful and its overscan
+MAX_PAGE_LENGTH = 10_000
+
+
+def page_path(
+    handle: str,
+    offset: int,
+    length: int,
+    columns: Sequence[str] | None = None,
+    sort: SortOrder = (),
+    filters: ColumnFilters | None = None,
+    group_by: Sequence[str] = (),
+    matches: KeyMatches | None = None,
+) -> str:
+    """Path and query of the endpoint serving a page of a registered dataset, see ``TableSource.page``."""
+    view = {
+        "columns": None if columns is None else list(columns),
+        "sort": list(sort),
+        "filters": dict(filters or {}),
+        "group_by": list(group_by),
+        "matches": encode_matches(matches) if matches else None,
+    }
+    query = urlencode({"offset": offset, "length": length, "view": json.dumps(view, separators=(",", ":"))})
+    return f"{TABLE_ROUTE.format(handle=handle)}?{query}"
+
+
+def encode_page(frame: pl.DataFrame) -> bytes:
+    """Serializes a page as an uncompressed Arrow IPC stream."""
+    buffer = io.BytesIO()
+    frame.write_ipc_stream(buffer, compression="uncompressed")
+    return buffer.getvalue()
+
+
+def encode_matches(matches: KeyMatches) -> str:
+    """
+    Serializes matched values as a one-row Arrow IPC stream in URL-safe base64.
+
+    JSON has no datetimes, and their text would be compared as text; the stream keeps the values' types.
+    """
+    buffer = io.BytesIO()
+    pl.DataFrame({column: [value] for column, value in matches.items()}).write_ipc_stream(buffer)
+    return base64.urlsafe_b64encode(buffer.getvalue()).decode("ascii")
+
+
+def decode_matches(text: str) -> dict[str, Any]:
+    """Restores matched values serialized by ``encode_matches``."""
+    return pl.read_ipc_stream(io.BytesIO(base64.urlsafe_b64decode(text))).row(0, named=True)
+
+
+async def serve_page(request: Request) -> Response:
+    """
+    Answers a page request of a registered dataset with an Arrow IPC stream.
+
+    Responds 404 for unknown handles and 400 for malformed requests or invalid filters.
+    """
+    try:
+        source = datasets.get(request.path_params["handle"])
+    except UnknownDatasetError:
+        return Response("unknown table", status_code=404)
+    try:
+        offset = int(request.query_params.get("offset", 0))
+        length = min(int(request.query_params.get("length", 0)), MAX_PAGE_LENGTH)
+        view = json.loads(request.query_params.get("view", "{}"))
+        sort = [(str(column), bool(descending)) for column, descending in view.get("sort", [])]
+        filters = {str(column): str(text) for column, text in view.get("filters", {}).items()}
+        group_by = [str(column) for column in view.get("group_by", [])]
+        matches = decode_matches(view["matches"]) if view.get("matches") else None
+        columns = view.get("columns")
+    except (ValueError, TypeError, AttributeError, IndexError, pl.exceptions.PolarsError) as error:
+        return Response(f"malformed page request: {error}", status_code=400)
+    try:
+        # evaluating a view may scan the whole table, keep it off the event loop
+        frame = await asyncio.to_thread(source.page, offset, length, columns, sort, filters, group_by, matches)
+    except (InvalidFilterError, pl.exceptions.ColumnNotFoundError) as error:
+        return Response(str(error), status_code=400)
+    return Response(encode_page(frame), media_type=ARROW_MEDIA_TYPE, headers={"Cache-Control": "no-store"})
+
+
+table_api = Starlette(routes=[Route(TABLE_ROUTE, serve_page)])
@@ -0,0 +1,100 @@
+"""
+Table rows fetched as an Arrow IPC stream and decoded in the browser.
+
+The component renders the rows of one table page into an enclosing ``rx.table.body``. It refetches whenever its
+``url`` changes, aborting a request still in flight, and keeps showing the previous page until the next one
+arrived. While ``clickable`` is set, clicking a row reports its index in the page through ``on_row_click``. See
+``yaafc.tables.transport`` for the endpoint serving the pages.
+"""
+
+import reflex as rx
+from reflex.event import passthrough_event_spec
+from reflex.utils.imports import ImportVar
+
+ARROW_ROWS_CODE = """
+const formatArrowValue = (value) => {
+  if (value === null || value === undefined) return "";
+  if (value instanceof Date) return value.toISOString();
+  return String(value);
+};
+
+const ArrowRows = ({ url, rowHeight, clickable, onRowClick }) => {
+  const [rows, setRows] = useState([]);
+  useEffect(() => {
+    if (!url) {
+      setRows([]);
+      return;
+    }
+    const controller = new AbortController();
+    fetch(new URL(url, getBackendURL(env.UPLOAD)), { signal: controller.signal })
+      .then((response) => {
+        if (!response.ok) throw new Error(`table page request failed: ${response.status}`);
+        return response.arrayBuffer();
+      })
+      .then((buffer) => {
+        const table = tableFromIPC(new Uint8Array(buffer));
+        const columns = table.schema.fields.map((field) => table.getChild(field.name));
+        const decoded = new Array(table.numRows);
+        for (let index = 0; index < table.numRows; index++) {
+          decoded[index] = columns.map((column) => formatArrowValue(column.get(index)));
+        }
+        setRows(decoded);
+      })
+      .catch((error) => {
+        if (error.name !== "AbortError") console.error(error);
+      });
+    return () => controller.abort();
+  }, [url]);
+  const cellStyle = {
+    height: `${rowHeight}px`,
+    borderBottom: "1px solid var(--accent-4)",
+    backgroundColor: "var(--accent-2)",
+  };
+  return rows.map((row, rowIndex) => (
+    <tr
+      key={rowIndex}
+      className="rt-TableRow"
+      data-table-row="true"
+      style={clickable ? { cursor: "pointer" } : undefined}
+      onClick={clickable && onRowClick ? () => onRowClick(rowIndex) : undefined}
+    >
+      {row.map((cell, columnIndex) => (
+        <td key={columnIndex} className="rt-TableCell" style={cellStyle}>
+          {cell}
+        </td>
+      ))}
+    </tr>
+  ));
+};
+"""
+
+
+class ArrowRows(rx.Component):
+    """Rows of a table page decoded from an Arrow IPC stream."""
+
+    tag = "ArrowRows"
+    lib_dependencies: list[str] = ["apache-arrow@19.0.1"]
+
+    # path of the page on the backend, nothing is rendered while empty
+    url: rx.Var[str]
+    # height of every row in pixels
+    row_height: rx.Var[int]
+    # whether clicking a row reports it
+    clickable: rx.Var[bool]
+
+    # index of the clicked row in the page
+    on_row_click: rx.EventHandler[passthrough_event_spec(int)]
+
+    def add_imports(self) -> dict:
+        return {
+            "apache-arrow@19.0.1": ImportVar(tag="tableFromIPC"),
+            "react": [ImportVar(tag="useEffect"), ImportVar(tag="useState")],
+            "$/utils/state": ImportVar(tag="getBackendURL"),
+            "$/env.json": ImportVar(tag="env", is_default=True),
+        }
+
+    def add_custom_code(self) -> list[str]:
+        return [ARROW_ROWS_CODE]
+
+
+arrow_rows = ArrowRows.create
@@ -1,299 +1,361 @@
-from typing import Any
+import json
+import math
+from time import monotonic
+from typing import Any, ClassVar, Literal
 
 import polars as pl
 import reflex as rx
-from reflex.vars import ArrayVar
+import reflex.istate.dynamic
+from reflex.compiler.compiler import into_component
 from reflex_intersection_observer import intersection_observer
 
 import yaafc.ui as yui
 from yaafc.states.pages_selection import PagesSelectionState
+from yaafc.tables import SUMMARY_STATISTICS, InvalidFilterError, SortOrder, TableSource, datasets, page_path
+from yaafc.tables.sample import SAMPLE_DATASET
+from yaafc.ui.libraries.arrow_rows import arrow_rows
+from yaafc.ui.table_parts import row_cell, table_footer, table_header, table_row, table_spacer, table_toolbar
+from yaafc.ui.table_window import MEASURE_VIEWPORT_JS, ScrollPace, next_pace, window_bounds
+
+
+class AmbiguousTableDataError(ValueError):
+    def __init__(self) -> None:
+        super().__init__("pass either a source or the handle of a registered dataset")
 
 
 class TableComponent(rx.ComponentState):
-    _df = pl.DataFrame({
-        "Index": list(range(1, 61)),
-        "Name": [
-            "Alice",
-            "Bob",
-            "Charlie",
-            "David",
-            "Eve",
-            "Frank",
-            "Grace",
-            "Heidi",
-            "Ivan",
-            "Judy",
-            "Karl",
-            "Laura",
-            "Mallory",
-            "Niaj",
-            "Olivia",
-            "Peggy",
-            "Quentin",
-            "Rupert",
-            "Sybil",
-            "Trent",
-            "Uma",
-            "Victor",
-            "Wendy",
-            "Xander",
-            "Yvonne",
-            "Zach",
-            "Aaron",
-            "Bianca",
-            "Carter",
-            "Diana",
-            "Ethan",
-            "Fiona",
-            "Gavin",
-            "Hannah",
-            "Isabel",
-            "Jonas",
-            "Kylie",
-            "Liam",
-            "Mona",
-            "Nolan",
-            "Opal",
-            "Paul",
-            "Quincy",
-            "Rita",
-            "Sam",
-            "Tina",
-            "Ursula",
-            "Vince",
-            "Will",
-            "Xenia",
-            "Yara",
-            "Zane",
-            "Ava",
-            "Ben",
-            "Clara",
-            "Derek",
-            "Elena",
-            "Felix",
-            "Gina",
-            "Henry",
-        ],
-        "Age": [
-            25,
-            30,
-            35,
-            28,
-            22,
-            40,
-            31,
-            29,
-            27,
-            33,
-            26,
-            32,
-            38,
-            24,
-            21,
-            41,
-            34,
-            28,
-            36,
-            39,
-            23,
-            37,
-            29,
-            31,
-            35,
-            30,
-            27,
-            33,
-            25,
-            32,
-            28,
-            34,
-            26,
-            38,
-            24,
-            40,
-            29,
-            31,
-            37,
-            22,
-            39,
-            23,
-            36,
-            35,
-            27,
-            33,
-            25,
-            32,
-            28,
-            34,
-            26,
-            38,
-            24,
-            40,
-            29,
-            31,
-            37,
-            22,
-            39,
-            23,
-        ],
-        "City": [
-            "NY",
-            "LA",
-            "Chicago",
-            "Boston",
-            "Miami",
-            "Dallas",
-            "Seattle",
-            "Denver",
-            "Austin",
-            "SF",
-            "Houston",
-            "Phoenix",
-            "Portland",
-            "Atlanta",
-            "Orlando",
-            "Detroit",
-            "Baltimore",
-            "Cleveland",
-            "Columbus",
-            "Charlotte",
-            "San Diego",
-            "San Jose",
-            "Jacksonville",
-            "Indianapolis",
-            "Fort Worth",
-            "El Paso",
-            "Memphis",
-            "Nashville",
-            "Louisville",
-            "Milwaukee",
-            "Albuquerque",
-            "Tucson",
-            "Fresno",
-            "Sacramento",
-            "Kansas City",
-            "Mesa",
-            "Omaha",
-            "Colorado Springs",
-            "Raleigh",
-            "Long Beach",
-            "Virginia Beach",
-            "Oakland",
-            "Minneapolis",
-            "Tulsa",
-            "Arlington",
-            "Tampa",
-            "New Orleans",
-            "Wichita",
-            "Bakersfield",
-            "Aurora",
-            "Anaheim",
-            "Honolulu",
-            "Santa Ana",
-            "Riverside",
-            "Corpus Christi",
-            "Lexington",
-            "Stockton",
-            "Henderson",
-            "Saint Paul",
-            "St. Louis",
-        ],
-    })
-
-    rows_loaded: int = 20
-    load_batch_size: int = 5
+    # handle of the shown dataset in yaafc.tables.datasets; the data is shared, the view below is per state
+    dataset: str = SAMPLE_DATASET
+    # columns left out of the projection
+    hidden_columns: list[str] = []
+    # key columns of the group-by view, which shows one row per group instead of the table rows
+    group_columns: list[str] = []
+    # whether the footer summarizes the columns of the view
+    show_summary: bool = False
+
+    # rows of the visible window and its first row; only the window plus the overscan is sent to the client
+    window_size: int = 20
+    window_offset: int = 0
+    # rows moved per scroll step: a viewport plus the lookahead
+    load_batch_size: int = 20
+    # rows prefetched beyond the overscan in the scroll direction, negative while scrolling up
+    lookahead_rows: int = 0
+    # row height in pixels measured by the client, 0 until measured
+    measured_row_height: int = 0
+    sort_column: str = ""
+    sort_descending: bool = False
+    # filter texts as typed, keyed by column; _filters holds the last valid ones
+    column_filters: dict[str, str] = {}
+    filter_error: str = ""
     assigned_page_slot: int | None = None
     active_page_slot: int | None = None
 
-    def get_client_rows_loaded_count(self):
-        return [
-            rx.call_script(
-                "window.rows_loaded_count",
-                callback=self.set_rows_loaded,
-            ),
-        ]
+    # rows rendered beyond both ends of the window and the minimum row height in pixels
+    overscan: ClassVar[int] = 10
+    row_height: ClassVar[int] = 30
+    # seconds of scrolling at the current speed prefetched ahead, and the upper bound of a scroll step
+    lookahead_seconds: ClassVar[float] = 0.5
+    max_batch_size: ClassVar[int] = 200
+    # pause in seconds after which scrolling starts again at rest
+    idle_after: ClassVar[float] = 1.0
+    # whether pages are sent as Arrow IPC instead of JSON rows, set per table by create
+    arrow_transport: ClassVar[bool] = False
+
+    _filters: dict[str, str] = {}
+    # typed key values of the opened group, see TableSource.page
+    _group_keys: dict[str, Any] = {}
+    # time of the last scroll step and the scroll speed in rows per second
+    _last_step: float = float("-inf")
+    _velocity: float = 0.0
 
     @rx.var
     def columns(self) -> list[str]:
-        return self._df.columns
+        if self.group_columns:
+            return self._source().view_columns(self.group_columns)
+        return [column for column in self._source().columns if column not in self.hidden_columns]
 
     @rx.var
     def visible_rows(self) -> list[tuple[Any, ...]]:
-        self.get_client_rows_loaded_count()
-        return self._df.rows()[: self.rows_loaded]
+        if self.arrow_transport:
+            return []
+        # each scroll step collects one slice of the same size, however far down the table it is
+        start, stop = self._window_bounds()
+        page = self._source().page(
+            start, stop - start, self.columns, self._sort_order(), self._filters, self.group_columns, self._group_keys
+        )
+        return page.rows()
+
+    @rx.var
+    def page_url(self) -> str:
+        if not self.arrow_transport:
+            return ""
+        start, stop = self._window_bounds()
+        return page_path(
+            self.dataset,
+            start,
+            stop - start,
+            self.columns,
+            self._sort_order(),
+            self._filters,
+            self.group_columns,
+            self._group_keys,
+        )
+
+    @rx.var
+    def total_rows(self) -> int:
+        return self._source().count(self._sort_order(), self._filters, self.group_columns, self._group_keys)
+
+    @rx.var
+    def column_summaries(self) -> list[str]:
+        # one text per shown column, a line per statistic
+        if not self.show_summary:
+            return []
+        summary = self._source().summary(self._filters, self.group_columns, self._group_keys)
+        return [
+            "\n".join(
+                f"{statistic} {value}"
+                for statistic, value in summary.get(column, {}).items()
+                if statistic in SUMMARY_STATISTICS
+            )
+            for column in self.columns
+        ]
+
+    @rx.var
+    def opened_group(self) -> str:
+        return ", ".join(
+            f"{column} = {'null' if value is None else value}" for column, value in self._group_keys.items()
+        )
 
     @rx.var
     def has_more(self) -> bool:
-        return self.rows_loaded < self._df.height
+        return self._window_bounds()[1] < self.total_rows
 
-    def set_rows_loaded(self, count: int):
-        self.rows_loaded = min(count, self._df.height)
+    @rx.var
+    def has_previous(self) -> bool:
+        return self._window_bounds()[0] > 0
+
+    @rx.var
+    def top_spacer_height(self) -> str:
+        start, _ = self._window_bounds()
+        return f"{start * self._row_height()}px"
+
+    @rx.var
+    def bottom_spacer_height(self) -> str:
+        _, stop = self._window_bounds()
+        return f"{(self.total_rows - stop) * self._row_height()}px"
+
+    def measure_viewport(self):
+        return rx.call_script(
+            f"({MEASURE_VIEWPORT_JS})({json.dumps(self._element_id())})", callback=type(self).set_viewport
+        )
+
+    def set_viewport(self, metrics: dict[str, float | None] | None):
+        if not metrics or not metrics.get("viewport_height"):
+            return
+        if metrics.get("row_height"):
+            self.measured_row_height = max(math.ceil(metrics["row_height"]), 1)
+        self.window_size = max(math.ceil(metrics["viewport_height"] / self._row_height()), 1)
+        self.load_batch_size = min(self.window_size, self.max_batch_size)
 
     def load_more_rows(self):
         if self.has_more:
-            self.rows_loaded = min(self.rows_loaded + self.load_batch_size, self._df.height)
+            self._track_scrolling(1)
+            self.window_offset = min(
+                self.window_offset + self.load_batch_size, max(self.total_rows - self.window_size, 0)
+            )
 
-    def set_page_slot(self, slot: int):
-        self.assigned_page_slot = slot
+    def load_previous_rows(self):
+        self._track_scrolling(-1)
+        self.window_offset = max(self.window_offset - self.load_batch_size, 0)
 
-    def set_page_id(self, page_id: str):
-        self.page_id = page_id
+    def sort_by(self, column: str):
+        # clicking the sorted column again reverses the order
+        self.sort_descending = column == self.sort_column and not self.sort_descending
+        self.sort_column = column
+        self.window_offset = 0
 
-    @classmethod
-    def table_header_cell(cls, *children, **props) -> rx.Component:
-        return rx.table.column_header_cell(
-            *children,
-            border_right="solid",
-            border_right_color=rx.color("accent", 4),
-            border_right_width="1px",
-            border_bottom="solid",
-            border_bottom_color=rx.color("accent", 4),
-            border_bottom_width="1px",
-            background_color=rx.color("accent", 3),
-            style={"position": "sticky", "top": "0"},
-            **props,
+    def set_column_filter(self, column: str, text: str):
+        self.column_filters = {**self.column_filters, column: text}
+        filters = {**self._filters, column: text}
+        try:
+            self._source().validate(filters)
+        except InvalidFilterError as error:
+            # keep showing the last valid result while the filter is being typed
+            self.filter_error = str(error)
+            return
+        self.filter_error = ""
+        self._filters = filters
+        self.window_offset = 0
+
+    def set_dataset(self, handle: str):
+        # fails for unknown handles before the view is touched
+        datasets.get(handle)
+        self.dataset = handle
+        self.hidden_columns = []
+        self.group_columns = []
+        self.column_filters = {}
+        self.filter_error = ""
+        self._filters = {}
+        self._group_keys = {}
+        self._reset_order()
+
+    def group_by(self, column: str):
+        # toggles a key column of the group-by view
+        if column in self.group_columns:
+            self.group_columns = [key for key in self.group_columns if key != column]
+        else:
+            self.group_columns = [*self.group_columns, column]
+        self._reset_order()
+
+    def clear_grouping(self):
+        self.group_columns = []
+        self._reset_order()
+
+    def open_group(self, index: int) -> None:
+        # leaves the group-by view for the rows of the group shown at this index of the window; the keys are
+        # read back from the view with their types, the client only has their text
+        if not self.group_columns:
+            return
+        start, _ = self._window_bounds()
+        keys = self._source().page(
+            start + index,
+            1,
+            self.group_columns,
+            self._sort_order(),
+            self._filters,
+            self.group_columns,
+            self._group_keys,
         )
+        if keys.is_empty():
+            return
+        self._group_keys = {**self._group_keys, **keys.row(0, named=True)}
+        self.group_columns = []
+        self._reset_order()
 
-    @classmethod
-    def table_header(cls, columns: ArrayVar[list[str]]) -> rx.Component:
-        return rx.table.header(
-            rx.table.row(rx.foreach(columns, lambda col: TableComponent.table_header_cell(col))),
+    def close_group(self) -> None:
+        self._group_keys = {}
+        self._reset_order()
+
+    def toggle_summary(self):
+        self.show_summary = not self.show_summary
+
+    def toggle_column(self, column: str):
+        if column in self.hidden_columns:
+            self.hidden_columns = [hidden for hidden in self.hidden_columns if hidden != column]
+        else:
+            self.hidden_columns = [*self.hidden_columns, column]
+
+    def _source(self) -> TableSource:
+        return datasets.get(self.dataset)
+
+    def _reset_order(self) -> None:
+        # sort columns of the table and of a grouped view differ
+        self.sort_column = ""
+        self.sort_descending = False
+        self.window_offset = 0
+        self.lookahead_rows = 0
+
+    def _sort_order(self) -> SortOrder:
+        return [(self.sort_column, self.sort_descending)] if self.sort_column else []
+
+    def _window_bounds(self) -> tuple[int, int]:
+        return window_bounds(self.total_rows, self.window_offset, self.window_size, self.overscan, self.lookahead_rows)
+
+    def _track_scrolling(self, direction: int) -> None:
+        now = monotonic()
+        pace = next_pace(
+            ScrollPace(self._velocity, self.lookahead_rows, self.load_batch_size),
+            direction,
+            now - self._last_step,
+            self.window_size,
+            self.idle_after,
+            self.lookahead_seconds,
+            self.max_batch_size,
         )
+        self._last_step = now
+        self._velocity = pace.velocity
+        self.lookahead_rows = pace.lookahead_rows
+        self.load_batch_size = pace.load_batch_size
+
+    def _row_height(self) -> int:
+        return self.measured_row_height or self.row_height
 
     @classmethod
-    def table_row_cell(cls, *children, **props) -> rx.Component:
-        return rx.table.cell(
-            *children,
-            border_bottom="solid",
-            border_bottom_color=rx.color("accent", 4),
-            border_bottom_width="1px",
-            background_color=rx.color("accent", 2),
-            **props,
-        )
+    def _element_id(cls) -> str:
+        return f"table-{cls.get_name()}"
+
+    def set_page_slot(self, slot: int):
+        self.assigned_page_slot = slot
+
+    def set_page_id(self, page_id: str):
+        self.page_id = page_id
 
     @classmethod
-    def table_row(cls, row: ArrayVar[tuple[Any, ...]], **props) -> rx.Component:
-        return rx.table.row(rx.foreach(row, lambda cell: cls.table_row_cell(cell)), **props)
+    def create(
+        cls,
+        *children,
+        source: TableSource | pl.LazyFrame | pl.DataFrame | None = None,
+        dataset: str | None = None,
+        transport: Literal["json", "arrow"] = "json",
+        **props,
+    ) -> rx.Component:
+        """
+        Creates a table with a state of its own, like ``rx.ComponentState.create``.
+
+        Args:
+            source (TableSource | pl.LazyFrame | pl.DataFrame | None): Data to register and show.
+            dataset (str | None): Handle of a registered dataset to show; the sample table if neither is given.
+            transport (Literal["json", "arrow"]): How pages reach the browser; with "arrow" the browser fetches them
+                itself, see ``yaafc.tables.transport``.
+            props: The props of ``get_component``.
+
+        Raises:
+            AmbiguousTableDataError: If both a source and a dataset are given.
+            UnknownDatasetError: If the dataset is not registered.
+        """
+        if source is not None and dataset is not None:
+            raise AmbiguousTableDataError
+        if source is not None:
+            dataset = datasets.register(source)
+        # the state class of this table starts out with its dataset and transport, the mixin keeps its defaults
+        defaults: dict[str, Any] = {"arrow_transport": transport == "arrow"}
+        if dataset is not None:
+            datasets.get(dataset)
+            defaults["dataset"] = dataset
+        cls._per_component_state_instance_count += 1
+        name = f"{cls.__name__}_n{cls._per_component_state_instance_count}"
+        state = type(name, (cls, rx.State), {"__module__": reflex.istate.dynamic.__name__, **defaults}, mixin=False)
+        # found again by name when states are unpickled
+        setattr(reflex.istate.dynamic, name, state)
+        component = into_component(state.get_component(*children, **props))
+        component.State = state
+        return component
 
     @classmethod
     def get_component(cls, page_id: str, slot_id: int, *children, **props) -> rx.Component:
         columns = cls.columns
         rows = cls.visible_rows
+        if cls.arrow_transport:
+            body_rows = arrow_rows(
+                url=cls.page_url,
+                row_height=cls.row_height,
+                clickable=cls.group_columns.length() > 0,
+                on_row_click=cls.open_group,
+            )
+        else:
+            # clicking a group row shows the rows of the group
+            body_rows = rx.foreach(
+                rows,
+                lambda row, index: rx.cond(
+                    cls.group_columns.length() > 0,
+                    table_row(cls, row, on_click=cls.open_group(index), cursor="pointer"),
+                    table_row(cls, row),
+                ),
+            )
         # cls.__fields__["assigned_page_slot"].default = props.pop("assigned_page_slot", cls.assigned_page_slot)
         # cls.__fields__["page_id"].default = props.pop("page_id", cls.page_id)
         # cls.__fields__["page_state"].default = props.pop("page_state", cls.page_state)
 
-        js_code = """
-        function updateRowsLoaded() {
-            const tableHeight = window.innerHeight;
-            const rowHeight = 30;
-            const visibleRows = Math.floor(tableHeight / rowHeight);
-            window.rows_loaded_count = visibleRows;
-        }
-        window.addEventListener('resize', updateRowsLoaded);
-        updateRowsLoaded();
-        """
-
         load_more_observer = intersection_observer(
             on_intersect=cls.load_more_rows,
             once=False,
@@ -301,6 +363,13 @@ class TableComponent(rx.ComponentState):
             style={"height": "1px"},
             client_only=True,
         )
+        load_previous_observer = intersection_observer(
+            on_intersect=cls.load_previous_rows,
+            once=False,
+            disabled=~cls.has_previous,
+            style={"height": "1px"},
+            client_only=True,
+        )
 
         # is_active = Settings.active_widget == cls.widget_id
         active_id_style = {
@@ -311,30 +380,43 @@ class TableComponent(rx.ComponentState):
         }
 
         return rx.vstack(
-            rx.script(js_code),
             rx.text(
                 "page_slot=",
                 background=yui.color(yui.INFO),
                 on_click=lambda: PagesSelectionState.set_active_slot_id(page_id, slot_id + 1),
             ),
+            table_toolbar(cls),
             rx.box(
                 rx.table.root(
-                    cls.table_header(columns),
+                    table_header(cls, columns),
                     rx.table.body(
-                        rx.foreach(rows, lambda row: cls.table_row(row)),
+                        table_spacer(cls, cls.top_spacer_height),
+                        rx.cond(
+                            cls.has_previous,
+                            rx.table.row(
+                                row_cell("Loading...", load_previous_observer),
+                            ),
+                            None,
+                        ),
+                        body_rows,
                         rx.cond(
                             cls.has_more,
                             rx.table.row(
-                                cls.table_row_cell("Loading...", load_more_observer),
+                                row_cell("Loading...", load_more_observer),
                             ),
                             None,
                         ),
+                        table_spacer(cls, cls.bottom_spacer_height),
                     ),
+                    rx.cond(cls.show_summary, table_footer(cls), None),
                     width="100%",
                     style={"minWidth": "600px"},
                     sticky_header=True,
                     height="90vh",
                     overflow_y="auto",
+                    id=cls._element_id(),
+                    # the window and the scroll steps are sized from the measured viewport
+                    on_mount=cls.measure_viewport,
                 ),
                 width="100%",
                 style=rx.cond((PagesSelectionState.active_slot_ids.get(page_id) == slot_id), active_id_style, {}),
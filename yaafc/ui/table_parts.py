@@ -0,0 +1,155 @@
+"""
+Building blocks of the table markup, see ``yaafc.ui.table``; they take the table's state class.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+import reflex as rx
+from reflex.vars import ArrayVar
+
+if TYPE_CHECKING:
+    from yaafc.ui.table import TableComponent
+
+
+def header_cell(*children, **props) -> rx.Component:
+    style = {"position": "sticky", "top": "0", **props.pop("style", {})}
+    return rx.table.column_header_cell(
+        *children,
+        border_right="solid",
+        border_right_color=rx.color("accent", 4),
+        border_right_width="1px",
+        border_bottom="solid",
+        border_bottom_color=rx.color("accent", 4),
+        border_bottom_width="1px",
+        background_color=rx.color("accent", 3),
+        style=style,
+        **props,
+    )
+
+
+def table_header(table: type["TableComponent"], columns: ArrayVar[list[str]]) -> rx.Component:
+    def sortable_header_cell(column: rx.Var[str]) -> rx.Component:
+        return header_cell(
+            rx.hstack(
+                rx.text(column),
+                rx.cond(
+                    table.sort_column == column,
+                    rx.cond(
+                        table.sort_descending,
+                        rx.icon(tag="arrow-down", size=14),
+                        rx.icon(tag="arrow-up", size=14),
+                    ),
+                    None,
+                ),
+                # grouped views only offer to remove their keys
+                rx.cond(
+                    (table.group_columns.length() == 0) | table.group_columns.contains(column),
+                    rx.icon(
+                        tag="group",
+                        size=14,
+                        title="Group by",
+                        color=rx.cond(table.group_columns.contains(column), rx.color("accent", 11), "inherit"),
+                        on_click=table.group_by(column).stop_propagation,
+                    ),
+                    None,
+                ),
+                align="center",
+                spacing="1",
+            ),
+            on_click=table.sort_by(column),
+            cursor="pointer",
+        )
+
+    def filter_cell(column: rx.Var[str]) -> rx.Component:
+        return header_cell(
+            rx.input(
+                placeholder="Filter...",
+                value=table.column_filters.get(column, ""),
+                on_change=lambda text: table.set_column_filter(column, text),
+                title=table.filter_error,
+                size="1",
+            ),
+            style={"position": "sticky", "top": f"{table.row_height}px"},
+        )
+
+    return rx.table.header(
+        rx.table.row(rx.foreach(columns, sortable_header_cell)),
+        # filters apply to the table rows, so they are set before grouping
+        rx.cond(table.group_columns.length() == 0, rx.table.row(rx.foreach(columns, filter_cell)), None),
+    )
+
+
+def table_footer(table: type["TableComponent"]) -> rx.Component:
+    return rx.el.tfoot(
+        rx.table.row(
+            rx.foreach(
+                table.column_summaries,
+                lambda summary: row_cell(
+                    summary,
+                    style={
+                        "position": "sticky",
+                        "bottom": "0",
+                        "whiteSpace": "pre-line",
+                        "backgroundColor": rx.color("accent", 3),
+                    },
+                ),
+            )
+        )
+    )
+
+
+def table_toolbar(table: type["TableComponent"]) -> rx.Component:
+    return rx.hstack(
+        rx.icon_button(
+            rx.icon(tag="sigma", size=14),
+            title="Summarize columns",
+            variant=rx.cond(table.show_summary, "solid", "soft"),
+            size="1",
+            on_click=table.toggle_summary,
+        ),
+        rx.cond(
+            table.group_columns.length() > 0,
+            rx.badge(
+                "Grouped by ",
+                table.group_columns.join(", "),
+                rx.icon(tag="x", size=12, cursor="pointer", on_click=table.clear_grouping),
+            ),
+            None,
+        ),
+        rx.cond(
+            table.opened_group != "",
+            rx.badge(
+                "Group ",
+                table.opened_group,
+                rx.icon(tag="x", size=12, cursor="pointer", on_click=table.close_group),
+            ),
+            None,
+        ),
+        align="center",
+    )
+
+
+def row_cell(*children, **props) -> rx.Component:
+    return rx.table.cell(
+        *children,
+        border_bottom="solid",
+        border_bottom_color=rx.color("accent", 4),
+        border_bottom_width="1px",
+        background_color=rx.color("accent", 2),
+        **props,
+    )
+
+
+def table_row(table: type["TableComponent"], row: ArrayVar[tuple[Any, ...]], **props) -> rx.Component:
+    return rx.table.row(
+        rx.foreach(row, lambda cell: row_cell(cell, height=f"{table.row_height}px")),
+        custom_attrs={"data-table-row": "true"},
+        **props,
+    )
+
+
+def table_spacer(table: type["TableComponent"], height: rx.Var[str]) -> rx.Component:
+    return rx.table.row(
+        rx.table.cell(col_span=table.columns.length(), padding="0", border="none"),
+        height=height,
+    )
@@ -0,0 +1,92 @@
+"""
+Window arithmetic of the virtualized table, see ``yaafc.ui.table``.
+
+A table renders a window of rows sized to its viewport, plus an overscan on both sides. Scrolling moves the window
+in steps; the faster the user scrolls, the larger the steps and the more rows are prefetched in the scroll
+direction, so fast scrolling takes fewer round trips instead of more.
+"""
+
+import dataclasses
+import math
+
+# measures the scroll viewport of a table and the median height of its rendered rows, called with the table id
+MEASURE_VIEWPORT_JS = """
+(id) => {
+  const table = document.getElementById(id);
+  if (!table) return null;
+  const bounds = table.getBoundingClientRect();
+  const heights = Array.from(table.querySelectorAll("tr[data-table-row]"), (row) => row.getBoundingClientRect().height)
+    .filter((height) => height > 0)
+    .sort((a, b) => a - b);
+  return {
+    viewport_height: Math.min(bounds.height, window.innerHeight - Math.max(bounds.top, 0)),
+    row_height: heights.length ? heights[heights.length >> 1] : null,
+  };
+}
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class ScrollPace:
+    """
+    How fast a table is scrolled, updated by every scroll step.
+
+    Attributes:
+        velocity (float): Scroll speed in rows per second, 0 at rest
+        lookahead_rows (int): Rows prefetched beyond the overscan in the scroll direction, negative while scrolling up
+        load_batch_size (int): Rows moved by the next scroll step
+    """
+
+    velocity: float
+    lookahead_rows: int
+    load_batch_size: int
+
+
+def window_bounds(total: int, offset: int, size: int, overscan: int, lookahead_rows: int) -> tuple[int, int]:
+    """
+    The rows to render: the window plus the overscan on both sides and the lookahead in the scroll direction.
+
+    Args:
+        total (int): Rows of the table.
+        offset (int): First row of the window; a window past the end is moved back onto the table.
+        size (int): Rows of the window.
+        overscan (int): Rows rendered beyond both ends of the window.
+        lookahead_rows (int): Rows prefetched in the scroll direction, see ``ScrollPace``.
+
+    Returns:
+        tuple[int, int]: The first row and the row after the last one, clamped to the table.
+    """
+    offset = min(offset, max(total - size, 0))
+    before = overscan + max(-lookahead_rows, 0)
+    after = overscan + max(lookahead_rows, 0)
+    return max(offset - before, 0), min(offset + size + after, total)
+
+
+def next_pace(
+    pace: ScrollPace,
+    direction: int,
+    elapsed: float,
+    window_size: int,
+    idle_after: float,
+    lookahead_seconds: float,
+    max_batch_size: int,
+) -> ScrollPace:
+    """
+    The pace after a scroll step.
+
+    Args:
+        pace (ScrollPace): The pace of the previous step, which moved its ``load_batch_size`` rows.
+        direction (int): 1 for a step down, -1 for a step up.
+        elapsed (float): Seconds since the previous step.
+        window_size (int): Rows of the window.
+        idle_after (float): Pause in seconds after which scrolling starts again at rest; so does turning around.
+        lookahead_seconds (float): Seconds of scrolling at the current speed prefetched ahead.
+        max_batch_size (int): Upper bound of the lookahead and of a scroll step.
+
+    Returns:
+        ScrollPace: The new speed, lookahead and step size.
+    """
+    moving_on = elapsed < idle_after and (pace.lookahead_rows >= 0) == (direction > 0)
+    velocity = (pace.velocity + pace.load_batch_size / max(elapsed, 1e-3)) / 2 if moving_on else 0.0
+    lookahead = min(math.ceil(velocity * lookahead_seconds), max_batch_size)
+    return ScrollPace(velocity, direction * lookahead, min(window_size + lookahead, max_batch_size))
@@ -1,4 +1,6 @@
-from typing import ClassVar, Union
+from typing import Any, ClassVar, Union
+
+import polars as pl
 
 # adapted from: https://stackoverflow.com/questions/12523586/python-format-size-application-converting-b-to-kb-mb-gb-tb
 
@@ -56,6 +58,81 @@ class HumanBytes:
 
         return HumanBytes.PRECISION_FORMATS[precision].format("-" if is_negative else "", num, unit)
 
+    @staticmethod
+    def format_series(values: Union[pl.Series, Any], metric: bool = False, precision: int = 1) -> pl.Series:
+        """
+        Vectorized variant of `format` for a whole column of byte counts.
+
+        The unit is selected from the logarithm of each value instead of a division loop, then corrected with
+        the same rounding threshold as `format`, so every value renders exactly like a call to `format` would.
+        Null values stay null.
+
+        Args:
+            values: A Polars Series, NumPy array or sequence of numbers.
+            metric: Use powers of 1000 instead of powers of 1024.
+            precision: Number of decimals (0-3).
+
+        Returns:
+            A String Series with the formatted sizes.
+        """
+
+        if not 0 <= precision <= 3:
+            raise PrecisionRangeError(precision)
+
+        series = values if isinstance(values, pl.Series) else pl.Series(values)
+        unit_labels = HumanBytes.METRIC_LABELS if metric else HumanBytes.BINARY_LABELS
+        unit_step = 1000 if metric else 1024
+        unit_step_thresh = unit_step - HumanBytes.PRECISION_OFFSETS[precision]
+        scale = 10**precision
+
+        num = pl.col("num").abs()
+        last_exponent = len(unit_labels) - 1
+        exponent = num.log(unit_step).floor().clip(0, last_exponent)
+        # log() may land one unit off near the thresholds, the same check as in the loop settles the final unit
+        exponent = (
+            pl.when((num / unit_step**exponent >= unit_step_thresh) & (exponent < last_exponent))
+            .then(exponent + 1)
+            .when((exponent > 0) & (num / unit_step ** (exponent - 1) < unit_step_thresh))
+            .then(exponent - 1)
+            .otherwise(exponent)
+        )
+        frame = pl.DataFrame({"num": series.cast(pl.Float64)}).with_columns(exponent=exponent.cast(pl.Int32), value=num)
+        # divide step by step like the loop does, so the values carry the very same rounding errors; the divisor
+        # is a per-row column because Polars turns a division by a literal into a multiplication by its inverse,
+        # and materializing each step keeps the expression tree flat
+        for unit_index in range(1, len(unit_labels)):
+            divisor = pl.when(pl.col("exponent") >= unit_index).then(float(unit_step)).otherwise(1.0)
+            frame = frame.with_columns(value=pl.col("value") / divisor)
+        frame = frame.with_columns(rounded=_round_to_scale(pl.col("value"), scale))
+        rounded = pl.col("rounded")
+        integer_part = (rounded // scale).cast(pl.String)
+        number = (
+            integer_part
+            if precision == 0
+            else pl.concat_str(integer_part, pl.lit("."), (rounded % scale).cast(pl.String).str.zfill(precision))
+        )
+        label = pl.col("exponent").replace_strict(list(range(len(unit_labels))), unit_labels, return_dtype=pl.String)
+        sign = pl.when(pl.col("num") < 0).then(pl.lit("-")).otherwise(pl.lit(""))
+        return frame.select(pl.concat_str(sign, number, pl.lit(" "), label).alias(series.name))[series.name]
+
+
+def _round_to_scale(value: pl.Expr, scale: int) -> pl.Expr:
+    """
+    Rounds ``value * scale`` to an integer the way str.format() rounds the exact binary value.
+
+    Float multiplication may turn e.g. 356.9499999... into exactly 3569.5, so ties are resolved with the
+    rounding error of the product (Dekker's error-free multiplication), and true ties are rounded half to even.
+    """
+    product = value * scale
+    split = value * 134217729.0  # 2**27 + 1
+    high = split - (split - value)
+    low = value - high
+    error = (high * scale - product) + low * scale
+    floor = product.floor()
+    remainder = product - floor
+    round_up = (remainder > 0.5) | ((remainder == 0.5) & ((error > 0) | ((error == 0) & (floor % 2 == 1))))
+    return pl.when(round_up).then(floor + 1).otherwise(floor).cast(pl.Int64)
+
 
 # print(HumanBytes.format(2251799813685247)) # 2 pebibytes
 # print(HumanBytes.format(2000000000000000, True)) # 2 petabytes
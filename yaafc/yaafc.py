@@ -3,5 +3,7 @@
 import reflex as rx
 
 from yaafc.pages import *  # noqa: F403
+from yaafc.tables.transport import table_api
 
-app = rx.App()
+# table_api serves table pages as Arrow IPC streams next to Reflex's own endpoints
+app = rx.App(api_transformer=table_api)